@@ -27,7 +27,10 @@ class CodebaseConfig(BaseConfig):
     ignore_process_errors: bool = True
     disable_graph: bool = False
     disable_file_parse: bool = False
+    parse_workers: int = 1
+    parse_cache_mb: int = 256
     exp_lazy_graph: bool = False
+    graph_snapshot_dir: str | None = None
     generics: bool = True
     import_resolution_paths: list[str] = Field(default_factory=lambda: [])
     import_resolution_overrides: dict[str, str] = Field(default_factory=lambda: {})
@@ -48,15 +48,9 @@ class CodegenLanguageServer(LanguageServer):
         resolved_uri = file.path.absolute().as_uri()
         logger.info(f"Getting node under cursor for {resolved_uri} at {position}")
         document = self.workspace.get_text_document(resolved_uri)
-        candidates = []
         target_byte = document.offset_at_position(position)
-        end_byte = document.offset_at_position(end_position) if end_position is not None else None
-        for node in file._range_index.nodes:
-            if node.start_byte <= target_byte and node.end_byte >= target_byte:
-                if end_position is not None:
-                    if node.end_byte < end_byte:
-                        continue
-                candidates.append(node)
+        end_byte = document.offset_at_position(end_position) if end_position is not None else target_byte
+        candidates = file._range_index.get_containing(target_byte, max(target_byte, end_byte))
         if not candidates:
             return None
         return min(candidates, key=lambda node: abs(node.end_byte - node.start_byte))
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import fnmatch
+import itertools
 import os
 from collections import Counter, defaultdict
 from contextlib import contextmanager
 from enum import IntEnum, auto, unique
-from functools import lru_cache
 from os import PathLike
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -15,19 +16,27 @@ from codegen.configs.models.codebase import CodebaseConfig, PinkMode
 from codegen.configs.models.secrets import SecretsConfig
 from codegen.sdk.codebase.config import ProjectConfig, SessionOptions
 from codegen.sdk.codebase.config_parser import ConfigParser, get_config_parser_for_language
-from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.diff_lite import ChangeType, ContentEdit, DiffLite
+from codegen.sdk.codebase.file_interface import FileInterface
 from codegen.sdk.codebase.flagging.flags import Flags
+from codegen.sdk.codebase.graph_snapshot import GraphSnapshot, get_config_hashes, get_snapshot_key, hash_content
 from codegen.sdk.codebase.io.file_io import FileIO
+from codegen.sdk.codebase.lazy_graph import LazyGraphState
+from codegen.sdk.codebase.node_type_index import NodeTypeIndex
+from codegen.sdk.codebase.path_index import PathIndex
 from codegen.sdk.codebase.progress.stub_progress import StubProgress
+from codegen.sdk.codebase.reachability import ReachabilityIndex
 from codegen.sdk.codebase.transaction_manager import TransactionManager
+from codegen.sdk.codebase.usage_index import UsageIndex
 from codegen.sdk.codebase.validation import get_edges, post_reset_validation
 from codegen.sdk.core.autocommit import AutoCommit, commiter
 from codegen.sdk.core.directory import Directory
 from codegen.sdk.core.external.dependency_manager import DependencyManager, get_dependency_manager
 from codegen.sdk.core.external.language_engine import LanguageEngine, get_language_engine
-from codegen.sdk.enums import Edge, EdgeType, NodeType
+from codegen.sdk.enums import Edge, EdgeType, NodeType, SymbolType
 from codegen.sdk.extensions.sort import sort_editables
-from codegen.sdk.extensions.utils import uncache_all
+from codegen.sdk.extensions.utils import forget_file, uncache_files, uncache_recent
+from codegen.sdk.tree_sitter_parser import parse_files, set_parse_cache_size
 from codegen.sdk.typescript.external.ts_declassify.ts_declassify import TSDeclassify
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 from codegen.shared.exceptions.control_flow import StopCodemodException
@@ -35,22 +44,25 @@ from codegen.shared.logging.get_logger import get_logger
 from codegen.shared.performance.stopwatch_utils import stopwatch, stopwatch_with_sentry
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Mapping, Sequence
+    from collections.abc import Collection, Generator, Iterable, Iterator, Mapping, Sequence
 
     from codeowners import CodeOwners as CodeOwnersParser
     from git import Commit as GitCommit
+    from tree_sitter import Node as TSNode
 
     from codegen.git.repo_operator.repo_operator import RepoOperator
     from codegen.sdk.codebase.io.io import IO
     from codegen.sdk.codebase.node_classes.node_classes import NodeClasses
     from codegen.sdk.codebase.progress.progress import Progress
-    from codegen.sdk.core.dataclasses.usage import Usage
+    from codegen.sdk.core.dataclasses.usage import Usage, UsageType
     from codegen.sdk.core.expressions import Expression
     from codegen.sdk.core.external_module import ExternalModule
     from codegen.sdk.core.file import File, SourceFile
     from codegen.sdk.core.interfaces.importable import Importable
     from codegen.sdk.core.node_id_factory import NodeId
     from codegen.sdk.core.parser import Parser
+    from codegen.sdk.core.symbol import Symbol
+    from codegen.sdk.python.module_map import PyModuleMap
 
 logger = get_logger(__name__)
 
@@ -123,7 +135,17 @@ class CodebaseContext:
     _computing = False
     _graph: PyDiGraph[Importable, Edge]
     filepath_idx: dict[str, NodeId]
+    # Python modules by dotted name, kept in sync with `filepath_idx`
+    module_map: PyModuleMap | None
     _ext_module_idx: dict[str, NodeId]
+    _node_type_idx: NodeTypeIndex
+    _usage_idx: UsageIndex
+    _reachability: ReachabilityIndex
+    # Bumped by every node and edge change, memoized traversals of an older graph generation are stale. Unlike
+    # `generation`, which tracks synced diffs for autocommit, this also covers lazy loading and in-place graph updates
+    _graph_generation: int
+    # Files left to load with `exp_lazy_graph`
+    _lazy: LazyGraphState
     flags: Flags
     session_options: SessionOptions = SessionOptions()
     projects: list[ProjectConfig]
@@ -145,6 +167,11 @@ class CodebaseContext:
         self.progress = progress or StubProgress()
         self.__graph = PyDiGraph()
         self.__graph_ready = False
+        self._node_type_idx = NodeTypeIndex()
+        self._usage_idx = UsageIndex()
+        self._reachability = ReachabilityIndex()
+        self._graph_generation = 0
+        self._lazy = LazyGraphState()
         self.filepath_idx = {}
         self._ext_module_idx = {}
         self.generation = 0
@@ -162,9 +189,11 @@ class CodebaseContext:
         context = projects[0]
         self.node_classes = get_node_classes(context.programming_language)
         self.config = config or CodebaseConfig()
+        set_parse_cache_size(self.config.parse_cache_mb * 1024 * 1024)
         self.secrets = secrets or SecretsConfig()
         self.repo_name = context.repo_operator.repo_name
         self.repo_path = str(Path(context.repo_operator.repo_path).resolve())
+        self.path_index = PathIndex(self.repo_path)
         self.full_path = os.path.join(self.repo_path, context.base_path) if context.base_path else self.repo_path
         self.codeowners_parser = context.repo_operator.codeowners_parser
         self.base_url = context.repo_operator.base_url
@@ -186,6 +215,11 @@ class CodebaseContext:
         self.dependency_manager = get_dependency_manager(context.programming_language, self)
         self.language_engine = get_language_engine(context.programming_language, self)
         self.programming_language = context.programming_language
+        self.module_map = None
+        if self.programming_language == ProgrammingLanguage.PYTHON:
+            from codegen.sdk.python.module_map import PyModuleMap
+
+            self.module_map = PyModuleMap(self)
 
         # Raise warning if language is not supported
         if self.programming_language is ProgrammingLanguage.UNSUPPORTED or self.programming_language is ProgrammingLanguage.OTHER:
@@ -199,9 +233,12 @@ class CodebaseContext:
                 msg = "allow_external must be set to True when py_resolve_syspath is enabled"
                 raise ValueError(msg)
 
-        # Build the graph
-        if not self.config.exp_lazy_graph and self.config.use_pink != PinkMode.ALL_FILES:
-            self.build_graph(context.repo_operator)
+        # Build the graph, or only list the files to parse on demand
+        if self.config.use_pink != PinkMode.ALL_FILES:
+            if self.config.exp_lazy_graph:
+                self.init_lazy_graph(context.repo_operator)
+            else:
+                self.build_graph(context.repo_operator)
         try:
             self.synced_commit = context.repo_operator.head_commit
         except ValueError as e:
@@ -225,6 +262,12 @@ class CodebaseContext:
     @_graph.setter
     def _graph(self, value: PyDiGraph[Importable, Edge]) -> None:
         self.__graph = value
+        self._graph_generation += 1
+        self._node_type_idx.clear()
+        self._usage_idx.clear()
+        self._reachability.clear()
+        for node_id, node in zip(value.node_indices(), value.nodes()):
+            self._node_type_idx.add(node_id, node)
 
     @stopwatch_with_sentry(name="build_graph")
     @commiter
@@ -232,22 +275,68 @@ class CodebaseContext:
         """Builds a codebase graph based on the current file state of the given repo operator"""
         self.__graph_ready = True
         self._graph.clear()
+        self._node_type_idx.clear()
+        self._usage_idx.clear()
+        self._reachability.clear()
+        self._graph_generation += 1
+        self._lazy.clear()
 
         # =====[ Add all files to the graph in parallel ]=====
         syncs = defaultdict(lambda: [])
         if self.config.disable_file_parse:
             logger.warning("WARNING: File parsing is disabled!")
         else:
-            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST):
+            # Files are only listed here, their content is read once when they are parsed
+            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True):
                 syncs[SyncType.ADD].append(self.to_absolute(filepath))
         logger.info(f"> Parsing {len(syncs[SyncType.ADD])} files in {self.projects[0].subdirectories or 'ALL'} subdirectories with {self.extensions} extensions")
-        self._process_diff_files(syncs, incremental=False)
+        # =====[ Restore the import resolution from the snapshot of the closest ancestor commit if one exists ]=====
+        commit = None
+        snapshot = None
+        content_hashes = None
+        if self.config.graph_snapshot_dir is not None and not self.config.disable_graph:
+            try:
+                commit = repo_operator.head_commit
+            except ValueError as e:
+                logger.warning(f"Unable to get commit head, graph snapshots are disabled: {e}")
+            if commit is not None:
+                content_hashes = {}
+                commits = (ancestor.hexsha for ancestor in itertools.chain([commit], commit.iter_parents()))
+                snapshot = GraphSnapshot.find(self.config.graph_snapshot_dir, commits, get_snapshot_key(self))
+        self._process_diff_files(syncs, incremental=False, snapshot=snapshot, content_hashes=content_hashes)
         files: list[SourceFile] = self.get_nodes(NodeType.FILE)
         logger.info(f"> Found {len(files)} files")
         logger.info(f"> Found {len(self.nodes)} nodes and {len(self.edges)} edges")
+        if content_hashes is not None and (snapshot is None or snapshot.commit != commit.hexsha or snapshot.files != content_hashes or snapshot.configs != get_config_hashes(self)):
+            path = GraphSnapshot.from_context(self, commit.hexsha, content_hashes).save(self.config.graph_snapshot_dir)
+            logger.info(f"> Saved graph snapshot to {path}")
         if self.config.track_graph:
             self.old_graph = self._graph.copy()
 
+    def init_lazy_graph(self, repo_operator: RepoOperator) -> None:
+        """Lists the source files of the given repo operator without parsing them.
+
+        Files are parsed, along with the files they import, when first accessed. The dependencies of a file are only
+        computed once it is accessed directly, or when the usages of a symbol it may reference are requested.
+        """
+        self.__graph_ready = True
+        self._graph.clear()
+        self._node_type_idx.clear()
+        self._usage_idx.clear()
+        self._reachability.clear()
+        self._graph_generation += 1
+        self._lazy.clear()
+        if self.config.disable_file_parse:
+            logger.warning("WARNING: File parsing is disabled!")
+        else:
+            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True):
+                path = self.to_absolute(filepath)
+                self._lazy.unparsed[file_path := str(self.to_relative(path))] = path
+                if self.module_map is not None:
+                    self.module_map.add(file_path)
+        logger.info(f"> Found {len(self._lazy.unparsed)} files, parsing them on demand")
+        self.build_directory_tree()
+
     @stopwatch
     @commiter
     def apply_diffs(self, diff_list: list[DiffLite]) -> None:
@@ -256,21 +345,41 @@ class CodebaseContext:
             self.session_options = self.session_options.model_copy(update={"max_seconds": None})
         logger.info(f"Applying {len(diff_list)} diffs to graph")
         files_to_sync: dict[Path, SyncType] = {}
+        file_edits: dict[Path, tuple[bytes, list[ContentEdit]] | None] = {}
+        # Every added, removed or renamed file, including non source files, to update in the directory tree
+        changed_paths: dict[Path, None] = {}
+        # Every added, removed, renamed or modified config file
+        config_paths: dict[Path, None] = {}
         # Gather list of deleted files, new files to add, and modified files to reparse
         file_cls = self.node_classes.file_cls
         extensions = file_cls.get_extensions()
         for diff in diff_list:
             filepath = Path(diff.path)
-            if extensions is not None and filepath.suffix not in extensions:
-                continue
             if self.projects[0].subdirectories is not None and not any(filepath.relative_to(subdir) for subdir in self.projects[0].subdirectories):
                 continue
+            if diff.change_type == ChangeType.Renamed:
+                changed_paths.update(dict.fromkeys((Path(diff.rename_from), Path(diff.rename_to))))
+            elif diff.change_type != ChangeType.Modified:
+                changed_paths[filepath] = None
+            if self.config_parser is not None:
+                paths = (diff.rename_from, diff.rename_to) if diff.change_type == ChangeType.Renamed else (filepath,)
+                config_paths.update(dict.fromkeys(path for path in map(self.to_absolute, paths) if self.config_parser.is_config_file(path)))
+            if extensions is not None and filepath.suffix not in extensions:
+                continue
 
             if diff.change_type == ChangeType.Added:
                 # Sync by adding the added file to the graph
                 files_to_sync[filepath] = SyncType.ADD
             elif diff.change_type == ChangeType.Modified:
                 files_to_sync[filepath] = SyncType.REPARSE
+                # Chain the edits of every diff to the file so it can be reparsed incrementally from its original content
+                if filepath not in file_edits:
+                    file_edits[filepath] = (diff.old_content, list(diff.edits)) if diff.old_content is not None and diff.edits is not None else None
+                elif file_edits[filepath] is not None:
+                    if diff.edits is not None:
+                        file_edits[filepath][1].extend(diff.edits)
+                    else:
+                        file_edits[filepath] = None
             elif diff.change_type == ChangeType.Renamed:
                 files_to_sync[diff.rename_from] = SyncType.DELETE
                 files_to_sync[diff.rename_to] = SyncType.ADD
@@ -278,25 +387,42 @@ class CodebaseContext:
                 files_to_sync[filepath] = SyncType.DELETE
             else:
                 logger.warning(f"Unhandled diff change type: {diff.change_type}")
+            if diff.change_type != ChangeType.Modified:
+                file_edits[filepath] = None
+        if self._lazy.unparsed or self._lazy.unresolved:
+            self._lazy.reset_session()
+            for filepath, sync_type in list(files_to_sync.items()):
+                if (path := self._lazy.unparsed.get(str(self.to_relative(filepath)))) is not None:
+                    # Files that were never parsed are parsed from their current content when first accessed
+                    if sync_type is not SyncType.REPARSE:
+                        del self._lazy.unparsed[str(self.to_relative(path))]
+                        if sync_type is SyncType.DELETE and self.module_map is not None:
+                            self.module_map.remove(str(self.to_relative(path)))
+                    if sync_type is not SyncType.ADD:
+                        del files_to_sync[filepath]
         by_sync_type = defaultdict(lambda: [])
-        if self.config.disable_file_parse:
-            logger.warning("WARNING: File parsing is disabled!")
-        else:
-            for filepath, sync_type in files_to_sync.items():
-                if self.get_file(filepath) is None:
-                    if sync_type is SyncType.DELETE:
-                        # SourceFile is already deleted, nothing to do here
-                        continue
-                    elif sync_type is SyncType.REPARSE:
-                        # SourceFile needs to be parsed for the first time
-                        sync_type = SyncType.ADD
-                elif sync_type is SyncType.ADD:
-                    # If the file was deleted earlier, we need to reparse so we can remove old edges
-                    sync_type = SyncType.REPARSE
-
-                by_sync_type[sync_type].append(filepath)
-        self.generation += 1
-        self._process_diff_files(by_sync_type)
+        with self._suspend_lazy_loading():
+            if self.config.disable_file_parse:
+                logger.warning("WARNING: File parsing is disabled!")
+            else:
+                for filepath, sync_type in files_to_sync.items():
+                    if self.get_file(filepath) is None:
+                        if sync_type is SyncType.DELETE:
+                            # SourceFile is already deleted, nothing to do here
+                            continue
+                        elif sync_type is SyncType.REPARSE:
+                            # SourceFile needs to be parsed for the first time
+                            sync_type = SyncType.ADD
+                    elif sync_type is SyncType.ADD:
+                        # If the file was deleted earlier, we need to reparse so we can remove old edges
+                        sync_type = SyncType.REPARSE
+
+                    by_sync_type[sync_type].append(filepath)
+            self.generation += 1
+            self._process_diff_files(by_sync_type, file_edits={path: edits for path, edits in file_edits.items() if edits is not None}, changed_paths=changed_paths, config_paths=config_paths)
+        # The imports and dependencies of every synced file were resolved
+        synced = {str(self.to_relative(filepath)) for filepath in itertools.chain.from_iterable(by_sync_type.values())}
+        self._lazy.mark_resolved(synced)
 
     def _reset_files(self, syncs: list[DiffLite]) -> None:
         files_to_write = []
@@ -369,7 +495,8 @@ class CodebaseContext:
     @stopwatch
     def prune_graph(self) -> None:
         # ====== [ Remove orphaned external modules ] ======
-        external_modules = self.get_nodes(NodeType.EXTERNAL)
+        with self._suspend_lazy_loading():
+            external_modules = self.get_nodes(NodeType.EXTERNAL)
         for module in external_modules:
             if not any(self.predecessors(module.node_id)):
                 self.remove_node(module.node_id)
@@ -379,6 +506,7 @@ class CodebaseContext:
         """Builds the directory tree for the codebase"""
         # Reset and rebuild the directory tree
         self.directories = dict()
+        self.path_index.clear()
 
         for file_path, _ in self.projects[0].repo_operator.iter_files(
             subdirs=self.projects[0].subdirectories,
@@ -389,6 +517,29 @@ class CodebaseContext:
             directory = self.get_directory(file_path.parent, create_on_missing=True)
             directory._add_file(file_path.name)
 
+    def update_directory_tree(self, file_paths: Iterable[PathLike]) -> None:
+        """Updates the entries of the given files in the directory tree to match the file system, without rescanning the repository"""
+        for file_path in file_paths:
+            file_path = self.to_absolute(file_path)
+            rel_path = str(self.to_relative(file_path))
+            exists = self.io.file_exists(file_path) and not any(fnmatch.fnmatch(rel_path, pattern) or rel_path.startswith(pattern) for pattern in GLOBAL_FILE_IGNORE_LIST)
+            directory = self.directories.get(file_path.parent)
+            if exists:
+                if directory is None:
+                    directory = self.get_directory(file_path.parent, create_on_missing=True)
+                if file_path.name not in directory._files:
+                    directory._add_file(file_path.name)
+            elif directory is not None and file_path.name in directory._files:
+                directory._remove_file(file_path.name)
+                # Directories are only part of the tree while they contain files
+                while not directory.item_names and directory.path != self.repo_path:
+                    del self.directories[directory.path]
+                    self.path_index.remove(directory.path)
+                    if (parent := self.directories.get(directory.path.parent)) is None:
+                        break
+                    parent._remove_subdirectory(directory.name)
+                    directory = parent
+
     def get_directory(self, directory_path: PathLike, create_on_missing: bool = False, ignore_case: bool = False) -> Directory | None:
         """Returns the directory object for the given path, or None if the directory does not exist.
 
@@ -403,10 +554,8 @@ class CodebaseContext:
         # Get the directory
         if dir := self.directories.get(absolute_path, None):
             return dir
-        if ignore_case:
-            for path, directory in self.directories.items():
-                if str(absolute_path).lower() == str(path).lower():
-                    return directory
+        if ignore_case and (path := self.path_index.get_ignore_case(absolute_path)) in self.directories:
+            return self.directories[path]
 
         # If the directory does not exist, create it
         if create_on_missing:
@@ -417,6 +566,7 @@ class CodebaseContext:
             if str(absolute_path) == str(self.repo_path) or str(absolute_path) == str(parent_path):
                 root_directory = Directory(ctx=self, path=absolute_path, dirpath="")
                 self.directories[absolute_path] = root_directory
+                self.path_index.add(absolute_path)
                 return root_directory
 
             # Recursively create the parent directory
@@ -427,39 +577,31 @@ class CodebaseContext:
             parent._add_subdirectory(directory.name)
             # Add the directory to the tree
             self.directories[absolute_path] = directory
+            self.path_index.add(absolute_path)
             return directory
         return None
 
-    def _process_diff_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool = True) -> None:
+    def _process_diff_files(
+        self,
+        files_to_sync: Mapping[SyncType, list[Path]],
+        incremental: bool = True,
+        snapshot: GraphSnapshot | None = None,
+        content_hashes: dict[str, str] | None = None,
+        file_edits: Mapping[Path, tuple[bytes, list[ContentEdit]]] | None = None,
+        changed_paths: Iterable[Path] | None = None,
+        config_paths: Collection[Path] | None = None,
+    ) -> None:
         # If all the files are empty, don't uncache
         assert self._computing is False
         skip_uncache = incremental and ((len(files_to_sync[SyncType.DELETE]) + len(files_to_sync[SyncType.REPARSE])) == 0)
+        # Files whose cached properties were cleared for this sync
+        uncached = set()
         if not skip_uncache:
-            uncache_all()
+            uncached = self._uncache_changed_files(files_to_sync)
+        sync = incremental
         # Step 0: Start the dependency manager and language engine if they exist
-        # Start the dependency manager. This may or may not run asynchronously, depending on the implementation
-        if self.dependency_manager is not None:
-            # Check if its inital start or a reparse
-            if not self.dependency_manager.ready() and not self.dependency_manager.error():
-                # TODO: We do not reparse dependencies during syncs as it is expensive. We should probably add a flag for this
-                logger.info("> Starting dependency manager")
-                self.dependency_manager.start(async_start=False)
-
-        # Start the language engine. This may or may not run asynchronously, depending on the implementation
-        if self.language_engine is not None:
-            # Check if its inital start or a reparse
-            if not self.language_engine.ready() and not self.language_engine.error():
-                logger.info("> Starting language engine")
-                self.language_engine.start(async_start=False)
-            else:
-                logger.info("> Reparsing language engine")
-                self.language_engine.reparse(async_start=False)
-
         # Step 1: Wait for dependency manager and language engines to finish before graph construction
-        if self.dependency_manager is not None:
-            self.dependency_manager.wait_until_ready(ignore_error=self.config.ignore_process_errors)
-        if self.language_engine is not None:
-            self.language_engine.wait_until_ready(ignore_error=self.config.ignore_process_errors)
+        self._start_engines()
 
         # ====== [ Refresh the graph] ========
         # Step 2: For any files that no longer exist, remove them during the sync
@@ -499,45 +641,58 @@ class CodebaseContext:
         for idx, file_path in enumerate(files_to_sync[SyncType.REPARSE]):
             task.update(f"Reparsing {self.to_relative(file_path)}", count=idx)
             file = self.get_file(file_path)
-            to_resolve.extend(file.unparse(reparse=True))
+            interface = FileInterface.from_file(self, file) if not self.config.disable_graph else None
+            predecessors = file.unparse(reparse=True)
             to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
-            file.sync_with_file_content()
+            old_content, edits = file_edits.get(file_path, (None, None)) if file_edits else (None, None)
+            file.sync_with_file_content(old_content, edits)
+            # Only the nodes depending on the interface of a changed node need to be resolved again
+            to_resolve.extend(interface.restore(self, file, predecessors) if interface is not None else predecessors)
             files_to_resolve.append(file)
         task.end()
         # Step 5: Add new files as nodes to graph (does not yet add edges)
         task = self.progress.begin("Adding new files", count=len(files_to_sync[SyncType.ADD]))
-        for idx, filepath in enumerate(files_to_sync[SyncType.ADD]):
+        for idx, (filepath, content, ts_node) in enumerate(self._parse_new_files(files_to_sync[SyncType.ADD], content_hashes)):
             task.update(f"Adding {self.to_relative(filepath)}", count=idx)
-            try:
-                content = self.io.read_text(filepath)
-            except UnicodeDecodeError as e:
-                logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
-                continue
-            # TODO: this is wrong with context changes
-            if filepath.suffix in self.extensions:
-                file_cls = self.node_classes.file_cls
-                new_file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False)
-                if new_file is not None:
-                    files_to_resolve.append(new_file)
+            file_cls = self.node_classes.file_cls
+            new_file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False, ts_node=ts_node)
+            if new_file is not None:
+                files_to_resolve.append(new_file)
         task.end()
         for file in files_to_resolve:
             to_resolve.append(file)
             to_resolve.extend(file.get_nodes())
 
         to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
-        counter = Counter(node.node_type for node in to_resolve)
 
-        # Step 6: Build directory tree
-        logger.info("> Building directory tree")
-        self.build_directory_tree()
+        # Step 6: Build directory tree, or only update the entries of the changed files when syncing
+        if incremental and changed_paths is not None:
+            logger.info("> Updating directory tree")
+            self.update_directory_tree(dict.fromkeys(itertools.chain(changed_paths, files_to_sync[SyncType.ADD], files_to_sync[SyncType.DELETE])))
+        else:
+            logger.info("> Building directory tree")
+            self.build_directory_tree()
 
-        # Step 7: Build configs
+        # Step 7: Build configs, or only assign them to the new files when syncing unless a config file changed
         if self.config_parser is not None:
-            self.config_parser.parse_configs()
+            if incremental and config_paths is not None:
+                if files_to_reresolve := self.config_parser.sync_configs(config_paths, files_to_resolve):
+                    # The imports of files whose config changed may resolve differently
+                    logger.info(f"> Resolving the imports of {len(files_to_reresolve)} files again after config changes")
+                    uncached |= self._uncache_changed_files({SyncType.REPARSE: [file.path for file in files_to_reresolve]}, uncached)
+                    skip_uncache = False
+                    to_resolve.extend(imp for file in files_to_reresolve for imp in file.imports)
+            else:
+                self.config_parser.parse_configs()
+
+        # Step 8: Restore the import resolution of unchanged files from the snapshot, only the remaining nodes need to be linked
+        to_link = to_resolve
+        if snapshot is not None and not self.config.disable_graph:
+            to_link = snapshot.restore(self, files_to_resolve, content_hashes)
 
-        # Step 8: Add internal import resolution edges for new and updated files
+        # Step 9: Add internal import resolution edges for new and updated files
         if not skip_uncache:
-            uncache_all()
+            uncache_recent()
 
         if self.config.disable_graph:
             logger.warning("Graph generation is disabled. Skipping import and symbol resolution")
@@ -545,41 +700,139 @@ class CodebaseContext:
         else:
             self._computing = True
             try:
-                logger.info(f"> Computing import resolution edges for {counter[NodeType.IMPORT]} imports")
-                task = self.progress.begin("Resolving imports", count=counter[NodeType.IMPORT])
-                for node in to_resolve:
-                    if node.node_type == NodeType.IMPORT:
-                        task.update(f"Resolving imports in {node.filepath}", count=idx)
-                        node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
-                        node.add_symbol_resolution_edge()
-                        to_resolve.extend(node.symbol_usages)
-                task.end()
-                if counter[NodeType.EXPORT] > 0:
-                    logger.info(f"> Computing export dependencies for {counter[NodeType.EXPORT]} exports")
-                    task = self.progress.begin("Computing export dependencies", count=counter[NodeType.EXPORT])
-                    for node in to_resolve:
-                        if node.node_type == NodeType.EXPORT:
-                            task.update(f"Computing export dependencies for {node.filepath}", count=idx)
-                            node._remove_internal_edges(EdgeType.EXPORT)
-                            node.compute_export_dependencies()
-                            to_resolve.extend(node.symbol_usages)
-                    task.end()
-                if counter[NodeType.SYMBOL] > 0:
-                    from codegen.sdk.core.interfaces.inherits import Inherits
-
-                    logger.info("> Computing superclass dependencies")
-                    task = self.progress.begin("Computing superclass dependencies", count=counter[NodeType.SYMBOL])
-                    for symbol in to_resolve:
-                        if isinstance(symbol, Inherits):
-                            task.update(f"Computing superclass dependencies for {symbol.filepath}", count=idx)
-                            symbol._remove_internal_edges(EdgeType.SUBCLASS)
-                            symbol.compute_superclass_dependencies()
-                    task.end()
+                self._resolve_imports(to_link)
                 if not skip_uncache:
-                    uncache_all()
+                    uncache_recent()
                 self._compute_dependencies(to_resolve, incremental)
             finally:
                 self._computing = False
+            if sync:
+                # Files depending on the changed files through the new edges only were not cleared by the walk over the
+                # old edges above
+                self._uncache_changed_files({sync_type: files_to_sync[sync_type] for sync_type in (SyncType.ADD, SyncType.REPARSE)}, uncached)
+
+    def _start_engines(self, reparse: bool = True) -> None:
+        """Starts the dependency manager and language engine if they exist, and waits for them to be ready.
+
+        If the language engine was already started, it is reparsed unless `reparse` is False.
+        """
+        # Start the dependency manager. This may or may not run asynchronously, depending on the implementation
+        if self.dependency_manager is not None:
+            # Check if its inital start or a reparse
+            if not self.dependency_manager.ready() and not self.dependency_manager.error():
+                # TODO: We do not reparse dependencies during syncs as it is expensive. We should probably add a flag for this
+                logger.info("> Starting dependency manager")
+                self.dependency_manager.start(async_start=False)
+
+        # Start the language engine. This may or may not run asynchronously, depending on the implementation
+        if self.language_engine is not None:
+            # Check if its inital start or a reparse
+            if not self.language_engine.ready() and not self.language_engine.error():
+                logger.info("> Starting language engine")
+                self.language_engine.start(async_start=False)
+            elif reparse:
+                logger.info("> Reparsing language engine")
+                self.language_engine.reparse(async_start=False)
+
+        # Wait for dependency manager and language engines to finish before graph construction
+        if self.dependency_manager is not None:
+            self.dependency_manager.wait_until_ready(ignore_error=self.config.ignore_process_errors)
+        if self.language_engine is not None:
+            self.language_engine.wait_until_ready(ignore_error=self.config.ignore_process_errors)
+
+    def _resolve_imports(self, to_resolve: list[Importable]) -> None:
+        """Adds the import resolution, export and superclass edges of the given nodes.
+
+        `to_resolve` is extended with the usages of the resolved imports and exports, whose dependencies change.
+        """
+        counter = Counter(node.node_type for node in to_resolve)
+        logger.info(f"> Computing import resolution edges for {counter[NodeType.IMPORT]} imports")
+        task = self.progress.begin("Resolving imports", count=counter[NodeType.IMPORT])
+        for idx, node in enumerate(to_resolve):
+            if node.node_type == NodeType.IMPORT:
+                task.update(f"Resolving imports in {node.filepath}", count=idx)
+                node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
+                node.add_symbol_resolution_edge()
+                to_resolve.extend(node.symbol_usages)
+        task.end()
+        if counter[NodeType.EXPORT] > 0:
+            logger.info(f"> Computing export dependencies for {counter[NodeType.EXPORT]} exports")
+            task = self.progress.begin("Computing export dependencies", count=counter[NodeType.EXPORT])
+            for idx, node in enumerate(to_resolve):
+                if node.node_type == NodeType.EXPORT:
+                    task.update(f"Computing export dependencies for {node.filepath}", count=idx)
+                    node._remove_internal_edges(EdgeType.EXPORT)
+                    node.compute_export_dependencies()
+                    to_resolve.extend(node.symbol_usages)
+            task.end()
+        if counter[NodeType.SYMBOL] > 0:
+            from codegen.sdk.core.interfaces.inherits import Inherits
+
+            logger.info("> Computing superclass dependencies")
+            task = self.progress.begin("Computing superclass dependencies", count=counter[NodeType.SYMBOL])
+            for idx, symbol in enumerate(to_resolve):
+                if isinstance(symbol, Inherits):
+                    task.update(f"Computing superclass dependencies for {symbol.filepath}", count=idx)
+                    symbol._remove_internal_edges(EdgeType.SUBCLASS)
+                    symbol.compute_superclass_dependencies()
+            task.end()
+
+    def _uncache_changed_files(self, files_to_sync: Mapping[SyncType, list[Path]], uncached: Collection[NodeId | None] = ()) -> set[NodeId | None]:
+        """Clears the cached properties of every node in the changed files and in the files depending on them.
+
+        A file depends on a changed file if any of its nodes can reach a node of the changed file through the graph. The
+        files directly used by a changed file are cleared as well, since their usages change. Caches of objects that don't
+        belong to any file (the codebase, directories) are always cleared. Files in `uncached` are walked but not cleared
+        again. Returns the files cleared.
+        """
+        changed = {file.node_id for file_path in itertools.chain.from_iterable(files_to_sync.values()) if (file := self.get_file(file_path)) is not None}
+        to_uncache = {None, *changed}
+        to_visit = list(changed)
+        while to_visit:
+            file_node_id = to_visit.pop()
+            file = self.get_node(file_node_id)
+            for node in (file, *file.get_nodes(sort=False)):
+                for predecessor in self._graph.predecessors(node.node_id):
+                    if predecessor.file_node_id not in to_uncache:
+                        to_uncache.add(predecessor.file_node_id)
+                        to_visit.append(predecessor.file_node_id)
+                if file_node_id in changed:
+                    to_uncache.update(successor.file_node_id for successor in self._graph.successors(node.node_id))
+        to_uncache.difference_update(uncached)
+        if to_uncache:
+            logger.info(f"> Clearing cached properties of {len(to_uncache - {None})} files")
+            uncache_files(to_uncache)
+        return to_uncache
+
+    def _parse_new_files(self, filepaths: list[Path], content_hashes: dict[str, str] | None = None) -> Iterator[tuple[Path, str, TSNode | None]]:
+        """Reads the given files and, if `parse_workers` > 1, parses them across worker threads.
+
+        Yields (filepath, content, ts_node) in the order of `filepaths`. `ts_node` is None when parsing is left to the file class.
+        Node construction always happens on the calling thread, so the resulting graph is identical to a serial build.
+        Every file is read exactly once, while the files before it are being parsed.
+        If `content_hashes` is given, it is filled with the content hash of every file read.
+        """
+
+        def read_files() -> Iterator[tuple[Path, str]]:
+            for filepath in filepaths:
+                try:
+                    content_bytes = self.io.read_bytes(filepath)
+                    content = content_bytes.decode("utf-8")
+                except UnicodeDecodeError as e:
+                    logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
+                    continue
+                if content_hashes is not None:
+                    content_hashes[str(self.to_relative(filepath))] = hash_content(content_bytes)
+                # TODO: this is wrong with context changes
+                if filepath.suffix in self.extensions:
+                    yield filepath, content
+
+        if self.config.parse_workers > 1 and len(filepaths) > 1:
+            logger.info(f"> Parsing {len(filepaths)} files with {self.config.parse_workers} workers")
+            yield from parse_files(read_files(), max_workers=self.config.parse_workers)
+        else:
+            for filepath, content in read_files():
+                yield filepath, content, None
 
     def _compute_dependencies(self, to_update: list[Importable], incremental: bool):
         seen = set()
@@ -600,29 +853,203 @@ class CodebaseContext:
             task.end()
         seen.clear()
 
-    def build_subgraph(self, nodes: list[NodeId]) -> PyDiGraph[Importable, Edge]:
-        """Builds a subgraph from the given set of nodes"""
+    @contextmanager
+    def _suspend_lazy_loading(self) -> Generator[None, None, None]:
+        """Stops accessed files from being loaded (`exp_lazy_graph`) while the graph is being updated.
+
+        Files accessed while suspended, e.g. by import resolution, are only parsed. Their imports are resolved once the
+        edges of one of their nodes are accessed.
+        """
+        suspended, self._lazy.suspended = self._lazy.suspended, True
+        try:
+            yield
+        finally:
+            self._lazy.suspended = suspended
+
+    def _parse_lazy_files(self, file_paths: list[str]) -> None:
+        """Parses the given files, which were not parsed yet, without resolving their imports"""
+        computing, self._computing = self._computing, False
+        try:
+            files = []
+            file_cls = self.node_classes.file_cls
+            for filepath, content, ts_node in self._parse_new_files([self._lazy.unparsed.pop(file_path) for file_path in file_paths]):
+                file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False, ts_node=ts_node)
+                if file is not None:
+                    files.append(file)
+                    self._lazy.mark_parsed(file.file_path)
+            if files and self.config_parser is not None:
+                self.config_parser.parse_configs(files)
+        finally:
+            self._computing = computing
+
+    def _link_lazy_files(self, file_paths: Iterable[str]) -> None:
+        """Resolves the imports, exports and superclasses of the given files if they were only parsed so far"""
+        files = [self.get_node(self.filepath_idx[file_path]) for file_path in dict.fromkeys(file_paths) if file_path in self._lazy.unlinked]
+        self._lazy.unlinked.difference_update(file.file_path for file in files)
+        if files and not self.config.disable_graph:
+            with self._suspend_lazy_loading():
+                self._resolve_imports([node for file in files for node in (file, *file.get_nodes())])
+            # Properties may have been cached while the imports were partially resolved
+            uncache_recent()
+
+    def _link_node_file(self, node_id: NodeId) -> None:
+        """Resolves the imports of the file of the given node before its edges are accessed (`exp_lazy_graph`)"""
+        if (file_path := self.get_node(node_id).filepath) in self._lazy.unlinked:
+            self._link_lazy_files([file_path])
+
+    def _load_lazy_files(self, file_paths: list[str], resolve: bool = True) -> None:
+        """Parses the given files and resolves their imports, then computes their dependencies if `resolve` is set.
+
+        While the graph is being updated, the files are only parsed.
+        """
+        if self._lazy.suspended:
+            self._parse_lazy_files([file_path for file_path in file_paths if file_path in self._lazy.unparsed])
+            return
+        logger.info(f"> Loading {len(file_paths)} files")
+        with self._suspend_lazy_loading():
+            self._start_engines(reparse=False)
+            self._parse_lazy_files([file_path for file_path in dict.fromkeys(file_paths) if file_path in self._lazy.unparsed])
+            self._link_lazy_files(file_paths)
+            if resolve and not self.config.disable_graph:
+                to_resolve = [file_path for file_path in dict.fromkeys(file_paths) if file_path in self._lazy.unresolved]
+                task = self.progress.begin("Computing dependencies", count=len(to_resolve))
+                self._computing = True
+                try:
+                    for idx, file_path in enumerate(to_resolve):
+                        task.update(f"Computing dependencies for {file_path}", count=idx)
+                        self._lazy.unresolved.remove(file_path)
+                        file = self.get_node(self.filepath_idx[file_path])
+                        # Only the nodes of the file are affected, which are all recomputed here
+                        for node in (file, *file.get_nodes(sort=False)):
+                            node.recompute(incremental=True)
+                finally:
+                    self._computing = False
+                task.end()
+
+    def _load_all_lazy_files(self, resolve: bool = False) -> None:
+        """Loads every file not loaded yet, and computes the dependencies of every file if `resolve` is set"""
+        if not self._lazy.suspended and self._lazy.has_pending(resolve):
+            self._load_lazy_files([*self._lazy.unparsed, *self._lazy.unlinked, *(self._lazy.unresolved if resolve else ())], resolve)
+
+    def _load_lazy_files_mentioning(self, terms: set[str], packages: Iterable[Path] = ()) -> None:
+        """Loads every file whose content mentions one of `terms`, or which is within one of `packages`.
+
+        Files parsed later on were not parsed at this point, so the terms don't need to be looked up again.
+        """
+        new_terms = terms - self._lazy.loaded_terms
+        prefixes = tuple("" if str(package) == "." else f"{package}{os.sep}" for package in packages)
+        if not new_terms and not prefixes:
+            return
+        file_paths = []
+        if prefixes:
+            file_paths.extend(file_path for file_path in itertools.chain(self._lazy.unparsed, self._lazy.unlinked) if file_path.startswith(prefixes))
+        if new_terms:
+            file_paths.extend(self._lazy.files_mentioning(new_terms, lambda file_path: self.io.read_bytes(self.to_absolute(file_path))))
+        if file_paths:
+            self._load_lazy_files(file_paths, resolve=False)
+        self._lazy.loaded_terms.update(terms)
+
+    def load_references(self, node: Importable, resolve: bool = True) -> None:
+        """Loads the files that may reference `node` (`exp_lazy_graph`), and computes their dependencies if `resolve` is set.
+
+        Symbols are only resolved through imports, so these are the file of the node and every file importing it, directly
+        or through other files. Imports name the module of the file they import, except relative imports of a package
+        (`from .. import x`, `import x from ".."`), which can only come from files within the package.
+        """
+        if self._lazy.suspended or not self._lazy.has_pending(resolve):
+            return
+        done = self._lazy.resolved_importers if resolve else self._lazy.loaded_importers
+        if node.filepath in done or (node_id := self.filepath_idx.get(node.filepath)) is None:
+            return
+        importers = {node.filepath}
+        to_visit = [self.get_node(node_id)]
+        while to_visit:
+            # Load the files that may import any file of the current level at once
+            terms = set()
+            packages = []
+            for file in to_visit:
+                if file.path.stem in ("__init__", "index"):
+                    terms.add(file.path.parent.name)
+                    packages.append(self.to_relative(file.path.parent))
+                else:
+                    terms.add(file.path.stem)
+            self._load_lazy_files_mentioning(terms, packages)
+            level, to_visit = to_visit, []
+            for file in level:
+                for imported in (file, *file.get_nodes(sort=False)):
+                    for importer_id, _, edge in self._graph.in_edges(imported.node_id):
+                        if edge.type == EdgeType.IMPORT_SYMBOL_RESOLUTION and (importer := self.get_node(importer_id).file).file_path not in importers:
+                            importers.add(importer.file_path)
+                            # The importers of files already done were loaded as well
+                            if importer.file_path not in done:
+                                to_visit.append(importer)
+        if resolve:
+            self._load_lazy_files([file_path for file_path in importers if file_path in self._lazy.unresolved])
+        self._lazy.loaded_importers.update(importers)
+        if resolve:
+            self._lazy.resolved_importers.update(importers)
+
+    def load_dependencies(self, node: Importable) -> None:
+        """Computes the dependencies of the file of `node` if they were not computed yet (`exp_lazy_graph`)"""
+        if self._lazy.unresolved and not self._lazy.suspended and node.filepath in self._lazy.unresolved:
+            self._load_lazy_files([node.filepath])
+
+    def build_subgraph(self, nodes: Iterable[NodeId], *, edge_types: Collection[EdgeType] | None = None) -> PyDiGraph[Importable, Edge]:
+        """Builds the subgraph induced by the given nodes, optionally keeping only the edges of the given types.
+
+        Only the given nodes and the edges between them are visited, so this is proportional to the size of the subgraph
+        rather than the whole graph. Nodes are renumbered in the order they are given.
+        """
+        node_map = {}
         subgraph = PyDiGraph()
-        subgraph.add_nodes_from(self._graph.nodes())
-        subgraph.add_edges_from(self._graph.weighted_edge_list())
-        return subgraph.subgraph(nodes)
+        for node_id in nodes:
+            if node_id not in node_map:
+                node_map[node_id] = subgraph.add_node(self._graph.get_node_data(node_id))
+        subgraph.add_edges_from([(node_map[u], node_map[v], edge) for u in node_map for _, v, edge in self._graph.out_edges(u) if v in node_map and (edge_types is None or edge.type in edge_types)])
+        return subgraph
 
     def get_node(self, node_id: int) -> Any:
         return self._graph.get_node_data(node_id)
 
-    def get_nodes(self, node_type: NodeType | None = None, exclude_type: NodeType | None = None) -> list[Importable]:
+    def get_nodes(self, node_type: NodeType | None = None, exclude_type: NodeType | None = None, *, symbol_type: SymbolType | None = None) -> list[Importable]:
+        """Returns the nodes of the graph in node id order, optionally restricted to a node type or a symbol type.
+
+        Typed lookups are served from an index maintained as nodes are added and removed.
+        """
         if node_type is not None and exclude_type is not None:
             msg = "node_type and exclude_type cannot both be specified"
             raise ValueError(msg)
+        self._load_all_lazy_files()
+        # Accessing the graph builds it if it was not built yet, which fills the node type index used below
+        graph = self._graph
+        if symbol_type is not None:
+            if node_type not in (None, NodeType.SYMBOL):
+                msg = "symbol_type can only be specified for symbols"
+                raise ValueError(msg)
+            return self._node_type_idx.get_symbols(symbol_type)
         if node_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type == node_type)]
+            return self._node_type_idx.get_nodes(node_type)
         if exclude_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type != node_type)]
-        return self._graph.nodes()
+            return [node for node in graph.nodes() if node.node_type != exclude_type]
+        return graph.nodes()
+
+    def get_top_level_symbols(self, name: str) -> list[Symbol]:
+        """Returns the top-level symbols named `name` in node id order, looked up from an index maintained with the graph."""
+        if not self.__graph_ready:
+            self.build_graph(self.projects[0].repo_operator)
+        if self._lazy.unparsed and not self._lazy.suspended:
+            self._load_lazy_files_mentioning({name})
+        return self._node_type_idx.get_top_level_symbols(name)
 
     def get_edges(self) -> list[tuple[NodeId, NodeId, EdgeType, Usage | None]]:
+        self._load_all_lazy_files(resolve=True)
         return [(x[0], x[1], x[2].type, x[2].usage) for x in self._graph.weighted_edge_list()]
 
+    @property
+    def has_source_files(self) -> bool:
+        """Whether any file was parsed into the graph, or is left to parse on demand with `exp_lazy_graph`"""
+        return bool(self.filepath_idx or self._lazy.unparsed)
+
     def get_file(self, file_path: os.PathLike, ignore_case: bool = False) -> SourceFile | None:
         # If not part of repo path, return None
         absolute_path = self.to_absolute(file_path)
@@ -630,15 +1057,33 @@ class CodebaseContext:
             assert False, f"File {file_path} is not part of the repository path"
 
         # Check if file exists in graph
-        node_id = self.filepath_idx.get(str(self.to_relative(file_path)), None)
+        if (file := self.get_file_by_relative_path(str(self.to_relative(file_path)))) is not None:
+            return file
+        if ignore_case and (path := self.path_index.get_ignore_case(absolute_path)) is not None:
+            return self.get_file(path, ignore_case=False)
+
+    def get_file_by_relative_path(self, relative_path: str) -> SourceFile | None:
+        """Returns the file of the graph at the given normalized path relative to the repository, without any path conversion"""
+        node_id = self.filepath_idx.get(relative_path, None)
+        if node_id is None and relative_path in self._lazy.unparsed:
+            # Load the file on first access
+            self._load_lazy_files([relative_path])
+            node_id = self.filepath_idx.get(relative_path, None)
+        elif node_id is not None and relative_path in self._lazy.unresolved:
+            self.load_dependencies(self.get_node(node_id))
         if node_id is not None:
             return self.get_node(node_id)
-        if ignore_case:
-            # Using `get_directory` so that the case insensitive lookup works
-            parent = self.get_directory(self.to_absolute(file_path).parent, ignore_case=ignore_case).path
-            for file in parent.iterdir():
-                if str(file_path).lower() == str(self.to_relative(file)).lower():
-                    return self.get_file(file, ignore_case=False)
+        return None
+
+    def add_file_path(self, file_path: str, node_id: NodeId) -> None:
+        """Indexes the file node `node_id` by its path"""
+        self.filepath_idx[file_path] = node_id
+        if self.module_map is not None:
+            self.module_map.add(file_path)
+
+    def remove_file_path(self, file_path: str) -> None:
+        if self.filepath_idx.pop(file_path, None) is not None and self.module_map is not None and file_path not in self._lazy.unparsed:
+            self.module_map.remove(file_path)
 
     def _get_raw_file_from_path(self, path: Path) -> File | None:
         from codegen.sdk.core.file import File
@@ -661,7 +1106,11 @@ class CodebaseContext:
                 raise Exception(msg)
         if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_node(node)
+        node_id = self._graph.add_node(node)
+        self._graph_generation += 1
+        self._node_type_idx.add(node_id, node)
+        self._usage_idx.discard(node_id)
+        return node_id
 
     def add_child(self, parent: NodeId, node: Importable, type: EdgeType, usage: Usage | None = None) -> int:
         if self.config.debug:
@@ -670,7 +1119,11 @@ class CodebaseContext:
                 raise Exception(msg)
         if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_child(parent, node, Edge(type, usage))
+        node_id = self._graph.add_child(parent, node, Edge(type, usage))
+        self._graph_generation += 1
+        self._node_type_idx.add(node_id, node)
+        self._usage_idx.discard(node_id)
+        return node_id
 
     def has_node(self, node_id: NodeId):
         return isinstance(node_id, int) and self._graph.has_node(node_id)
@@ -685,6 +1138,9 @@ class CodebaseContext:
             assert self._graph.has_node(v), v
             assert not self.has_edge(u, v, edge), (u, v, edge)
         self._graph.add_edge(u, v, edge)
+        self._graph_generation += 1
+        if type == EdgeType.SYMBOL_USAGE:
+            self._usage_idx.add(v, usage)
 
     def add_edges(self, edges: list[tuple[NodeId, NodeId, Edge]]) -> None:
         if self.config.debug:
@@ -693,16 +1149,24 @@ class CodebaseContext:
                 assert self._graph.has_node(v), v
                 assert not self.has_edge(u, v, edge), (self.get_node(u), self.get_node(v), edge)
         self._graph.add_edges_from(edges)
+        self._graph_generation += 1
+        for _, v, edge in edges:
+            if edge.type == EdgeType.SYMBOL_USAGE:
+                self._usage_idx.add(v, edge.usage)
 
     @property
     def nodes(self):
+        self._load_all_lazy_files()
         return self._graph.nodes()
 
     @property
     def edges(self) -> WeightedEdgeList[Edge]:
+        self._load_all_lazy_files(resolve=True)
         return self._graph.weighted_edge_list()
 
     def predecessor(self, n: NodeId, *, edge_type: EdgeType | None) -> Importable:
+        if self._lazy.unlinked:
+            self._link_node_file(n)
         return self._graph.find_predecessor_node_by_edge(n, lambda edge: edge.type == edge_type)
 
     def predecessors(self, n: NodeId, edge_type: EdgeType | None = None) -> Sequence[Importable]:
@@ -711,6 +1175,8 @@ class CodebaseContext:
         return self._graph.predecessors(n)
 
     def successors(self, n: NodeId, *, edge_type: EdgeType | None = None, sort: bool = True) -> Sequence[Importable]:
+        if self._lazy.unlinked:
+            self._link_node_file(n)
         if edge_type is not None:
             res = self._graph.find_successors_by_edge(n, lambda edge: edge.type == edge_type)
         else:
@@ -725,36 +1191,68 @@ class CodebaseContext:
     def in_edges(self, n: NodeId) -> WeightedEdgeList[Edge]:
         return self._graph.in_edges(n)
 
+    def get_usages(self, n: NodeId) -> list[Usage]:
+        """Returns the usages of a node from its SYMBOL_USAGE in-edges, sorted by source location in reverse.
+
+        The usages are cached and kept sorted as usage edges are added and removed. They may contain duplicates.
+        """
+        if (ret := self._usage_idx.get(n)) is None:
+            ret = self._usage_idx.build(n, (edge.usage for _, _, edge in self._graph.in_edges(n) if edge.type == EdgeType.SYMBOL_USAGE))
+        return ret
+
+    def get_reachable(
+        self,
+        n: NodeId,
+        *,
+        edge_types: Collection[EdgeType] = (EdgeType.SYMBOL_USAGE,),
+        usage_types: UsageType | None = None,
+        max_depth: int | None = None,
+        reverse: bool = False,
+    ) -> list[NodeId]:
+        """Returns the nodes reachable from a node through edges of the given types, or reaching it if `reverse` is set, in
+        no particular order.
+
+        The closures are memoized until the next change to the graph, see `ReachabilityIndex`.
+        """
+        self._load_all_lazy_files(resolve=True)
+        return self._reachability.get_reachable(self._graph, self._graph_generation, n, edge_types=edge_types, usage_types=usage_types, max_depth=max_depth, reverse=reverse)
+
     def out_edges(self, n: NodeId) -> WeightedEdgeList[Edge]:
+        if self._lazy.unlinked:
+            self._link_node_file(n)
         return self._graph.out_edges(n)
 
     def remove_node(self, n: NodeId):
+        if self._graph.has_node(n):
+            self._node_type_idx.remove(n, self._graph.get_node_data(n))
+            for _, v, edge in self._graph.out_edges(n):
+                if edge.type == EdgeType.SYMBOL_USAGE:
+                    self._usage_idx.remove(v, edge.usage)
+            self._usage_idx.discard(n)
+            if self._graph.get_node_data(n).node_type == NodeType.FILE:
+                forget_file(n)
+            self._graph_generation += 1
         return self._graph.remove_node(n)
 
     def remove_edge(self, u: NodeId, v: NodeId, *, edge_type: EdgeType | None = None):
         for edge in self._graph.edge_indices_from_endpoints(u, v):
+            data = self._graph.get_edge_data_by_index(edge)
             if edge_type is not None:
-                if self._graph.get_edge_data_by_index(edge).type != edge_type:
+                if data.type != edge_type:
                     continue
+            if data.type == EdgeType.SYMBOL_USAGE:
+                self._usage_idx.remove(v, data.usage)
             self._graph.remove_edge_from_index(edge)
+            self._graph_generation += 1
 
-    @lru_cache(maxsize=10000)
     def to_absolute(self, filepath: PathLike | str) -> Path:
-        path = Path(filepath)
-        if not path.is_absolute():
-            path = Path(self.repo_path) / path
-        return path.resolve()
+        return self.path_index.to_absolute(filepath)
 
-    @lru_cache(maxsize=10000)
     def to_relative(self, filepath: PathLike | str) -> Path:
-        path = self.to_absolute(filepath)
-        if path == Path(self.repo_path) or Path(self.repo_path) in path.parents:
-            return path.relative_to(self.repo_path)
-        return path
+        return self.path_index.to_relative(filepath)
 
     def is_subdir(self, path: PathLike | str) -> bool:
-        path = self.to_absolute(path)
-        return path == Path(self.repo_path) or path.is_relative_to(self.repo_path) or Path(self.repo_path) in path.parents
+        return self.path_index.is_subdir(path)
 
     @commiter
     def commit_transactions(self, sync_graph: bool = True, sync_file: bool = True, files: set[Path] | None = None) -> None:
@@ -770,7 +1268,8 @@ class CodebaseContext:
         files_to_lock = self.transaction_manager.to_commit(files)
         diffs = self.transaction_manager.commit(files_to_lock)
         for diff in diffs:
-            if self.get_file(diff.path) is None:
+            # Edits to config files are synced as well, they may change how imports resolve
+            if self.get_file(diff.path) is None and (self.config_parser is None or not self.config_parser.is_config_file(self.to_absolute(diff.path))):
                 self.unapplied_diffs.append(diff)
             else:
                 self.pending_syncs.append(diff)
@@ -823,6 +1322,7 @@ class CodebaseContext:
         # Remove the directory from the tree
         if str(directory_path) in self.directories:
             del self.directories[str(directory_path)]
+        self.path_index.remove(directory.path)
 
         # Remove the directory from the parent
         if directory.parent is not None:
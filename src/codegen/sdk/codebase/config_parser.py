@@ -4,7 +4,11 @@ from typing import TYPE_CHECKING
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 
 if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+    from pathlib import Path
+
     from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.file import SourceFile
 
 
 class ConfigParser(ABC):
@@ -12,7 +16,23 @@ class ConfigParser(ABC):
         pass
 
     @abstractmethod
-    def parse_configs(self, codebase_context: "CodebaseContext"): ...
+    def parse_configs(self, files: "Iterable[SourceFile] | None" = None):
+        """Parses the config files and assigns them to the given files, or to every file in the graph by default"""
+
+    @abstractmethod
+    def is_config_file(self, path: "Path") -> bool:
+        """Whether a change to the file at the absolute `path` may change the configs"""
+
+    def config_paths(self) -> "Collection[Path]":
+        """The absolute paths of the config files parsed or looked up, whether or not they exist"""
+        return ()
+
+    @abstractmethod
+    def sync_configs(self, config_paths: "Collection[Path]", files: "Iterable[SourceFile]") -> "list[SourceFile]":
+        """Assigns configs to the given new files, parsing the configs again only if some of `config_paths` changed.
+
+        Returns the files in the graph whose config changed, their imports need to be resolved again.
+        """
 
 
 def get_config_parser_for_language(language: ProgrammingLanguage, codebase_context: "CodebaseContext") -> ConfigParser | None:
@@ -0,0 +1,155 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codegen.sdk.codebase.graph_snapshot import PACKAGE_ENTRY_STEMS
+from codegen.sdk.core.expressions.comparison_expression import ComparisonExpression
+from codegen.sdk.core.expressions.name import Name
+from codegen.sdk.core.expressions.string import String
+from codegen.sdk.core.statements.if_block_statement import IfBlockStatement
+from codegen.sdk.core.symbol_groups.list import List
+from codegen.sdk.enums import EdgeType
+from codegen.sdk.extensions.sort import sort_editables
+
+if TYPE_CHECKING:
+    from codegen.sdk.core.codebase import Codebase
+    from codegen.sdk.core.file import SourceFile
+    from codegen.sdk.core.import_resolution import Import
+    from codegen.sdk.core.interfaces.importable import Importable
+    from codegen.sdk.core.node_id_factory import NodeId
+    from codegen.sdk.core.statements.statement import Statement
+    from codegen.sdk.core.symbol import Symbol
+
+# Edges through which a node keeps the nodes it points to alive
+LIVE_EDGE_TYPES = frozenset({EdgeType.SYMBOL_USAGE, EdgeType.IMPORT_SYMBOL_RESOLUTION, EdgeType.EXPORT})
+
+
+@dataclass
+class DeadCodeReport:
+    """Code unreachable from the roots of a dead code analysis, sorted by file location.
+
+    Attributes:
+        symbols: Top-level symbols never used from the roots
+        imports: Imports never used from the roots
+        files: Files none of whose code is used from the roots
+    """
+
+    symbols: list["Symbol"] = field(default_factory=list)
+    imports: list["Import"] = field(default_factory=list)
+    files: list["SourceFile"] = field(default_factory=list)
+
+
+def is_test_file(file: "SourceFile") -> bool:
+    """Whether the file follows the usual naming conventions for tests in Python and TypeScript"""
+    name = file.path.name
+    if name == "conftest.py" or name.startswith("test_") or file.path.stem.endswith("_test") or ".test." in name or ".spec." in name:
+        return True
+    # Only the directories within the repository count, the repository itself may be checked out under a test directory
+    return any(part in ("test", "tests", "__tests__") for part in Path(file.filepath).parent.parts)
+
+
+def _is_main_guard(statement: "Statement") -> bool:
+    """Whether the statement is an `if __name__ == "__main__":` block"""
+    if not isinstance(statement, IfBlockStatement) or not isinstance(condition := statement.condition, ComparisonExpression):
+        return False
+    if len(condition.elements) != 2 or [operator.source for operator in condition.operators] != ["=="]:
+        return False
+    # Either side of the comparison may hold the name
+    for name, string in (condition.elements, reversed(condition.elements)):
+        if isinstance(name, Name) and name.source == "__name__" and isinstance(string, String) and string.content == "__main__":
+            return True
+    return False
+
+
+def is_entry_point(file: "SourceFile") -> bool:
+    """Whether the file is meant to be run as a script, i.e. it is a `__main__.py` or has a top-level main guard"""
+    if file.path.name == "__main__.py":
+        return True
+    return file.path.suffix == ".py" and any(_is_main_guard(statement) for statement in file.code_block.statements)
+
+
+def get_dunder_all_roots(file: "SourceFile") -> list["Importable"]:
+    """The `__all__` declaration of a Python file and the symbols or imports it names"""
+    if file.path.suffix != ".py" or (dunder_all := file.get_global_var("__all__")) is None:
+        return []
+    roots = [dunder_all]
+    if isinstance(dunder_all.value, List):
+        for item in dunder_all.value:
+            if isinstance(item, String) and (resolved := next(file.resolve_name(item.content), None)) is not None:
+                roots.append(resolved)
+    return roots
+
+
+def find_dead_code(
+    codebase: "Codebase",
+    roots: Iterable["Importable"] = (),
+    *,
+    entry_points: bool = True,
+    exported: bool = True,
+    tests: bool = True,
+    dunder_all: bool = True,
+) -> DeadCodeReport:
+    """Finds the symbols, imports and files unreachable from a set of roots in a single pass over the graph.
+
+    Starting from the roots, every node reached through symbol usages, import resolutions and exports is alive. A symbol
+    is alive as a whole: reaching a method keeps its class alive and the other way around. Any live node keeps its file
+    alive, along with the module-level code of the file, since importing the file runs it.
+
+    Args:
+        codebase: The codebase to analyze.
+        roots: Additional symbols, imports or files to keep alive.
+        entry_points: Whether files run as scripts (`__main__.py`, `if __name__ == "__main__"`) are roots.
+        exported: Whether the content of package entry points (`__init__.py`, `index.ts`) is a root.
+        tests: Whether test files are roots.
+        dunder_all: Whether the names listed in the `__all__` of Python files are roots.
+
+    Returns:
+        DeadCodeReport: The unreachable top-level symbols, imports and files.
+    """
+    ctx = codebase.ctx
+    files = list(codebase.files)
+    # Nested symbols are alive with their top-level symbol
+    owners: dict[NodeId, list[NodeId]] = {}
+    for file in files:
+        for symbol in file.symbols:
+            node_ids = [descendant.node_id for descendant in symbol.descendant_symbols]
+            for node_id in node_ids:
+                owners[node_id] = node_ids
+
+    initial = list(roots)
+    for file in files:
+        if (tests and is_test_file(file)) or (entry_points and is_entry_point(file)):
+            initial.append(file)
+            initial.extend(file.symbols)
+        elif exported and file.path.stem in PACKAGE_ENTRY_STEMS:
+            initial.append(file)
+            initial.extend(file.symbols)
+            initial.extend(file.imports)
+            initial.extend(getattr(file, "exports", ()))
+        elif dunder_all:
+            initial.extend(get_dunder_all_roots(file))
+
+    live: set[NodeId] = set()
+    to_visit: list[NodeId] = []
+
+    def mark(node: "Importable") -> None:
+        for node_id in (*owners.get(node.node_id, (node.node_id,)), node.file_node_id):
+            if node_id not in live:
+                live.add(node_id)
+                to_visit.append(node_id)
+
+    for node in initial:
+        mark(node)
+    while to_visit:
+        node = ctx.get_node(to_visit.pop())
+        ctx.load_dependencies(node)
+        for _, target, edge in ctx.out_edges(node.node_id):
+            if target not in live and edge.type in LIVE_EDGE_TYPES:
+                mark(ctx.get_node(target))
+
+    return DeadCodeReport(
+        symbols=sort_editables((symbol for file in files for symbol in file.symbols if symbol.node_id not in live), by_file=True),
+        imports=sort_editables((imp for file in files for imp in file.imports if imp.node_id not in live), by_file=True),
+        files=sort_editables((file for file in files if file.node_id not in live), by_file=True),
+    )
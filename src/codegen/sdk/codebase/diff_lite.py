@@ -36,6 +36,14 @@ class ChangeType(IntEnum):
         raise ValueError(msg)
 
 
+class ContentEdit(NamedTuple):
+    """Replacement of the bytes in [start_byte, old_end_byte) of a file's content with new_bytes"""
+
+    start_byte: int
+    old_end_byte: int
+    new_bytes: bytes
+
+
 class DiffLite(NamedTuple):
     """Simple diff for recomputing the graph"""
 
@@ -44,6 +52,8 @@ class DiffLite(NamedTuple):
     rename_from: Path | None = None
     rename_to: Path | None = None
     old_content: bytes | None = None
+    # Edits turning old_content into the new content, in the order they were applied (if known)
+    edits: tuple[ContentEdit, ...] | None = None
 
     @classmethod
     def from_watch_change(cls, change: Change, path: PathLike) -> Self:
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from tree_sitter import Node as TSNode
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.file import SourceFile
+    from codegen.sdk.core.interfaces.importable import Importable
+    from codegen.sdk.core.node_id_factory import NodeId
+    from codegen.sdk.enums import Edge
+
+logger = get_logger(__name__)
+
+# Nodes whose `body` field is an implementation detail, across the supported grammars
+FUNCTION_NODE_TYPES = frozenset(
+    {
+        "function_definition",
+        "function_declaration",
+        "generator_function_declaration",
+        "function_expression",
+        "generator_function",
+        "function",
+        "arrow_function",
+        "method_definition",
+    }
+)
+
+
+def _function_bodies(ts_node: TSNode) -> list[tuple[int, int]]:
+    """Byte ranges of the bodies of every function defined within `ts_node`, including itself"""
+    ret = []
+    to_visit = [ts_node]
+    while to_visit:
+        node = to_visit.pop()
+        if node.type in FUNCTION_NODE_TYPES and (body := node.child_by_field_name("body")) is not None:
+            ret.append((body.start_byte, body.end_byte))
+            to_visit.extend(child for child in node.children if child.id != body.id)
+        else:
+            to_visit.extend(node.children)
+    return ret
+
+
+def interface_fingerprint(node: Importable) -> str:
+    """Hashes what other files can observe of `node`: its kind, its qualified name and its source without function bodies.
+
+    For a file, these are the names it defines or imports. Edits which leave the fingerprint unchanged can't change how
+    other files resolve the node, since symbol resolution never looks into function bodies.
+    """
+    from codegen.sdk.core.file import SourceFile
+
+    h = hashlib.sha1(type(node).__name__.encode())
+    if isinstance(node, SourceFile):
+        for child in (*node.symbols, *node.imports, *getattr(node, "exports", ())):
+            h.update(f"\0{type(child).__name__}:{child.name}".encode())
+        return h.hexdigest()
+    h.update(f"\0{getattr(node, 'full_name', None)}\0".encode())
+    ts_node = getattr(node, "_decorated_node", None) or node.ts_node
+    source = ts_node.text
+    pos = ts_node.start_byte
+    for start, end in sorted(_function_bodies(ts_node)):
+        if start >= pos:
+            h.update(source[pos - ts_node.start_byte : start - ts_node.start_byte])
+            h.update(b"\0")
+            pos = end
+    h.update(source[pos - ts_node.start_byte :])
+    return h.hexdigest()
+
+
+@dataclass
+class FileInterface:
+    """Fingerprints of the nodes of a file about to be reparsed, and the edges pointing into them from other files.
+
+    Reparsing a file replaces its nodes, dropping every edge into them. Once the file is parsed again, the edges into nodes
+    whose fingerprint is unchanged are moved to the matching new nodes, so only the nodes of other files pointing into a
+    changed node have to be resolved again.
+    """
+
+    file_node_id: NodeId
+    # (fingerprint, edges into the node from other files) in the order of `file.get_nodes()`, after the file itself
+    nodes: list[tuple[str, list[tuple[NodeId, Edge]]]] = field(default_factory=list)
+
+    @classmethod
+    def from_file(cls, ctx: CodebaseContext, file: SourceFile) -> FileInterface:
+        ret = cls(file.node_id)
+        for node in (file, *file.get_nodes()):
+            ret.nodes.append((interface_fingerprint(node), [(u, edge) for u, _, edge in ctx.in_edges(node.node_id)]))
+        return ret
+
+    def _is_external(self, ctx: CodebaseContext, u: NodeId, edge: Edge) -> bool:
+        """Whether the edge and its usage only reference nodes of other files"""
+        if not ctx.has_node(u) or ctx.get_node(u).file_node_id == self.file_node_id:
+            return False
+        if (usage := edge.usage) is not None:
+            return all(node is None or node.file_node_id != self.file_node_id for node in (usage.match, usage.usage_symbol, usage.imported_by))
+        return True
+
+    def restore(self, ctx: CodebaseContext, file: SourceFile, predecessors: list[Importable]) -> list[Importable]:
+        """Moves the edges into unchanged nodes to the nodes of the reparsed `file`.
+
+        Returns:
+            The `predecessors` of the old nodes which must be resolved again, because they point into a node whose
+            fingerprint changed or which no longer exists.
+        """
+        new_nodes: defaultdict[str, list[Importable]] = defaultdict(list)
+        for node in reversed((file, *file.get_nodes())):
+            new_nodes[interface_fingerprint(node)].append(node)
+        stale: set[NodeId] = set()
+        unaffected: set[NodeId] = set()
+        edges: list[tuple[NodeId, NodeId, Edge]] = []
+        changed = 0
+        for fingerprint, in_edges in self.nodes:
+            # Nodes with the same fingerprint are matched in order
+            new_node = new_nodes[fingerprint].pop() if new_nodes.get(fingerprint) else None
+            if new_node is None:
+                changed += 1
+            for u, edge in in_edges:
+                if new_node is None or not self._is_external(ctx, u, edge):
+                    stale.add(u)
+                else:
+                    unaffected.add(u)
+                    # The file node is kept on reparse, along with its edges
+                    if new_node is not file:
+                        edges.append((u, new_node.node_id, edge))
+        # Nodes resolved again drop and recompute all their edges
+        ctx.add_edges([(u, v, edge) for u, v, edge in edges if u not in stale and ctx.has_node(u)])
+        logger.debug(f"{file.file_path}: {changed} of {len(self.nodes)} nodes changed their interface, {len(unaffected - stale)} dependent nodes are unaffected")
+        return [node for node in predecessors if node.node_id in stale or node.node_id not in unaffected]
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+from codegen.sdk.enums import Edge, EdgeType
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.external_module import ExternalModule
+    from codegen.sdk.core.file import SourceFile
+    from codegen.sdk.core.interfaces.importable import Importable
+    from codegen.sdk.core.node_id_factory import NodeId
+
+logger = get_logger(__name__)
+
+# Bump whenever the snapshot layout or the node ordering within files changes
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = ".json.gz"
+# How many commits back from the current one to look for a snapshot
+MAX_ANCESTORS = 256
+# Snapshots kept per key, the least recently used ones are deleted first
+MAX_SNAPSHOTS = 8
+# Snapshots of any key, and files left behind by interrupted saves, unused for longer than this are deleted
+MAX_SNAPSHOT_AGE = 30 * 24 * 60 * 60
+# Edges restored from a snapshot. Usages point into the middle of expressions and are always recomputed.
+SNAPSHOT_EDGE_TYPES = frozenset({EdgeType.IMPORT_SYMBOL_RESOLUTION, EdgeType.EXPORT, EdgeType.SUBCLASS})
+# Entry points of a package, imported by the name of their directory
+PACKAGE_ENTRY_STEMS = frozenset({"__init__", "index"})
+# Tokens module names are matched against, like in `LazyGraphState`
+_TOKEN = re.compile(r"[\w$]+")
+
+# (filepath, index into file.get_nodes(sort_by_id=True)). Index -1 is the file itself.
+# External modules use a filepath of None and their creation order as the index.
+NodeKey = tuple[str | None, int]
+# (source, target, edge type). The target is None if it can't be addressed by a key.
+EdgeRecord = tuple[NodeKey, NodeKey | None, int]
+
+
+def hash_content(content: bytes) -> str:
+    return hashlib.sha1(content).hexdigest()
+
+
+def get_snapshot_key(ctx: CodebaseContext) -> str:
+    """Key identifying every setting that influences the shape of the resolved graph."""
+    config = ctx.config.model_dump_json(exclude={"graph_snapshot_dir", "parse_workers", "parse_cache_mb"})
+    project = ctx.projects[0]
+    key = f"{SNAPSHOT_VERSION}:{ctx.programming_language.value}:{project.base_path}:{project.subdirectories}:{config}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def get_config_hashes(ctx: CodebaseContext) -> dict[str, str | None]:
+    """Hashes of the config files the import resolution depends on, None for the ones looked up but missing."""
+    hashes = {}
+    if ctx.config_parser is not None:
+        for path in ctx.config_parser.config_paths():
+            try:
+                content_hash = hash_content(path.read_bytes())
+            except OSError:
+                content_hash = None
+            hashes[str(ctx.to_relative(path))] = content_hash
+    return hashes
+
+
+def _node_key(value: Any) -> NodeKey:
+    match value:
+        case [str() | None as filepath, int() as idx] if filepath is not None or idx >= 0:
+            return filepath, idx
+    msg = f"Invalid node key {value!r}"
+    raise ValueError(msg)
+
+
+def _hashes(value: Any, optional: bool = False) -> dict[str, str | None]:
+    if not isinstance(value, dict) or not all(isinstance(k, str) and (isinstance(v, str) or (optional and v is None)) for k, v in value.items()):
+        msg = "Invalid content hashes"
+        raise ValueError(msg)
+    return value
+
+
+def _module_tokens(file_path: str) -> set[str]:
+    """Names under which the file at `file_path` may be imported"""
+    path = Path(file_path)
+    tokens = {path.name.split(".")[0]}
+    if path.stem.split(".")[0] in PACKAGE_ENTRY_STEMS and path.parent.name:
+        tokens.add(path.parent.name)
+    return tokens
+
+
+@dataclass
+class GraphSnapshot:
+    """Serializable copy of the import resolution of a codebase at a given commit.
+
+    Only the import resolution, export and superclass edges are captured, symbol usages are always recomputed. Nodes are
+    addressed by their position within their file, so edges are only restored for files whose content hash is unchanged
+    and whose imports can't resolve differently, any other file is resolved again.
+
+    Snapshots are stored as compressed JSON and validated when loaded, so a snapshot directory shared with others can
+    at worst produce a wrong graph, never run code.
+    """
+
+    commit: str
+    key: str
+    files: dict[str, str] = field(default_factory=dict)
+    configs: dict[str, str | None] = field(default_factory=dict)
+    external_modules: list[NodeKey] = field(default_factory=list)
+    edges: list[EdgeRecord] = field(default_factory=list)
+
+    @staticmethod
+    def get_path(directory: str | os.PathLike, commit: str, key: str) -> Path:
+        return Path(directory).expanduser() / f"{commit}-{key}{SNAPSHOT_SUFFIX}"
+
+    @classmethod
+    def from_json(cls, data: Any) -> Self:
+        """Builds a snapshot from its JSON representation, raising ValueError if it is malformed"""
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            msg = "Unsupported snapshot version"
+            raise ValueError(msg)
+        commit, key = data.get("commit"), data.get("key")
+        if not isinstance(commit, str) or not isinstance(key, str):
+            msg = "Invalid commit or key"
+            raise ValueError(msg)
+        external_modules = data.get("external_modules")
+        edges = data.get("edges")
+        if not isinstance(external_modules, list) or not isinstance(edges, list):
+            msg = "Invalid external modules or edges"
+            raise ValueError(msg)
+        external_modules = [_node_key(import_key) for import_key in external_modules]
+        if any(import_key[0] is None for import_key in external_modules):
+            msg = "Invalid external module"
+            raise ValueError(msg)
+        edge_types = {edge_type.value for edge_type in SNAPSHOT_EDGE_TYPES}
+        records = []
+        for edge in edges:
+            match edge:
+                case [u_key, v_key, int() as edge_type] if edge_type in edge_types:
+                    u_key, v_key = _node_key(u_key), None if v_key is None else _node_key(v_key)
+                    if u_key[0] is None or (v_key is not None and v_key[0] is None and v_key[1] >= len(external_modules)):
+                        msg = f"Invalid edge {edge!r}"
+                        raise ValueError(msg)
+                    records.append((u_key, v_key, edge_type))
+                case _:
+                    msg = f"Invalid edge {edge!r}"
+                    raise ValueError(msg)
+        return cls(
+            commit=commit,
+            key=key,
+            files=_hashes(data.get("files")),
+            configs=_hashes(data.get("configs"), optional=True),
+            external_modules=external_modules,
+            edges=records,
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "commit": self.commit,
+            "key": self.key,
+            "files": self.files,
+            "configs": self.configs,
+            "external_modules": self.external_modules,
+            "edges": self.edges,
+        }
+
+    @classmethod
+    def load(cls, directory: str | os.PathLike, commit: str, key: str) -> Self | None:
+        path = cls.get_path(directory, commit, key)
+        if not path.is_file():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snapshot = cls.from_json(json.load(f))
+        except (OSError, EOFError, ValueError) as e:
+            logger.warning(f"Ignoring invalid graph snapshot {path}: {e}")
+            return None
+        if snapshot.commit != commit or snapshot.key != key:
+            logger.warning(f"Ignoring mismatched graph snapshot {path}")
+            return None
+        # Marks the snapshot as recently used for pruning
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return snapshot
+
+    @classmethod
+    def find(cls, directory: str | os.PathLike, commits: Iterable[str], key: str) -> Self | None:
+        """Loads the snapshot of the first of `commits` (at most `MAX_ANCESTORS`) that has one"""
+        directory = Path(directory).expanduser()
+        suffix = f"-{key}{SNAPSHOT_SUFFIX}"
+        try:
+            available = {path.name.removesuffix(suffix) for path in directory.iterdir() if path.name.endswith(suffix)}
+        except OSError:
+            return None
+        for commit in itertools.islice(commits, MAX_ANCESTORS):
+            if commit in available and (snapshot := cls.load(directory, commit, key)) is not None:
+                return snapshot
+        return None
+
+    def save(self, directory: str | os.PathLike) -> Path:
+        path = self.get_path(directory, self.commit, self.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self.prune(directory, self.key)
+        return path
+
+    @staticmethod
+    def prune(directory: str | os.PathLike, key: str, keep: int = MAX_SNAPSHOTS) -> None:
+        """Deletes all but the `keep` most recently used snapshots of `key`, and anything unused for too long"""
+        directory = Path(directory).expanduser()
+        now = time.time()
+        snapshots = []
+        for path in directory.iterdir():
+            try:
+                mtime = path.stat().st_mtime
+                if path.name.endswith(f"-{key}{SNAPSHOT_SUFFIX}"):
+                    snapshots.append((mtime, path))
+                elif path.name.endswith((SNAPSHOT_SUFFIX, ".tmp", ".pickle")) and now - mtime > MAX_SNAPSHOT_AGE:
+                    path.unlink()
+            except OSError:
+                continue
+        for _, path in sorted(snapshots, reverse=True)[keep:]:
+            try:
+                path.unlink()
+            except OSError:
+                continue
+
+    @classmethod
+    def from_context(cls, ctx: CodebaseContext, commit: str, content_hashes: dict[str, str]) -> Self:
+        """Captures the current graph of `ctx`. `content_hashes` maps each file path to the hash of the content it was parsed from."""
+        from codegen.sdk.enums import NodeType
+
+        keys: dict[NodeId, NodeKey] = {}
+        files: dict[str, str] = {}
+        for file in ctx.get_nodes(NodeType.FILE):
+            if file.file_path not in content_hashes:
+                continue
+            files[file.file_path] = content_hashes[file.file_path]
+            keys[file.node_id] = (file.file_path, -1)
+            for idx, node in enumerate(file.get_nodes(sort_by_id=True)):
+                keys[node.node_id] = (file.file_path, idx)
+        external_modules = []
+        for module in sorted(ctx.get_nodes(NodeType.EXTERNAL), key=lambda node: node.node_id):
+            module: ExternalModule
+            if module._import is not None and module._import.node_id in keys:
+                keys[module.node_id] = (None, len(external_modules))
+                external_modules.append(keys[module._import.node_id])
+
+        snapshot = cls(commit=commit, key=get_snapshot_key(ctx), files=files, configs=get_config_hashes(ctx), external_modules=external_modules)
+        for u, v, edge in ctx.edges:
+            # Edges to nodes we can't address are kept with a missing target, their source is resolved again on restore
+            if u in keys and edge.type in SNAPSHOT_EDGE_TYPES:
+                snapshot.edges.append((keys[u], keys.get(v), edge.type.value))
+        return snapshot
+
+    def _get_stale_files(self, files: list[SourceFile], unchanged: set[str]) -> set[str]:
+        """Unchanged files whose imports may resolve differently than in the snapshot"""
+        changed = {file.file_path for file in files if file.file_path not in unchanged} | (self.files.keys() - unchanged)
+        if not changed:
+            return set()
+        tokens = set().union(*map(_module_tokens, changed))
+        # Adding or removing an entry point changes how every file in its package resolves its imports
+        packages = [Path(file_path).parent for file_path in changed if Path(file_path).stem.split(".")[0] in PACKAGE_ENTRY_STEMS]
+        stale = set()
+        for file in files:
+            if file.file_path not in unchanged:
+                continue
+            if any(Path(file.file_path).is_relative_to(package) for package in packages if package.parts) or any(not tokens.isdisjoint(_TOKEN.findall(imp.source)) for imp in file.imports):
+                stale.add(file.file_path)
+        return stale
+
+    def restore(self, ctx: CodebaseContext, files: list[SourceFile], content_hashes: dict[str, str]) -> list[Importable]:
+        """Re-adds the snapshot's import resolution, export and superclass edges to a graph whose files have been parsed
+        but not resolved.
+
+        A file is resolved again if it changed since the snapshot, if it has an edge into such a file, or if one of its
+        imports mentions the name of such a file, since it may now resolve to it.
+
+        Returns:
+            The nodes whose imports, exports and superclasses must still be resolved.
+        """
+        from codegen.sdk.core.external_module import ExternalModule
+
+        if self.configs != get_config_hashes(ctx):
+            logger.info(f"> Not restoring graph snapshot of {self.commit}, config files changed")
+            return [node for file in files for node in (file, *file.get_nodes())]
+        unchanged = {file.file_path for file in files if self.files.get(file.file_path) == content_hashes.get(file.file_path)}
+        stale_files = self._get_stale_files(files, unchanged)
+        nodes: dict[NodeKey, Importable] = {}
+        for file in files:
+            if file.file_path in unchanged:
+                nodes[(file.file_path, -1)] = file
+                for idx, node in enumerate(file.get_nodes(sort_by_id=True)):
+                    nodes[(file.file_path, idx)] = node
+
+        # External modules are created by the first import resolving to them. Once the file of that import is resolved
+        # again, the module may not exist anymore, so the files pointing to it are resolved again too.
+        def is_addressable(key: NodeKey | None) -> bool:
+            if key is not None and key[0] is None:
+                import_key = self.external_modules[key[1]]
+                return import_key in nodes and import_key[0] not in stale_files
+            return key in nodes
+
+        grown = True
+        while grown:
+            grown = False
+            for u_key, v_key, _ in self.edges:
+                if u_key in nodes and u_key[0] not in stale_files and not is_addressable(v_key):
+                    stale_files.add(u_key[0])
+                    grown = True
+        for idx, import_key in enumerate(self.external_modules):
+            if (imp := nodes.get(import_key)) is not None and import_key[0] not in stale_files:
+                ext = ctx.get_external_module(imp.source, imp._unique_node.source)
+                if ext is None:
+                    ext = ExternalModule.from_import(imp)
+                nodes[(None, idx)] = ext
+
+        logger.info(f"> Restoring graph snapshot of {self.commit} for {len(unchanged - stale_files)} files, {len(files) - len(unchanged)} files changed, {len(stale_files)} files resolved again")
+        ctx.add_edges([(nodes[u_key].node_id, nodes[v_key].node_id, Edge(EdgeType(edge_type), None)) for u_key, v_key, edge_type in self.edges if u_key in nodes and u_key[0] not in stale_files])
+        return [node for file in files if file.file_path not in unchanged or file.file_path in stale_files for node in (file, *file.get_nodes())]
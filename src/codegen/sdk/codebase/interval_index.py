@@ -0,0 +1,226 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# (start, end, key, value)
+Entry = tuple[int, int, Hashable, T]
+
+
+class IntervalIndex(Generic[T]):
+    """Half-open intervals [start, end) sorted by start, supporting overlap and containment queries.
+
+    Entries are kept in sorted buckets, each tracking the largest end of its intervals. A max segment tree over the
+    bucket ends finds the buckets that can contain a match in O(log b) each, so queries take O(log n + k) with b buckets
+    of the given load. Keys must be unique, orderable and break ties between intervals with the same bounds.
+    """
+
+    _load: int
+    _buckets: list[list[Entry[T]]]
+    # First (start, end, key) of each bucket
+    _mins: list[tuple[int, int, Hashable]]
+    # Largest end of each bucket
+    _max_ends: list[int]
+    # Max segment tree over _max_ends, the leaves start at _tree_size. Rebuilt on the next query once buckets are split
+    # or removed, and updated in place otherwise
+    _tree: list[int] | None
+    _tree_size: int
+    _len: int
+
+    def __init__(self, load: int = 128) -> None:
+        self._load = load
+        self._buckets = []
+        self._mins = []
+        self._max_ends = []
+        self._tree = None
+        self._tree_size = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[T]:
+        for bucket in self._buckets:
+            for entry in bucket:
+                yield entry[3]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._mins.clear()
+        self._max_ends.clear()
+        self._tree = None
+        self._len = 0
+
+    def _set_max_end(self, idx: int, max_end: int) -> None:
+        self._max_ends[idx] = max_end
+        if self._tree is not None:
+            node = self._tree_size + idx
+            self._tree[node] = max_end
+            while node > 1:
+                node //= 2
+                self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def _build_tree(self) -> list[int]:
+        size = 1
+        while size < len(self._max_ends):
+            size *= 2
+        tree = [-1] * (2 * size)
+        tree[size : size + len(self._max_ends)] = self._max_ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._tree_size = size
+        return tree
+
+    def _find_bucket(self, start: int, end: int, key: Hashable) -> int:
+        return max(bisect_right(self._mins, (start, end, key)) - 1, 0)
+
+    def add(self, start: int, end: int, key: Hashable, value: T) -> None:
+        entry = (start, end, key, value)
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([entry])
+            self._mins.append((start, end, key))
+            self._max_ends.append(end)
+            self._tree = None
+            return
+        idx = self._find_bucket(start, end, key)
+        bucket = self._buckets[idx]
+        insort(bucket, entry)
+        self._mins[idx] = bucket[0][:3]
+        if len(bucket) > 2 * self._load:
+            half = bucket[self._load :]
+            del bucket[self._load :]
+            self._buckets.insert(idx + 1, half)
+            self._mins.insert(idx + 1, half[0][:3])
+            self._max_ends[idx] = max(entry[1] for entry in bucket)
+            self._max_ends.insert(idx + 1, max(entry[1] for entry in half))
+            self._tree = None
+        elif end > self._max_ends[idx]:
+            self._set_max_end(idx, end)
+
+    def remove(self, start: int, end: int, key: Hashable) -> T | None:
+        """Removes the interval with the given bounds and key, returning its value if it was present."""
+        if not self._buckets:
+            return None
+        idx = self._find_bucket(start, end, key)
+        bucket = self._buckets[idx]
+        pos = bisect_left(bucket, (start, end, key))
+        if pos == len(bucket) or bucket[pos][:3] != (start, end, key):
+            return None
+        value = bucket.pop(pos)[3]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[idx]
+            del self._mins[idx]
+            del self._max_ends[idx]
+            self._tree = None
+        else:
+            self._mins[idx] = bucket[0][:3]
+            if end == self._max_ends[idx]:
+                self._set_max_end(idx, max(entry[1] for entry in bucket))
+        return value
+
+    def _scan(self, max_start: int, min_end: int) -> Iterator[Entry[T]]:
+        """Yields the entries of every bucket that may hold an interval with start < max_start and end > min_end."""
+        if self._tree is None:
+            self._tree = self._build_tree()
+        tree = self._tree
+        # A 1-tuple sorts before every entry with the same start
+        hi = bisect_left(self._mins, (max_start,))
+        # Walk the subtrees over buckets before `hi` whose largest end is after min_end, leftmost first
+        stack = [(1, 0, self._tree_size)]
+        while stack:
+            node, lo, node_hi = stack.pop()
+            if lo >= hi or tree[node] <= min_end:
+                continue
+            if node >= self._tree_size:
+                yield from self._buckets[node - self._tree_size]
+                continue
+            mid = (lo + node_hi) // 2
+            stack.append((2 * node + 1, mid, node_hi))
+            stack.append((2 * node, lo, mid))
+
+    def overlapping(self, start: int, end: int) -> list[T]:
+        """Returns the values of the intervals overlapping [start, end), in order of their start."""
+        return [entry[3] for entry in self._scan(end, start) if entry[0] < end and entry[1] > start]
+
+    def containing(self, start: int, end: int) -> list[T]:
+        """Returns the values of the intervals containing [start, end), in order of their start."""
+        return [entry[3] for entry in self._scan(start + 1, end - 1) if entry[0] <= start and entry[1] >= end]
+
+    def at(self, start: int, end: int | None = None) -> list[T]:
+        """Returns the values of the intervals starting at `start` (and ending at `end` if given)."""
+        ret = []
+        # The first intervals starting at `start` may be at the end of the previous bucket
+        idx = max(bisect_left(self._mins, (start,)) - 1, 0)
+        for bucket in self._buckets[idx:]:
+            if bucket[0][0] > start:
+                break
+            pos = bisect_left(bucket, (start,))
+            for entry in bucket[pos:]:
+                if entry[0] != start:
+                    break
+                if end is None or entry[1] == end:
+                    ret.append(entry[3])
+        return ret
+
+
+class IntervalTree(Generic[T]):
+    """Immutable set of half-open intervals [start, end), supporting overlap and containment queries in O(log n + k).
+
+    The intervals are sorted by start (then end) and laid out as an implicit balanced binary search tree over the sorted
+    list, where each subtree tracks the largest end of its intervals. Queries skip every subtree that can't hold a match.
+    """
+
+    _starts: list[int]
+    _ends: list[int]
+    _values: list[T]
+    # Largest end of the subtree rooted at each position
+    _max_ends: list[int]
+
+    def __init__(self, entries: Iterable[tuple[int, int, T]] = ()) -> None:
+        entries = sorted(entries, key=lambda entry: entry[:2])
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._values = [entry[2] for entry in entries]
+        self._max_ends = self._ends.copy()
+        self._build(0, len(entries))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._values)
+
+    def _build(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self._max_ends[mid] = max(self._ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        return self._max_ends[mid]
+
+    def _collect(self, lo: int, hi: int, max_start: int, min_end: int, inclusive: bool, ret: list[T]) -> None:
+        """Appends the intervals of the subtree [lo, hi) with start before max_start and end after min_end, in order"""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._max_ends[mid] < min_end or (not inclusive and self._max_ends[mid] == min_end):
+                return
+            self._collect(lo, mid, max_start, min_end, inclusive, ret)
+            if self._starts[mid] > max_start or (not inclusive and self._starts[mid] == max_start):
+                return
+            if self._ends[mid] > min_end or (inclusive and self._ends[mid] == min_end):
+                ret.append(self._values[mid])
+            lo = mid + 1
+
+    def overlapping(self, start: int, end: int) -> list[T]:
+        """Returns the values of the intervals overlapping [start, end), in order of their start."""
+        ret = []
+        self._collect(0, len(self._values), end, start, False, ret)
+        return ret
+
+    def containing(self, start: int, end: int) -> list[T]:
+        """Returns the values of the intervals containing [start, end), in order of their start."""
+        ret = []
+        self._collect(0, len(self._values), start, end, True, ret)
+        return ret
@@ -11,16 +11,28 @@ class FileIO(IO):
     """IO implementation that writes files to disk, and tracks pending changes."""
 
     files: dict[Path, bytes]
-    allowed_paths: list[Path] | None
+    _allowed_paths: list[Path] | None
+    _resolved_allowed_paths: list[Path] | None
 
     def __init__(self, allowed_paths: list[Path] | None = None):
         self.files = {}
         self.allowed_paths = allowed_paths
 
+    @property
+    def allowed_paths(self) -> list[Path] | None:
+        return self._allowed_paths
+
+    @allowed_paths.setter
+    def allowed_paths(self, allowed_paths: list[Path] | None) -> None:
+        self._allowed_paths = allowed_paths
+        self._resolved_allowed_paths = [p.resolve() for p in allowed_paths] if allowed_paths is not None else None
+
     def _verify_path(self, path: Path) -> None:
-        if self.allowed_paths is not None:
-            if not any(path.resolve().is_relative_to(p.resolve()) for p in self.allowed_paths):
-                msg = f"Path {path.resolve()} is not within allowed paths {self.allowed_paths}"
+        # Resolved on every access, the path may have been replaced by a symlink since it was last checked
+        if self._resolved_allowed_paths is not None:
+            resolved = path.resolve()
+            if not any(resolved.is_relative_to(p) for p in self._resolved_allowed_paths):
+                msg = f"Path {resolved} is not within allowed paths {self.allowed_paths}"
                 raise BadWriteError(msg)
 
     def write_bytes(self, path: Path, content: bytes) -> None:
@@ -0,0 +1,100 @@
+import re
+from collections.abc import Callable, Collection, Iterable
+from pathlib import Path
+
+# Tokens names are matched against. A name that isn't a single token, like a dashed module name, is looked up by all of
+# its tokens
+_TOKEN = re.compile(rb"[\w$]+")
+
+
+class LazyGraphState:
+    """Load state of the files of a graph built on demand (`exp_lazy_graph`), by relative file path.
+
+    Every file goes through these states, in order, and is in the sets listed for its state:
+
+    1. Unparsed (`unparsed`): listed, but not parsed into the graph yet.
+    2. Unlinked (`unlinked`, `unresolved`): parsed, its imports, exports and superclasses are not resolved yet.
+    3. Unresolved (`unresolved`): linked, its dependencies are not computed yet.
+    4. Resolved (none): the file is the same as in a fully built graph.
+
+    A sync resolves every changed file, except unparsed files which stay unparsed and are parsed from their current
+    content when accessed.
+
+    Within a session, which ends at every sync, lookups are memoized: the names every file mentioning them was loaded
+    for (`loaded_terms`), the files whose transitive importers were all loaded (`loaded_importers`) or resolved
+    (`resolved_importers`), and the names mentioned by every unparsed or unlinked file, read once when first needed.
+    """
+
+    unparsed: dict[str, Path]
+    unlinked: set[str]
+    unresolved: set[str]
+    loaded_terms: set[str]
+    loaded_importers: set[str]
+    resolved_importers: set[str]
+    # Files are only parsed while the graph is being updated, see `CodebaseContext._suspend_lazy_loading`
+    suspended: bool
+    # Unparsed or unlinked files by token they contain, built on the first lookup of a session
+    _token_index: dict[bytes, set[str]] | None
+
+    def __init__(self):
+        self.unparsed = {}
+        self.unlinked = set()
+        self.unresolved = set()
+        self.loaded_terms = set()
+        self.loaded_importers = set()
+        self.resolved_importers = set()
+        self.suspended = False
+        self._token_index = None
+
+    def clear(self) -> None:
+        self.unparsed.clear()
+        self.unlinked.clear()
+        self.unresolved.clear()
+        self.reset_session()
+
+    def reset_session(self) -> None:
+        """Forgets the lookups of the current session, once files were changed"""
+        self.loaded_terms.clear()
+        self.loaded_importers.clear()
+        self.resolved_importers.clear()
+        self._token_index = None
+
+    def has_pending(self, resolve: bool = False) -> bool:
+        """Whether any file is left to parse or link, or to resolve if `resolve` is set"""
+        return bool(self.unparsed or self.unlinked or (resolve and self.unresolved))
+
+    def mark_parsed(self, file_path: str) -> None:
+        self.unlinked.add(file_path)
+        self.unresolved.add(file_path)
+
+    def mark_resolved(self, file_paths: Collection[str]) -> None:
+        """Marks files synced with the graph as resolved"""
+        self.unlinked.difference_update(file_paths)
+        self.unresolved.difference_update(file_paths)
+
+    def files_mentioning(self, terms: Iterable[str], read_bytes: Callable[[str], bytes]) -> list[str]:
+        """Returns the unparsed or unlinked files whose content may mention one of `terms`.
+
+        The content of the files is read with `read_bytes` and indexed the first time in a session, so each lookup only
+        costs the size of its result. A file mentions a term if it contains every token of the term.
+        """
+        if self._token_index is None:
+            self._token_index = {}
+            for file_path in (*self.unparsed, *self.unlinked):
+                try:
+                    content = read_bytes(file_path)
+                except OSError:
+                    continue
+                for token in set(_TOKEN.findall(content)):
+                    self._token_index.setdefault(token, set()).add(file_path)
+        ret = set()
+        for term in terms:
+            tokens = _TOKEN.findall(term.encode())
+            if not tokens:
+                # Can't be looked up, every file may mention it
+                ret.update(self.unparsed)
+                ret.update(self.unlinked)
+                continue
+            ret.update(set.intersection(*(self._token_index.get(token, set()) for token in tokens)))
+        # Files parsed and linked since the index was built are loaded already
+        return sorted(file_path for file_path in ret if file_path in self.unparsed or file_path in self.unlinked)
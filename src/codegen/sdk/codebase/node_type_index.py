@@ -0,0 +1,90 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from codegen.sdk.enums import NodeType, SymbolType
+
+if TYPE_CHECKING:
+    from codegen.sdk.core.interfaces.importable import Importable
+    from codegen.sdk.core.node_id_factory import NodeId
+
+
+class NodeTypeIndex:
+    """Graph nodes grouped by node type, by symbol type for symbols, and by name for top-level symbols.
+
+    Nodes are returned in ascending node id order, which is the order the graph enumerates its nodes in.
+    Symbols are added to the graph before their name and parent are known, so they are indexed by name lazily on the
+    first lookup after they were added.
+    """
+
+    _by_node_type: defaultdict[NodeType, dict["NodeId", "Importable"]]
+    _by_symbol_type: defaultdict[SymbolType, dict["NodeId", "Importable"]]
+    _sorted: dict[NodeType | SymbolType | None, list["Importable"]]
+    _sorted_symbols: dict[SymbolType, list["Importable"]]
+    _by_name: defaultdict[str, dict["NodeId", "Importable"]]
+    _names: dict["NodeId", str]
+    _pending_names: dict["NodeId", "Importable"]
+
+    def __init__(self):
+        self._by_node_type = defaultdict(dict)
+        self._by_symbol_type = defaultdict(dict)
+        self._sorted = {}
+        self._sorted_symbols = {}
+        self._by_name = defaultdict(dict)
+        self._names = {}
+        self._pending_names = {}
+
+    def add(self, node_id: "NodeId", node: "Importable") -> None:
+        self._by_node_type[node.node_type][node_id] = node
+        self._sorted.pop(node.node_type, None)
+        if node.node_type == NodeType.SYMBOL:
+            self._pending_names[node_id] = node
+            if (symbol_type := getattr(node, "symbol_type", None)) is not None:
+                self._by_symbol_type[symbol_type][node_id] = node
+                self._sorted_symbols.pop(symbol_type, None)
+
+    def remove(self, node_id: "NodeId", node: "Importable") -> None:
+        self._by_node_type[node.node_type].pop(node_id, None)
+        self._sorted.pop(node.node_type, None)
+        if node.node_type == NodeType.SYMBOL:
+            self._pending_names.pop(node_id, None)
+            if (name := self._names.pop(node_id, None)) is not None:
+                self._by_name[name].pop(node_id, None)
+                if not self._by_name[name]:
+                    del self._by_name[name]
+            if (symbol_type := getattr(node, "symbol_type", None)) is not None:
+                self._by_symbol_type[symbol_type].pop(node_id, None)
+                self._sorted_symbols.pop(symbol_type, None)
+
+    def clear(self) -> None:
+        self._by_node_type.clear()
+        self._by_symbol_type.clear()
+        self._sorted.clear()
+        self._sorted_symbols.clear()
+        self._by_name.clear()
+        self._names.clear()
+        self._pending_names.clear()
+
+    def get_nodes(self, node_type: NodeType) -> list["Importable"]:
+        if (ret := self._sorted.get(node_type)) is None:
+            nodes = self._by_node_type[node_type]
+            ret = self._sorted[node_type] = [nodes[node_id] for node_id in sorted(nodes)]
+        return ret.copy()
+
+    def get_symbols(self, symbol_type: SymbolType) -> list["Importable"]:
+        if (ret := self._sorted_symbols.get(symbol_type)) is None:
+            nodes = self._by_symbol_type[symbol_type]
+            ret = self._sorted_symbols[symbol_type] = [nodes[node_id] for node_id in sorted(nodes)]
+        return ret.copy()
+
+    def get_top_level_symbols(self, name: str) -> list["Importable"]:
+        """Returns the top-level symbols with the given name."""
+        if self._pending_names:
+            for node_id, node in self._pending_names.items():
+                if node.is_top_level and node.name is not None:
+                    self._names[node_id] = node.name
+                    self._by_name[node.name][node_id] = node
+            self._pending_names.clear()
+        nodes = self._by_name.get(name)
+        if not nodes:
+            return []
+        return [nodes[node_id] for node_id in sorted(nodes)]
@@ -0,0 +1,84 @@
+import os
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+
+class PathIndex:
+    """Canonical forms of the paths of a repository, and the files and directories it contains by case-folded path.
+
+    Conversions between the relative and absolute forms of a path are memoized in least recently used caches of
+    `max_cached_paths` entries each, so a path is only resolved again once it was evicted. The entries (files and
+    directories) are kept in sync with the directory tree of the codebase, and removing one drops its cached conversions.
+    """
+
+    repo_path: Path
+    max_cached_paths: int
+    # Path as given (relative or absolute) => resolved absolute path
+    _absolute: dict[str, Path]
+    # Resolved absolute path => path relative to the repository, or itself if it is outside the repository
+    _relative: dict[Path, Path]
+    # Lower-cased absolute path => entries with that path, in insertion order
+    _folded: dict[str, dict[Path, None]]
+
+    def __init__(self, repo_path: PathLike | str, max_cached_paths: int = 10000) -> None:
+        self.repo_path = Path(repo_path)
+        self.max_cached_paths = max_cached_paths
+        self._absolute = {}
+        self._relative = {}
+        self._folded = {}
+
+    def _remember(self, cache: dict[Any, Path], key: Any, value: Path) -> None:
+        cache[key] = value
+        if len(cache) > self.max_cached_paths:
+            # Dictionaries keep insertion order, the first key is the least recently used
+            del cache[next(iter(cache))]
+
+    def to_absolute(self, path: PathLike | str) -> Path:
+        key = os.fspath(path)
+        if (ret := self._absolute.pop(key, None)) is None:
+            ret = Path(key)
+            if not ret.is_absolute():
+                ret = self.repo_path / ret
+            ret = ret.resolve()
+        self._remember(self._absolute, key, ret)
+        return ret
+
+    def to_relative(self, path: PathLike | str) -> Path:
+        absolute_path = self.to_absolute(path)
+        if (ret := self._relative.pop(absolute_path, None)) is None:
+            ret = absolute_path.relative_to(self.repo_path) if absolute_path.is_relative_to(self.repo_path) else absolute_path
+        self._remember(self._relative, absolute_path, ret)
+        return ret
+
+    def is_subdir(self, path: PathLike | str) -> bool:
+        """Whether the path is the repository or within it"""
+        return not self.to_relative(path).is_absolute()
+
+    def add(self, path: PathLike | str) -> None:
+        """Adds a file or directory of the repository"""
+        absolute_path = self.to_absolute(path)
+        self._folded.setdefault(str(absolute_path).lower(), {})[absolute_path] = None
+
+    def remove(self, path: PathLike | str) -> None:
+        """Removes a file or directory of the repository, along with the cached conversions of its path"""
+        absolute_path = self.to_absolute(path)
+        folded = str(absolute_path).lower()
+        if (entries := self._folded.get(folded)) is not None:
+            entries.pop(absolute_path, None)
+            if not entries:
+                del self._folded[folded]
+        if (relative_path := self._relative.pop(absolute_path, None)) is not None:
+            self._absolute.pop(os.fspath(relative_path), None)
+        self._absolute.pop(os.fspath(path), None)
+        self._absolute.pop(os.fspath(absolute_path), None)
+
+    def clear(self) -> None:
+        """Removes every entry, the cached conversions are kept since the directory tree is rebuilt from the same paths"""
+        self._folded.clear()
+
+    def get_ignore_case(self, path: PathLike | str) -> Path | None:
+        """Returns the first entry added whose path matches `path` ignoring case"""
+        if entries := self._folded.get(str(self.to_absolute(path)).lower()):
+            return next(iter(entries))
+        return None
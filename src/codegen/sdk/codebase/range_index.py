@@ -4,6 +4,7 @@ from functools import cached_property
 
 from tree_sitter import Range
 
+from codegen.sdk.codebase.interval_index import IntervalTree
 from codegen.sdk.core.interfaces.editable import Editable
 from codegen.sdk.extensions.sort import sort_editables
 
@@ -18,6 +19,7 @@ class RangeIndex:
 
     def add_to_range(self, editable: Editable) -> None:
         self._ranges[editable.range].append(editable)
+        self.__dict__.pop("intervals", None)
 
     def mark_as_canonical(self, editable: Editable) -> None:
         self._canonical_range[editable.range][editable.ts_node.kind_id] = editable
@@ -34,11 +36,24 @@ class RangeIndex:
         self._canonical_range.clear()
         self.__dict__.pop("children", None)
         self.__dict__.pop("nodes", None)
+        self.__dict__.pop("intervals", None)
 
     @cached_property
     def nodes(self) -> list[Editable]:
         return list(itertools.chain.from_iterable(self._ranges.values()))
 
+    @cached_property
+    def intervals(self) -> IntervalTree[Editable]:
+        return IntervalTree((editable.start_byte, editable.end_byte, editable) for editables in self._ranges.values() for editable in editables)
+
+    def get_overlapping(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Returns the nodes overlapping the byte range [start_byte, end_byte), sorted by start byte."""
+        return self.intervals.overlapping(start_byte, end_byte)
+
+    def get_containing(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Returns the nodes containing the byte range [start_byte, end_byte), sorted by start byte."""
+        return self.intervals.containing(start_byte, end_byte)
+
     @cached_property
     def children(self) -> dict[Editable, list[Editable]]:
         ret = defaultdict(list)
@@ -0,0 +1,99 @@
+from collections.abc import Collection
+from typing import TYPE_CHECKING
+
+from rustworkx import PyDiGraph
+
+from codegen.sdk.enums import EdgeType
+
+if TYPE_CHECKING:
+    from codegen.sdk.core.dataclasses.usage import UsageType
+    from codegen.sdk.core.interfaces.importable import Importable
+    from codegen.sdk.core.node_id_factory import NodeId
+    from codegen.sdk.enums import Edge
+
+# Direction of the traversal, types of the edges followed and types of the usages followed on SYMBOL_USAGE edges
+_Filter = tuple[bool, frozenset[EdgeType], "UsageType | None"]
+
+
+class ReachabilityIndex:
+    """Transitive closures of graph nodes through edges of given types, like the transitive dependencies of a symbol or the
+    symbols transitively using it.
+
+    Closures are memoized until the graph generation, bumped by every node and edge change, changes. A query visits each
+    edge at most once, and an unbounded traversal reaching a node that was queried before reuses its closure instead of
+    walking it again. The closures of the nodes visited along the way are not memoized, since storing the closure of
+    every node takes memory quadratic in the size of the graph, so only repeated or overlapping queries are sped up.
+    """
+
+    _generation: int | None
+    _closures: dict[tuple["NodeId", _Filter, int | None], tuple["NodeId", ...]]
+
+    def __init__(self):
+        self._generation = None
+        self._closures = {}
+
+    def clear(self) -> None:
+        self._closures.clear()
+
+    def get_reachable(
+        self,
+        graph: PyDiGraph["Importable", "Edge"],
+        generation: int,
+        node_id: "NodeId",
+        *,
+        edge_types: Collection[EdgeType],
+        usage_types: "UsageType | None" = None,
+        max_depth: int | None = None,
+        reverse: bool = False,
+    ) -> list["NodeId"]:
+        """Returns the nodes reachable from a node, excluding the node itself.
+
+        The nodes are returned in no particular order: nodes are visited breadth-first, but a memoized closure is added as
+        a whole when the traversal reaches its node.
+
+        Args:
+            graph: The graph to traverse.
+            generation: The generation of the graph. Closures memoized for another generation are dropped.
+            node_id: The node to start from.
+            edge_types: The types of the edges to follow.
+            usage_types: The usage types to follow on SYMBOL_USAGE edges. Defaults to any.
+            max_depth: The maximum number of edges between the node and the nodes returned. Defaults to no limit.
+            reverse: Whether to follow edges from their target to their source, i.e. to find what reaches the node.
+        """
+        if generation != self._generation:
+            self._closures.clear()
+            self._generation = generation
+        key = (node_id, (reverse, frozenset(edge_types), usage_types), max_depth)
+        if (ret := self._closures.get(key)) is None:
+            ret = self._closures[key] = self._traverse(graph, *key)
+        return list(ret)
+
+    def _traverse(self, graph: PyDiGraph["Importable", "Edge"], node_id: "NodeId", edge_filter: _Filter, max_depth: int | None) -> tuple["NodeId", ...]:
+        reverse, edge_types, usage_types = edge_filter
+        get_edges = graph.in_edges if reverse else graph.out_edges
+        seen = {node_id}
+        ret = []
+        level = [node_id]
+        depth = 0
+        while level and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_level = []
+            for current in level:
+                if max_depth is None and current != node_id and (closure := self._closures.get((current, edge_filter, None))) is not None:
+                    # Everything reachable from this node is known already
+                    for other in closure:
+                        if other not in seen:
+                            seen.add(other)
+                            ret.append(other)
+                    continue
+                for u, v, edge in get_edges(current):
+                    other = u if reverse else v
+                    if other in seen or edge.type not in edge_types:
+                        continue
+                    if usage_types is not None and edge.type == EdgeType.SYMBOL_USAGE and edge.usage.usage_type is not None and edge.usage.usage_type not in usage_types:
+                        continue
+                    seen.add(other)
+                    ret.append(other)
+                    next_level.append(other)
+            level = next_level
+        return tuple(ret)
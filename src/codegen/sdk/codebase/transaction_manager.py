@@ -1,9 +1,11 @@
+import itertools
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.diff_lite import ChangeType, ContentEdit, DiffLite
+from codegen.sdk.codebase.interval_index import IntervalIndex
 from codegen.sdk.codebase.transactions import (
     EditTransaction,
     FileAddTransaction,
@@ -12,6 +14,7 @@ from codegen.sdk.codebase.transactions import (
     RemoveTransaction,
     Transaction,
     TransactionPriority,
+    apply_edits,
 )
 from codegen.shared.exceptions.control_flow import MaxPreviewTimeExceeded, MaxTransactionsExceeded
 from codegen.shared.logging.get_logger import get_logger
@@ -27,15 +30,67 @@ class TransactionError(Exception):
     pass
 
 
+class TransactionQueue:
+    """Transactions queued for a file, in queue order.
+
+    Each transaction is stored by id along with its position in the queue, a tuple compared lexicographically, so
+    queueing, removing or finding a transaction doesn't depend on the size of the queue. The queue is only sorted when it
+    is iterated or indexed after a change.
+    """
+
+    # Position in the queue and transaction, by transaction id
+    _entries: dict[int, tuple[tuple[int, ...], Transaction]]
+    _sorted: list[Transaction] | None
+
+    def __init__(self) -> None:
+        self._entries = {}
+        self._sorted = []
+
+    def add(self, transaction: Transaction, order: tuple[int, ...]) -> None:
+        self._entries[transaction.transaction_id] = (order, transaction)
+        self._sorted = None
+
+    def remove(self, transaction: Transaction) -> None:
+        del self._entries[transaction.transaction_id]
+        self._sorted = None
+
+    def get_order(self, transaction: Transaction) -> tuple[int, ...] | None:
+        """Returns the position of the transaction in the queue, or None if it isn't queued"""
+        entry = self._entries.get(transaction.transaction_id)
+        return entry[0] if entry is not None and entry[1] is transaction else None
+
+    def sort(self, key: Callable[[Transaction], Any], counter: Iterator[int]) -> None:
+        """Sorts the queue by `key`, taking the new positions of the transactions from `counter`"""
+        transactions = sorted(self, key=key)
+        self._entries = {t.transaction_id: ((next(counter),), t) for t in transactions}
+        self._sorted = transactions
+
+    def _get_sorted(self) -> list[Transaction]:
+        if self._sorted is None:
+            self._sorted = [t for _, t in sorted(self._entries.values(), key=lambda entry: entry[0])]
+        return self._sorted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._get_sorted())
+
+    def __getitem__(self, idx: int) -> Transaction:
+        return self._get_sorted()[idx]
+
+
 class TransactionManager:
     """Responsible for handling `Transaction` objects - basically an atomic modification of a codebase.
 
     This is used by the Codebase class to queue up transactions and then commit them in bulk.
     """
 
-    # Unsorted list of transactions, grouped by file
-    # TODO: consider using SortedList for better performance
-    queued_transactions: dict[Path, list[Transaction]]
+    # Unsorted queue of transactions, grouped by file
+    queued_transactions: dict[Path, TransactionQueue]
+    # The same transactions indexed by byte range, for conflict detection and range lookups
+    _transaction_ranges: dict[Path, IntervalIndex[Transaction]]
+    _queue_counter: itertools.count
     pending_undos: set[Callable[[], None]]
     _commiting: bool = False
     max_transactions: int | None = None  # None = no limit
@@ -44,17 +99,20 @@ class TransactionManager:
 
     def __init__(self) -> None:
         self.queued_transactions = dict()
+        self._transaction_ranges = dict()
+        self._queue_counter = itertools.count()
         self.pending_undos = set()
 
     def sort_transactions(self) -> None:
-        for file_path, file_transactions in self.queued_transactions.items():
-            file_transactions.sort(key=Transaction._to_sort_key)
+        for file_transactions in self.queued_transactions.values():
+            file_transactions.sort(key=Transaction._to_sort_key, counter=self._queue_counter)
 
     def clear_transactions(self) -> None:
         """Should be called between tests to remove any potential extraneous transactions. Makes sure we reset max_transactions as well."""
         if len(self.queued_transactions) > 0:
             logger.warning("Not all transactions have been committed")
             self.queued_transactions.clear()
+        self._transaction_ranges.clear()
         for undo in self.pending_undos:
             undo()
         self.pending_undos.clear()
@@ -120,20 +178,32 @@ class TransactionManager:
         # Get the list of transactions for the file
         file_path = transaction.file_path
         if file_path not in self.queued_transactions:
-            self.queued_transactions[file_path] = []
+            self.queued_transactions[file_path] = TransactionQueue()
+            self._transaction_ranges[file_path] = IntervalIndex()
         file_queue = self.queued_transactions[file_path]
 
         # Dedupe transactions
-        if dedupe and transaction in file_queue:
+        if dedupe and any(t == transaction for t in self._transaction_ranges[file_path].at(transaction.start_byte, transaction.end_byte)):
             logger.debug(f"Transaction already exists in queue: {transaction}")
             return False
         # Solve conflicts
         if new_transaction := self._resolve_conflicts(transaction, file_queue, solve_conflicts=solve_conflicts):
-            file_queue.append(new_transaction)
+            self._queue_transaction(new_transaction, file_queue)
 
         self.check_limits()
         return True
 
+    def _queue_transaction(self, transaction: Transaction, file_queue: TransactionQueue, order: tuple[int, ...] | None = None) -> None:
+        """Queues a transaction at the end of the queue, or at the given position in the queue."""
+        if order is None:
+            order = (next(self._queue_counter),)
+        file_queue.add(transaction, order)
+        self._transaction_ranges[transaction.file_path].add(transaction.start_byte, transaction.end_byte, transaction.transaction_id, transaction)
+
+    def _dequeue_transaction(self, transaction: Transaction, file_queue: TransactionQueue) -> None:
+        file_queue.remove(transaction)
+        self._transaction_ranges[transaction.file_path].remove(transaction.start_byte, transaction.end_byte, transaction.transaction_id)
+
     def check_limits(self):
         self.check_max_transactions()
         self.check_max_preview_time()
@@ -188,37 +258,74 @@ class TransactionManager:
                 for file in files:
                     logger.info(f"Committing {len(self.queued_transactions[file])} transactions for {file}")
             for file_path in files:
-                file_transactions = self.queued_transactions.pop(file_path, [])
-                modified = False
+                file_transactions = self.queued_transactions.pop(file_path, ())
+                self._transaction_ranges.pop(file_path, None)
+                modified_idx = None
+                # Every edit to the file in order, recorded so the file can be reparsed incrementally
+                edits = []
+                # Edits to write, spliced into the content of the file in a single pass
+                pending: list[ContentEdit] = []
+                edited_file = content = None
                 for transaction in file_transactions:
-                    # Add diff IF the file is a source file
+                    if (edit := transaction.get_edit()) is not None:
+                        if content is None:
+                            diff = transaction.get_diff()
+                            edited_file, content = transaction.file, diff.old_content
+                            if modified_idx is None:
+                                modified_idx = len(diffs)
+                                diffs.append(diff)
+                        pending.append(edit)
+                        if edits is not None:
+                            edits.append(edit)
+                        if transaction.exec_func:
+                            # Callbacks expect their edit to be written, and may update the state the next edits are
+                            # computed from, like when each edit is executed on its own
+                            content = self._write_pending(edited_file, content, pending)
+                            transaction.exec_func()
+                        continue
+                    # Other transactions (file operations) operate on the content produced by the previous ones
+                    self._write_pending(edited_file, content, pending)
+                    content = None
                     diff = transaction.get_diff()
                     if diff.change_type == ChangeType.Modified:
-                        if not modified:
-                            modified = True
+                        edits = None
+                        if modified_idx is None:
+                            modified_idx = len(diffs)
                             diffs.append(diff)
                     else:
                         diffs.append(diff)
                     transaction.execute()
+                self._write_pending(edited_file, content, pending)
+                if modified_idx is not None and edits is not None:
+                    diffs[modified_idx] = diffs[modified_idx]._replace(edits=tuple(edits))
             return diffs
         finally:
             self._commiting = False
 
+    @staticmethod
+    def _write_pending(file: "File | None", content: bytes | None, pending: list[ContentEdit]) -> bytes | None:
+        """Writes the pending edits to the file, returning the new content"""
+        if pending:
+            content = apply_edits(content, pending)
+            file.write(content)
+            pending.clear()
+        return content
+
     ####################################################################################################################
     # Conflict Resolution
     ####################################################################################################################
 
-    def _resolve_conflicts(self, transaction: Transaction, file_queue: list[Transaction], solve_conflicts: bool = True) -> Transaction | None:
+    def _resolve_conflicts(self, transaction: Transaction, file_queue: TransactionQueue, solve_conflicts: bool = True) -> Transaction | None:
         def break_down(to_break: EditTransaction) -> bool:
             if new_transactions := to_break.break_down():
-                try:
-                    insert_idx = file_queue.index(to_break)
-                    file_queue.pop(insert_idx)
-                except ValueError:
-                    insert_idx = len(file_queue)
-                for new_transaction in new_transactions:
+                if (order := file_queue.get_order(to_break)) is not None:
+                    self._dequeue_transaction(to_break, file_queue)
+                else:
+                    order = (next(self._queue_counter),)
+                # Each piece is queued before the previous ones, in place of the transaction broken down
+                for piece_idx, new_transaction in enumerate(new_transactions):
                     if broken_down := self._resolve_conflicts(new_transaction, file_queue, solve_conflicts=solve_conflicts):
-                        file_queue.insert(insert_idx, broken_down)
+                        self._queue_transaction(broken_down, file_queue, (*order, -piece_idx))
                 return True
             return False
 
@@ -241,7 +348,7 @@ class TransactionManager:
                     # If current transaction is deleted, remove all conflicting transactions
                     if isinstance(transaction, RemoveTransaction):
                         for t in conflicts:
-                            file_queue.remove(t)
+                            self._dequeue_transaction(t, file_queue)
                     # If current transaction is edit, raise an error
                     elif isinstance(transaction, EditTransaction):
                         if break_down(transaction):
@@ -278,29 +385,25 @@ class TransactionManager:
         if file_path not in self.queued_transactions:
             return matching_transactions
 
-        for t in self.queued_transactions[file_path]:
-            if t.start_byte == start_byte:
-                if t.end_byte == end_byte:
-                    if transaction_order is None or t.transaction_order == transaction_order:
-                        matching_transactions.append(t)
-                elif combined and t.start_byte != t.end_byte:
-                    if other := self.get_transactions_at_range(t.file_path, t.end_byte, end_byte, transaction_order, combined=combined):
-                        return [t, *other]
+        for t in self._transaction_ranges[file_path].at(start_byte):
+            if t.end_byte == end_byte:
+                if transaction_order is None or t.transaction_order == transaction_order:
+                    matching_transactions.append(t)
+            elif combined and t.start_byte != t.end_byte:
+                if other := self.get_transactions_at_range(t.file_path, t.end_byte, end_byte, transaction_order, combined=combined):
+                    return [t, *other]
 
         return matching_transactions
 
     def _get_conflicts(self, transaction: Transaction) -> list[Transaction]:
         """Returns all transactions that overlap with the given transaction"""
-        overlapping_transactions = []
-        queued_transactions = list(self.queued_transactions[transaction.file_path])
-        for t in queued_transactions:
-            if transaction.start_byte < t.end_byte and transaction.end_byte > t.start_byte:
-                overlapping_transactions.append(t)
-        return overlapping_transactions
+        return list(self._transaction_ranges[transaction.file_path].overlapping(transaction.start_byte, transaction.end_byte))
 
     def _get_overlapping_conflicts(self, transaction: Transaction) -> Transaction | None:
         """Returns the transaction that completely overlaps with the given transaction"""
-        for t in self.queued_transactions[transaction.file_path]:
-            if transaction.start_byte >= t.start_byte and transaction.end_byte <= t.end_byte:
-                return t
-        return None
+        candidates = self._transaction_ranges[transaction.file_path].containing(transaction.start_byte, transaction.end_byte)
+        if len(candidates) > 1:
+            # Prefer the transaction that was queued first
+            file_queue = self.queued_transactions[transaction.file_path]
+            return min(candidates, key=file_queue.get_order)
+        return candidates[0] if candidates else None
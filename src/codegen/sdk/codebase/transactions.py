@@ -1,16 +1,37 @@
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from difflib import unified_diff
 from enum import IntEnum
 from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
-from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.diff_lite import ChangeType, ContentEdit, DiffLite
 
 if TYPE_CHECKING:
     from codegen.sdk.core.file import File
 
 
+def apply_edits(content: bytes, edits: Sequence[ContentEdit]) -> bytes:
+    """Applies edits sorted like their transactions (by descending start byte) to content.
+
+    The result is the same as applying each edit to the output of the previous one. Edits that don't overlap are spliced
+    in a single pass.
+    """
+    pieces = []
+    end = len(content)
+    for edit in edits:
+        if edit.old_end_byte > end:
+            # Overlapping edits shift each other, apply them one after the other
+            for edit in edits:
+                content = content[: edit.start_byte] + edit.new_bytes + content[edit.old_end_byte :]
+            return content
+        pieces.append(content[edit.old_end_byte : end])
+        pieces.append(edit.new_bytes)
+        end = edit.start_byte
+    pieces.append(content[:end])
+    return b"".join(reversed(pieces))
+
+
 class TransactionPriority(IntEnum):
     Remove = 0  # Remove always has highest priority
     Edit = 1  # Edit always comes next (remove and edit are incompatible with each other, so it should error out)
@@ -35,6 +56,7 @@ class Transaction:
     priority: int | tuple
     transaction_order: TransactionPriority
     transaction_counter: int = 0
+    exec_func: Callable[[], None] | None = None
 
     def __init__(
         self,
@@ -91,6 +113,10 @@ class Transaction:
         msg = "Transaction.diff_str() must be implemented by subclasses"
         raise NotImplementedError(msg)
 
+    def get_edit(self) -> ContentEdit | None:
+        """Gets the edit this transaction applies to the file content, if it only modifies a byte range"""
+        return None
+
     def _to_sort_key(transaction: "Transaction"):
         # Sort by:
         # 1. Descending start_byte
@@ -109,8 +135,6 @@ class Transaction:
 class RemoveTransaction(Transaction):
     transaction_order = TransactionPriority.Remove
 
-    exec_func: Callable[[], None] | None = None
-
     def __init__(self, start_byte: int, end_byte: int, file: "File", priority: int = 0, exec_func: Callable[[], None] | None = None) -> None:
         super().__init__(start_byte, end_byte, file.path, priority=priority)
         self.file = file
@@ -136,12 +160,13 @@ class RemoveTransaction(Transaction):
         diff = "".join(unified_diff(self.file.content.splitlines(True), self._generate_new_content_bytes().decode("utf-8").splitlines(True)))
         return f"Remove {self.length} bytes at bytes ({self.start_byte}, {self.end_byte})\n{diff}"
 
+    def get_edit(self) -> ContentEdit:
+        return ContentEdit(self.start_byte, self.end_byte, b"")
+
 
 class InsertTransaction(Transaction):
     transaction_order = TransactionPriority.Insert
 
-    exec_func: Callable[[], None] | None = None
-
     def __init__(
         self,
         insert_byte: int,
@@ -179,6 +204,9 @@ class InsertTransaction(Transaction):
         diff = "".join(unified_diff(self.file.content.splitlines(True), self._generate_new_content_bytes().decode("utf-8").splitlines(True)))
         return f"Insert {len(self.new_content)} bytes at bytes ({self.start_byte}, {self.end_byte})\n{diff}"
 
+    def get_edit(self) -> ContentEdit:
+        return ContentEdit(self.insert_byte, self.insert_byte, bytes(self.new_content, encoding="utf-8"))
+
 
 class EditTransaction(Transaction):
     transaction_order = TransactionPriority.Edit
@@ -214,6 +242,9 @@ class EditTransaction(Transaction):
         diff = "".join(unified_diff(self.file.content.splitlines(True), self._generate_new_content_bytes().decode("utf-8").splitlines(True)))
         return f"Edit {self.length} bytes at bytes ({self.start_byte}, {self.end_byte}), src: ({self.new_content[:50]})\n{diff}"
 
+    def get_edit(self) -> ContentEdit:
+        return ContentEdit(self.start_byte, self.end_byte, bytes(self.new_content, "utf-8"))
+
     def break_down(self) -> list[InsertTransaction] | None:
         old = self.file.content_bytes[self.start_byte : self.end_byte]
         new = bytes(self.new_content, "utf-8")
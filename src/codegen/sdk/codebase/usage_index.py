@@ -0,0 +1,68 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from codegen.sdk.core.dataclasses.usage import Usage
+    from codegen.sdk.core.node_id_factory import NodeId
+
+
+def _sort_key(usage: "Usage") -> int:
+    # Negated so the usages are sorted by descending start byte
+    return -(usage.match.ts_node.start_byte if usage.match else usage.usage_symbol.ts_node.start_byte)
+
+
+class UsageIndex:
+    """Usages of graph nodes sorted by source location in reverse, built from the SYMBOL_USAGE in-edges of a node the
+    first time its usages are requested.
+
+    Among usages at the same location, the most recently added comes first, like the in-edges of the graph. Adding or
+    removing a SYMBOL_USAGE edge updates the usages of its target in place if they were built already.
+    """
+
+    _usages: dict["NodeId", list["Usage"]]
+    # Sort keys of the usages, in ascending order
+    _keys: dict["NodeId", list[int]]
+
+    def __init__(self):
+        self._usages = {}
+        self._keys = {}
+
+    def get(self, node_id: "NodeId") -> list["Usage"] | None:
+        return self._usages.get(node_id)
+
+    def build(self, node_id: "NodeId", usages: Iterable["Usage"]) -> list["Usage"]:
+        """Indexes the usages of a node, given from the most recently added"""
+        ret = self._usages[node_id] = sorted(usages, key=_sort_key)
+        self._keys[node_id] = [_sort_key(usage) for usage in ret]
+        return ret
+
+    def add(self, node_id: "NodeId", usage: "Usage") -> None:
+        if (usages := self._usages.get(node_id)) is not None:
+            keys = self._keys[node_id]
+            key = _sort_key(usage)
+            idx = bisect_left(keys, key)
+            keys.insert(idx, key)
+            usages.insert(idx, usage)
+
+    def remove(self, node_id: "NodeId", usage: "Usage") -> None:
+        if (usages := self._usages.get(node_id)) is not None:
+            keys = self._keys[node_id]
+            key = _sort_key(usage)
+            candidates = range(bisect_left(keys, key), bisect_right(keys, key))
+            # The location of the usage may have changed since it was added, fall back to a full scan
+            idx = next((idx for idx in candidates if usages[idx] is usage), None)
+            if idx is None:
+                idx = next((idx for idx, other in enumerate(usages) if other is usage), None)
+            if idx is not None:
+                del keys[idx]
+                del usages[idx]
+
+    def discard(self, node_id: "NodeId") -> None:
+        """Drops the usages of a node removed from the graph"""
+        self._usages.pop(node_id, None)
+        self._keys.pop(node_id, None)
+
+    def clear(self) -> None:
+        self._usages.clear()
+        self._keys.clear()
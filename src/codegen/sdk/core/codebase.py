@@ -5,7 +5,7 @@ import json
 import os
 import re
 import tempfile
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from contextlib import contextmanager
 from functools import cached_property
 from pathlib import Path
@@ -36,6 +36,7 @@ from codegen.sdk.codebase.codebase_context import (
     CodebaseContext,
 )
 from codegen.sdk.codebase.config import ProjectConfig, SessionOptions
+from codegen.sdk.codebase.dead_code import DeadCodeReport, find_dead_code
 from codegen.sdk.codebase.diff_lite import DiffLite
 from codegen.sdk.codebase.flagging.code_flag import CodeFlag
 from codegen.sdk.codebase.flagging.enums import FlagKwargs
@@ -57,6 +58,7 @@ from codegen.sdk.core.import_resolution import Import
 from codegen.sdk.core.interface import Interface
 from codegen.sdk.core.interfaces.editable import Editable
 from codegen.sdk.core.interfaces.has_name import HasName
+from codegen.sdk.core.interfaces.importable import Importable
 from codegen.sdk.core.symbol import Symbol
 from codegen.sdk.core.type_alias import TypeAlias
 from codegen.sdk.enums import NodeType, SymbolType
@@ -272,8 +274,8 @@ class Codebase(
 
     @noapidoc
     def _symbols(self, symbol_type: SymbolType | None = None) -> list[TSymbol | TClass | TFunction | TGlobalVar]:
-        matches: list[Symbol] = self.ctx.get_nodes(NodeType.SYMBOL)
-        return [x for x in matches if x.is_top_level and (symbol_type is None or x.symbol_type == symbol_type)]
+        matches: list[Symbol] = self.ctx.get_nodes(NodeType.SYMBOL, symbol_type=symbol_type)
+        return [x for x in matches if x.is_top_level]
 
     # =====[ Node Types ]=====
     @overload
@@ -574,6 +576,8 @@ class Codebase(
 
         # If the file is not in the graph, check the filesystem
         absolute_path = self.ctx.to_absolute(filepath)
+        if ignore_case and (path := self.ctx.path_index.get_ignore_case(absolute_path)) is not None and path not in self.ctx.directories:
+            absolute_path = path
         if self.ctx.io.file_exists(absolute_path):
             if self.ctx.config.use_pink != PinkMode.OFF:
                 if file := self._pink_codebase.get_file(absolute_path):
@@ -639,7 +643,7 @@ class Codebase(
         Returns:
             bool: True if a symbol with the given name exists in the codebase, False otherwise.
         """
-        return any([x.name == symbol_name for x in self.symbols])
+        return len(self.ctx.get_top_level_symbols(symbol_name)) > 0
 
     def get_symbol(self, symbol_name: str, optional: bool = False) -> TSymbol | None:
         """Returns a Symbol by name from the codebase.
@@ -682,7 +686,7 @@ class Codebase(
         Note:
             When a unique symbol is required, use get_symbol() instead. It will raise ValueError if multiple symbols are found.
         """
-        return sort_editables(x for x in self.symbols if x.name == symbol_name)
+        return sort_editables(self.ctx.get_top_level_symbols(symbol_name))
 
     def get_class(self, class_name: str, optional: bool = False) -> TClass | None:
         """Returns a class that matches the given name.
@@ -697,7 +701,7 @@ class Codebase(
         Raises:
             ValueError: If the class is not found and optional=False, or if multiple classes with the same name exist.
         """
-        matches = [c for c in self.classes if c.name == class_name]
+        matches = [c for c in self.ctx.get_top_level_symbols(class_name) if c.symbol_type == SymbolType.Class]
         if len(matches) == 0:
             if not optional:
                 msg = f"Class {class_name} not found in codebase. Use optional=True to return None instead."
@@ -726,7 +730,7 @@ class Codebase(
         Raises:
             ValueError: If function is not found and optional=False, or if multiple matching functions exist.
         """
-        matches = [f for f in self.functions if f.name == function_name]
+        matches = [f for f in self.ctx.get_top_level_symbols(function_name) if f.symbol_type == SymbolType.Function]
         if len(matches) == 0:
             if not optional:
                 msg = f"Function {function_name} not found in codebase. Use optional=True to return None instead."
@@ -1290,23 +1294,50 @@ class Codebase(
         # Set the AI key
         self.ctx.secrets.openai_api_key = key
 
-    def find_by_span(self, span: Span) -> list[Editable]:
-        """Finds editable objects that overlap with the given source code span.
+    def find_by_span(self, span: Span, *, overlapping: bool = False) -> list[Editable]:
+        """Finds editable objects spanning the given source code span.
 
         Searches for editable objects (like functions, classes, variables) within a file
-        that overlap with the specified byte range span. Returns an empty list if no
-        matching file is found.
+        with exactly the byte range of the span, or overlapping it if `overlapping` is set.
+        Returns an empty list if no matching file is found.
 
         Args:
             span (Span): The span object containing the filepath and byte range to search within.
+            overlapping (bool): Whether to return every Editable object overlapping the span. Defaults to False.
 
         Returns:
-            list[Editable]: A list of Editable objects that overlap with the given span.
+            list[Editable]: A list of Editable objects with the given span, or overlapping it.
         """
         if file := self.get_file(span.filepath):
-            return file.find_by_byte_range(span.range)
+            return file.find_by_byte_range(span.range, overlapping=overlapping)
         return []
 
+    def find_dead_code(
+        self,
+        roots: Iterable[Importable] = (),
+        *,
+        entry_points: bool = True,
+        exported: bool = True,
+        tests: bool = True,
+        dunder_all: bool = True,
+    ) -> DeadCodeReport:
+        """Finds the symbols, imports and files unreachable from the entry points of the codebase.
+
+        Symbols, imports and files are alive if they are reachable through symbol usages, import resolutions and exports
+        from a root. By default, scripts, package entry points, tests and the names listed in `__all__` are roots.
+
+        Args:
+            roots (Iterable[Importable]): Additional symbols, imports or files to keep alive.
+            entry_points (bool): Whether files run as scripts (`__main__.py`, `if __name__ == "__main__"`) are roots.
+            exported (bool): Whether the content of package entry points (`__init__.py`, `index.ts`) is a root.
+            tests (bool): Whether test files are roots.
+            dunder_all (bool): Whether the names listed in the `__all__` of Python files are roots.
+
+        Returns:
+            DeadCodeReport: The unreachable top-level symbols, imports and files, sorted by file location.
+        """
+        return find_dead_code(self, roots, entry_points=entry_points, exported=exported, tests=tests, dunder_all=dunder_all)
+
     def set_session_options(self, **kwargs: Unpack[SessionOptions]) -> None:
         """Sets the session options for the current codebase.
 
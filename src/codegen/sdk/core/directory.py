@@ -16,7 +16,6 @@ from codegen.sdk.core.interfaces.has_symbols import (
     TSymbol,
 )
 from codegen.sdk.core.utils.cache_utils import cached_generator
-from codegen.sdk.enums import NodeType
 from codegen.sdk.extensions.sort import sort_editables
 from codegen.shared.decorators.docs import apidoc, noapidoc
 from codegen.shared.logging.get_logger import get_logger
@@ -135,7 +134,7 @@ class Directory(
             list[TSourceFile]: A sorted list of source files in the codebase.
         """
         # If there are no source files, return ALL files
-        if len(self.ctx.get_nodes(NodeType.FILE)) == 0:
+        if not self.ctx.has_source_files:
             extensions = "*"
         # If extensions is not set, use the extensions from the codebase
         elif extensions is None:
@@ -229,7 +228,10 @@ class Directory(
         file = self.ctx.get_file(file_path, ignore_case=ignore_case)
         if file is not None:
             return file
-        # If the file is not in the graph, check the filesystem
+        # If the file is not in the graph, check the directory tree
+        if ignore_case and (path := self.ctx.path_index.get_ignore_case(absolute_path)) is not None and path not in self.ctx.directories:
+            return self.ctx._get_raw_file_from_path(path)
+        # Then the filesystem, for files outside the directory tree
         for file in absolute_path.parent.iterdir():
             if ignore_case and str(absolute_path).lower() == str(file).lower():
                 return self.ctx._get_raw_file_from_path(file)
@@ -263,7 +265,17 @@ class Directory(
     def _add_file(self, file_name: str) -> None:
         """Add a file to the directory."""
         self._files.append(file_name)
+        self.ctx.path_index.add(self.path / file_name)
 
     def _add_subdirectory(self, subdirectory_name: str) -> None:
         """Add a subdirectory to the directory."""
         self._subdirectories.append(subdirectory_name)
+
+    def _remove_file(self, file_name: str) -> None:
+        """Remove a file from the directory."""
+        self._files.remove(file_name)
+        self.ctx.path_index.remove(self.path / file_name)
+
+    def _remove_subdirectory(self, subdirectory_name: str) -> None:
+        """Remove a subdirectory from the directory."""
+        self._subdirectories.remove(subdirectory_name)
@@ -3,6 +3,7 @@ import re
 import resource
 import sys
 from abc import abstractmethod
+from bisect import bisect_right
 from collections.abc import Generator, Sequence
 from functools import cached_property
 from os import PathLike
@@ -14,6 +15,7 @@ from typing_extensions import deprecated
 
 from codegen.sdk._proxy import proxy_property
 from codegen.sdk.codebase.codebase_context import CodebaseContext
+from codegen.sdk.codebase.diff_lite import ContentEdit
 from codegen.sdk.codebase.range_index import RangeIndex
 from codegen.sdk.codebase.span import Range
 from codegen.sdk.core.autocommit import commiter, mover, reader, remover, writer
@@ -114,6 +116,7 @@ class File(Editable[None]):
             path.parent.mkdir(parents=True, exist_ok=True)
             ctx.io.write_file(path, content)
             ctx.io.save_files({path})
+            ctx.update_directory_tree([path])
 
         new_file = cls(filepath, ctx, ts_node=None, binary=binary)
         return new_file
@@ -433,7 +436,7 @@ class SourceFile(
         self._nodes = []
         super().__init__(filepath, ctx, ts_node=ts_node)
         self._nodes.clear()
-        self.ctx.filepath_idx[self.file_path] = self.node_id
+        self.ctx.add_file_path(self.file_path, self.node_id)
         self._pending_imports = set()
         try:
             self.parse(ctx)
@@ -510,18 +513,22 @@ class SourceFile(
             if self.ctx.has_node(node_id):
                 self.ctx.remove_node(node_id)
         if not reparse:
-            self.ctx.filepath_idx.pop(self.file_path, None)
+            self.ctx.remove_file_path(self.file_path)
         self._nodes.clear()
         return list(filter(lambda node: self.ctx.has_node(node.node_id) and node is not None, external_edges_to_resolve))
 
     @noapidoc
     @commiter
-    def sync_with_file_content(self) -> None:
-        """Re-parses parent file and re-sets current TSNode."""
+    def sync_with_file_content(self, old_content: bytes | None = None, edits: Sequence[ContentEdit] | None = None) -> None:
+        """Re-parses parent file and re-sets current TSNode.
+
+        If the edits applied to the previous content of the file are known, tree-sitter reparses it incrementally. The
+        graph nodes of the file are still rebuilt from the whole tree.
+        """
         self._pending_imports.clear()
-        self.ts_node = parse_file(self.filepath, self.content)
+        self.ts_node = parse_file(self.filepath, self.content, old_content, edits)
         if self.node_id is None:
-            self.ctx.filepath_idx[self.file_path] = self.node_id
+            self.ctx.add_file_path(self.file_path, self.node_id)
             self.file_node_id = self.node_id
         else:
             assert self.ctx.has_node(self.node_id)
@@ -557,14 +564,18 @@ class SourceFile(
     @noapidoc
     def invalidate(self):
         self.__dict__.pop("valid_symbol_names", None)
+        self.__dict__.pop("symbol_definitions", None)
         self.__dict__.pop("valid_import_names", None)
         for imp in self.imports:
             imp.__dict__.pop("_wildcards", None)
 
     @classmethod
     @noapidoc
-    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True) -> Self | None:
-        """Creates a new file from content and adds it to the graph."""
+    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True, ts_node: TSNode | None = None) -> Self | None:
+        """Creates a new file from content and adds it to the graph.
+
+        If `ts_node` is provided (e.g. from a parallel parse), it is used instead of re-parsing `content`.
+        """
         path = ctx.to_absolute(filepath)
 
         # Sanity check to ensure file is not a minified file
@@ -572,7 +583,8 @@ class SourceFile(
             logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
             return None
 
-        ts_node = parse_file(path, content)
+        if ts_node is None:
+            ts_node = parse_file(path, content)
         if ts_node.has_error and verify_syntax:
             logger.info("Failed to parse file %s", filepath)
             return None
@@ -583,6 +595,7 @@ class SourceFile(
             path.parent.mkdir(parents=True, exist_ok=True)
             ctx.io.write_file(path, content)
             ctx.io.save_files({path})
+            ctx.update_directory_tree([path])
 
         if update_graph and sync:
             ctx.add_single_file(path)
@@ -663,6 +676,7 @@ class SourceFile(
             list[TImport]: List of Import objects that import this file as a module,
                 sorted by file location.
         """
+        self.ctx.load_references(self, resolve=False)
         imps = [x for x in self.ctx.in_edges(self.node_id) if x[2].type == EdgeType.IMPORT_SYMBOL_RESOLUTION]
         return sort_editables((self.ctx.get_node(x[0]) for x in imps), by_file=True, dedupe=False)
 
@@ -878,6 +892,18 @@ class SourceFile(
                 valid_symbol_names[name] = dest
         return valid_symbol_names
 
+    @cached_property
+    @noapidoc
+    @reader(cache=True)
+    def symbol_definitions(self) -> dict[str, tuple[list[int], list[Symbol]]]:
+        """Returns a dict mapping name => (start bytes, symbols) of the top-level symbols with that name, sorted by start byte."""
+        symbol_definitions = {}
+        for s in self.symbols:
+            start_bytes, symbols = symbol_definitions.setdefault(s.name, ([], []))
+            start_bytes.append(s.start_byte)
+            symbols.append(s)
+        return symbol_definitions
+
     @noapidoc
     @reader
     def resolve_name(self, name: str, start_byte: int | None = None, strict: bool = True) -> Generator[Symbol | Import | WildcardImport]:
@@ -902,11 +928,11 @@ class SourceFile(
             # If we have a start_byte and the resolved symbol is after it,
             # we need to look for earlier definitions of the symbol
             if start_byte is not None and resolved.end_byte > start_byte:
-                # Search backwards through symbols to find the most recent definition
-                # that comes before our start_byte position
-                for symbol in reversed(self.symbols):
-                    if symbol.start_byte <= start_byte and symbol.name == name:
-                        yield symbol
+                # Find the most recent definition that comes before our start_byte position
+                if definitions := self.symbol_definitions.get(name):
+                    start_bytes, symbols = definitions
+                    if idx := bisect_right(start_bytes, start_byte):
+                        yield symbols[idx - 1]
                         return
                 # If strict mode and no valid symbol found, return nothing
                 if not strict:
@@ -1170,18 +1196,22 @@ class SourceFile(
         return self
 
     @reader
-    def find_by_byte_range(self, range: Range) -> list[Editable]:
-        """Finds all editable objects that overlap with the given byte range in the file.
+    def find_by_byte_range(self, range: Range, *, overlapping: bool = False) -> list[Editable]:
+        """Finds all editable objects spanning the given byte range in the file.
 
-        Uses the file's range index to efficiently retrieve all editable objects (like functions,
-        classes, variables) that intersect with the specified byte range.
+        Uses the file's range index to efficiently retrieve the editable objects (like functions,
+        classes, variables) with exactly the specified byte range, or every one intersecting it.
 
         Args:
             range (Range): The byte range to search within the file.
+            overlapping (bool): Whether to return every Editable object overlapping the range instead of the ones with
+                exactly that range. Defaults to False.
 
         Returns:
-            list[Editable]: A list of all Editable objects that overlap with the given range.
+            list[Editable]: A list of the Editable objects with the given range, or overlapping it sorted by start byte.
         """
+        if overlapping:
+            return self._range_index.get_overlapping(range.start_byte, range.end_byte)
         return self._range_index.get_all_for_range(range)
 
     @property
@@ -74,6 +74,7 @@ _EXCLUDE_FROM_REPR: list[str] = [
     "resolved_type_frames",
     "resolved_types",
     "valid_symbol_names",
+    "symbol_definitions",
     "valid_import_names",
     "predecessor",
     "successor",
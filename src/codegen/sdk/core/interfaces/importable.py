@@ -65,15 +65,19 @@ class Importable(Expression[Parent], HasName, Generic[Parent]):
             deps.extend(filter(lambda x: x not in avoid, symbol._get_dependencies(usage_types)))
 
         if max_depth is not None and max_depth > 1:
-            # For max_depth > 1, recursively collect dependencies
+            # For max_depth > 1, collect dependencies breadth first so each dependency is only expanded once
             seen = set(deps)
-            for dep in list(deps):  # Create a copy of deps to iterate over
-                if isinstance(dep, Importable):
-                    next_deps = dep.dependencies(usage_types=usage_types, max_depth=max_depth - 1)
-                    for next_dep in next_deps:
+            level = [dep for dep in deps if isinstance(dep, Importable)]
+            for _ in range(max_depth - 1):
+                next_level = []
+                for dep in level:
+                    for next_dep in dep.dependencies(usage_types=usage_types):
                         if next_dep not in seen:
                             seen.add(next_dep)
                             deps.append(next_dep)
+                            if isinstance(next_dep, Importable):
+                                next_level.append(next_dep)
+                level = next_level
 
         return sort_editables(deps, by_file=True)
 
@@ -85,6 +89,7 @@ class Importable(Expression[Parent], HasName, Generic[Parent]):
         Opposite of `usages`
         """
         # TODO: sort out attribute usages in dependencies
+        self.ctx.load_dependencies(self)
         edges = [x for x in self.ctx.out_edges(self.node_id) if x[2].type == EdgeType.SYMBOL_USAGE]
         unique_dependencies = []
         for edge in edges:
@@ -62,6 +62,7 @@ class Inherits(SupportsGenerics, Generic[TType]):
                 return
             next_level = []
             for node in classes:
+                self.ctx.load_references(node, resolve=False)
                 for result in self.ctx.predecessors(node.node_id, edge_type=EdgeType.SUBCLASS):
                     if result.node_id not in seen:
                         seen.add(result.node_id)
@@ -6,7 +6,7 @@ from codegen.sdk._proxy import proxy_property
 from codegen.sdk.core.autocommit import reader
 from codegen.sdk.core.dataclasses.usage import Usage, UsageType
 from codegen.sdk.core.interfaces.importable import Importable
-from codegen.sdk.enums import EdgeType
+from codegen.sdk.extensions.sort import sort_editables
 from codegen.shared.decorators.docs import apidoc
 
 if TYPE_CHECKING:
@@ -41,6 +41,29 @@ class Usable(Importable[Parent], Generic[Parent]):
             symbol_usages.append(usage.usage_symbol.parent_symbol)
         return list(dict.fromkeys(symbol_usages))
 
+    @proxy_property
+    @reader(cache=False)
+    def dependents(self, usage_types: UsageType | None = None, max_depth: int | None = None) -> list[Import | Symbol | Export]:
+        """Returns a list of symbols that use or import the exportable object, directly or through other symbols.
+
+        This is the transitive counterpart of `symbol_usages`, answering which symbols may be affected by a change to this
+        one. Each symbol is only visited once, and results are memoized until the codebase changes.
+
+        Args:
+            usage_types (UsageType | None): The types of usages to follow. Defaults to any.
+            max_depth (int | None): Maximum number of usages between this object and the symbols returned. Defaults to
+                None (no limit).
+
+        Returns:
+            list[Import | Symbol | Export]: A list of symbols that depend on the exportable object, sorted by file location.
+
+        Note:
+            This method can be called as both a property or a method. If used as a property, it is equivalent to invoking it without arguments.
+        """
+        assert self.node_id is not None
+        node_ids = self.ctx.get_reachable(self.node_id, usage_types=usage_types, max_depth=max_depth, reverse=True)
+        return sort_editables((self.ctx.get_node(node_id) for node_id in node_ids), by_file=True)
+
     @proxy_property
     @reader(cache=False)
     def usages(self, usage_types: UsageType | None = None) -> list[Usage]:
@@ -65,15 +88,9 @@ class Usable(Importable[Parent], Generic[Parent]):
             raise ValueError(msg)
 
         assert self.node_id is not None
-        usages_to_return = []
-        in_edges = self.ctx.in_edges(self.node_id)
-        for edge in in_edges:
-            meta_data = edge[2]
-            if meta_data.type == EdgeType.SYMBOL_USAGE:
-                usage = meta_data.usage
-                if usage_types is None or usage.usage_type in usage_types:
-                    usages_to_return.append(usage)
-        return sorted(dict.fromkeys(usages_to_return), key=lambda x: x.match.ts_node.start_byte if x.match else x.usage_symbol.ts_node.start_byte, reverse=True)
+        self.ctx.load_references(self)
+        usages = self.ctx.get_usages(self.node_id)
+        return list(dict.fromkeys(usage for usage in usages if usage_types is None or usage.usage_type in usage_types))
 
     def rename(self, new_name: str, priority: int = 0) -> tuple[NodeId, NodeId]:
         """Renames a symbol and updates all its references in the codebase.
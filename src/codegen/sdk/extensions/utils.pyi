@@ -23,5 +23,14 @@ def find_first_descendant(node: TSNode, type_names: list[str], max_depth: int |
 cached_property = functools_cached_property
 lru_cache = functools_lru_cache
 
+def uncache_files(file_node_ids: Iterable[int | None]) -> None:
+    """Clears the cached properties of every instance belonging to the given file nodes, along with every lru_cache."""
+
+def forget_file(file_node_id: int) -> None:
+    """Clears the cached properties of a file node removed from the graph and drops its registry entry."""
+
+def uncache_recent() -> None:
+    """Clears the properties cached since the last call to uncache_files or uncache_recent, along with every lru_cache."""
+
 def uncache_all(): ...
 def is_descendant_of(node: TSNode, possible_parent: TSNode) -> bool: ...
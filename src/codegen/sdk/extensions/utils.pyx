@@ -1,7 +1,8 @@
-from collections import Counter
+from collections import Counter, defaultdict
 from collections.abc import Generator, Iterable
 from functools import cached_property as functools_cached_property
 from functools import lru_cache as functools_lru_cache
+from weakref import WeakValueDictionary
 
 from tabulate import tabulate
 from tree_sitter import Node as TSNode
@@ -109,16 +110,23 @@ def find_first_descendant(node: TSNode, type_names: list[str], max_depth: int |
     return find(node)
 
 
-to_uncache = []
+# Computed properties keyed by (id(instance), attrname), grouped by the file node the instance belongs to (None for anything
+# outside a file). Instances are only weakly referenced so removed nodes can be garbage collected.
+cached_by_file = defaultdict(WeakValueDictionary)
+# Properties computed since the last call to uncache_files or uncache_recent
+recently_cached = WeakValueDictionary()
 lru_caches = []
 counter = Counter()
 
 
 class cached_property(functools_cached_property):
     def __get__(self, instance, owner=None):
-        ret = super().__get__(instance)
+        ret = super().__get__(instance, owner)
         if instance is not None:
-            to_uncache.append((instance, self.attrname))
+            # Once computed, the value is stored in the instance dict and this descriptor isn't invoked anymore
+            key = (id(instance), self.attrname)
+            cached_by_file[getattr(instance, "file_node_id", None)][key] = instance
+            recently_cached[key] = instance
             counter[self.attrname] += 1
         return ret
 
@@ -137,12 +145,49 @@ def lru_cache(func=None, *, maxsize=128, typed=False):
     return cached_func
 
 
+def _uncache_properties(cached):
+    for (_, name), instance in list(cached.items()):
+        instance.__dict__.pop(name, None)
+
+
+def uncache_files(file_node_ids):
+    """Clears the cached properties of every instance belonging to the given file nodes, along with every lru_cache.
+
+    Pass None as one of the ids to clear instances that don't belong to a file (the codebase, directories, etc).
+    Resets the tracking of recently cached properties, see uncache_recent.
+    """
+    for file_node_id in file_node_ids:
+        cached = cached_by_file.pop(file_node_id, None)
+        if cached is not None:
+            _uncache_properties(cached)
+    recently_cached.clear()
+    for cached_func in lru_caches:
+        cached_func.cache_clear()
+
+
+def forget_file(file_node_id):
+    """Clears the cached properties of a file node removed from the graph and drops its registry entry.
+
+    Graph node ids are reused after removal, so a new file must not inherit the entries of the removed one.
+    """
+    cached = cached_by_file.pop(file_node_id, None)
+    if cached is not None:
+        _uncache_properties(cached)
+
+
+def uncache_recent():
+    """Clears the properties cached since the last call to uncache_files or uncache_recent, along with every lru_cache."""
+    _uncache_properties(recently_cached)
+    recently_cached.clear()
+    for cached_func in lru_caches:
+        cached_func.cache_clear()
+
+
 def uncache_all():
-    for instance, name in to_uncache:
-        try:
-            del instance.__dict__[name]
-        except KeyError:
-            pass
+    for cached in cached_by_file.values():
+        _uncache_properties(cached)
+    cached_by_file.clear()
+    recently_cached.clear()
 
     for cached_func in lru_caches:
         cached_func.cache_clear()
@@ -15,7 +15,6 @@ if TYPE_CHECKING:
     from tree_sitter import Node as TSNode
 
     from codegen.sdk.codebase.codebase_context import CodebaseContext
-    from codegen.sdk.core.file import SourceFile
     from codegen.sdk.core.interfaces.editable import Editable
     from codegen.sdk.core.interfaces.exportable import Exportable
     from codegen.sdk.core.node_id_factory import NodeId
@@ -95,87 +94,56 @@ class PyImport(Import["PyFile"]):
             # If import is relative, convert to absolute path
             if module_source.startswith("."):
                 module_source = self._relative_to_absolute_import(module_source)
+            if not module_source:
+                return None
+            if (base_prefix := self._module_prefix(base_path)) is None:
+                # Module names can't express this base path, look the files up by path instead
+                return self._resolve_import_by_path(base_path, module_source, symbol_name)
+            module_map = self.ctx.module_map
+            resolve_prefixes = module_map.get_resolve_prefixes() if len(self.ctx.config.import_resolution_paths) > 0 or self.ctx.config.py_resolve_syspath else []
 
             # =====[ Check if we are importing an entire file ]=====
             if self.is_module_import():
                 # covers `import a.b.c` case and `from a.b.c import *` case
-                filepath = os.path.join(base_path, module_source.replace(".", "/") + ".py")
+                module_name = base_prefix + module_source
             else:
                 # This is the case where you do:
                 # `from a.b.c import foo`
-                filepath = os.path.join(
-                    base_path,
-                    module_source.replace(".", "/") + "/" + symbol_name + ".py",
-                )
+                module_name = f"{base_prefix}{module_source}.{symbol_name}"
 
             # =====[ Check if we are importing an entire file with custom resolve path or sys.path enabled ]=====
-            if len(self.ctx.config.import_resolution_paths) > 0 or self.ctx.config.py_resolve_syspath:
-                # Handle resolve overrides first if both is set
-                resolve_paths: list[str] = self.ctx.config.import_resolution_paths + (sys.path if self.ctx.config.py_resolve_syspath else [])
-                if file := self._file_by_custom_resolve_paths(resolve_paths, filepath):
+            # Handle resolve overrides first if both is set
+            for prefix in resolve_prefixes:
+                if file := self._get_module_file(module_map.get_module(prefix + module_name)):
                     return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
             # =====[ Default path ]=====
-            if file := self.ctx.get_file(filepath):
+            if file := self._get_module_file(module_map.get_module(module_name)):
                 return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
-            filepath = filepath.replace(".py", "/__init__.py")
-            if file := self.ctx.get_file(filepath):
+            if file := self._get_module_file(module_map.get_package(module_name)):
                 # TODO - I think this is another edge case, due to `dao/__init__.py` etc.
                 # You can't do `from a.b.c import foo` => `foo.utils.x` right now since `foo` is just a file...
                 return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
             # =====[ Check if `module.py` file exists in the graph with custom resolve path or sys.path enabled  ]=====
-            filepath = module_source.replace(".", "/") + ".py"
-            if len(self.ctx.config.import_resolution_paths) > 0 or self.ctx.config.py_resolve_syspath:
-                # Handle resolve overrides first if both is set
-                resolve_paths: list[str] = self.ctx.config.import_resolution_paths + (sys.path if self.ctx.config.py_resolve_syspath else [])
-                if file := self._file_by_custom_resolve_paths(resolve_paths, filepath):
+            for prefix in resolve_prefixes:
+                if file := self._get_module_file(module_map.get_module(prefix + module_source)):
                     symbol = file.get_node_by_name(symbol_name)
                     return ImportResolution(from_file=file, symbol=symbol)
 
             # =====[ Check if `module.py` file exists in the graph ]=====
-            filepath = os.path.join(base_path, filepath)
-            if file := self.ctx.get_file(filepath):
-                symbol = file.get_node_by_name(symbol_name)
-                if symbol is None:
-                    if file.get_node_from_wildcard_chain(symbol_name):
-                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                    else:
-                        # This is most likely a broken import
-                        return ImportResolution(from_file=file, symbol=None)
-                else:
-                    return ImportResolution(from_file=file, symbol=symbol)
+            if file := self._get_module_file(module_map.get_module(base_prefix + module_source)):
+                return self._resolve_from_file(file, symbol_name)
 
             # =====[ Check if `module/__init__.py` file exists in the graph with custom resolve path or sys.path enabled ]=====
-            filepath = filepath.replace(".py", "/__init__.py")
-            if len(self.ctx.config.import_resolution_paths) > 0 or self.ctx.config.py_resolve_syspath:
-                # Handle resolve overrides first if both is set
-                resolve_paths: list[str] = self.ctx.config.import_resolution_paths + (sys.path if self.ctx.config.py_resolve_syspath else [])
-                if from_file := self._file_by_custom_resolve_paths(resolve_paths, filepath):
-                    symbol = from_file.get_node_by_name(symbol_name)
-                    if symbol is None:
-                        if from_file.get_node_from_wildcard_chain(symbol_name):
-                            return ImportResolution(from_file=from_file, symbol=None, imports_file=True)
-                        else:
-                            # This is most likely a broken import
-                            return ImportResolution(from_file=from_file, symbol=None)
-
-                    else:
-                        return ImportResolution(from_file=from_file, symbol=symbol)
+            for prefix in resolve_prefixes:
+                if from_file := self._get_module_file(module_map.get_package(prefix + base_prefix + module_source)):
+                    return self._resolve_from_file(from_file, symbol_name)
 
             # =====[ Check if `module/__init__.py` file exists in the graph ]=====
-            if from_file := self.ctx.get_file(filepath):
-                symbol = from_file.get_node_by_name(symbol_name)
-                if symbol is None:
-                    if from_file.get_node_from_wildcard_chain(symbol_name):
-                        return ImportResolution(from_file=from_file, symbol=None, imports_file=True)
-                    else:
-                        # This is most likely a broken import
-                        return ImportResolution(from_file=from_file, symbol=None)
-
-                else:
-                    return ImportResolution(from_file=from_file, symbol=symbol)
+            if from_file := self._get_module_file(module_map.get_package(base_prefix + module_source)):
+                return self._resolve_from_file(from_file, symbol_name)
 
             # =====[ Case: Can't resolve the import ]=====
             if base_path == "":
@@ -202,24 +170,62 @@ class PyImport(Import["PyFile"]):
             # Codebase is probably trying to import file from outside repo
             return None
 
+    @staticmethod
+    def _module_prefix(base_path: str) -> str | None:
+        """Converts a base path to the prefix of the dotted names of the modules within it, or None if its directory names
+        contain dots and can't be expressed as module names
+        """
+        parts = [part for part in os.path.normpath(base_path).split(os.sep) if part != "."]
+        if not all(part and "." not in part for part in parts):
+            return None
+        return "".join(f"{part}." for part in parts)
+
     @noapidoc
     @reader
-    def _file_by_custom_resolve_paths(self, resolve_paths: list[str], filepath: str) -> SourceFile | None:
-        """Check if a certain file import can be found within a set sys.path
+    def _resolve_import_by_path(self, base_path: str, module_source: str, symbol_name: str) -> ImportResolution[PyFile] | None:
+        """Resolves the import by joining the module path to the base path, for base paths without module names"""
+        module_path = module_source.replace(".", "/")
+        resolve_paths = [*self.ctx.config.import_resolution_paths, *(sys.path if self.ctx.config.py_resolve_syspath else [])]
+
+        # =====[ Check if we are importing an entire file ]=====
+        filepath = os.path.join(base_path, module_path + ".py" if self.is_module_import() else f"{module_path}/{symbol_name}.py")
+        for candidate in (filepath, filepath.removesuffix(".py") + "/__init__.py"):
+            if file := self._file_by_resolve_paths(resolve_paths, candidate) or self.ctx.get_file(candidate):
+                return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
-        Returns either None or the SourceFile.
-        """
+        # =====[ Check if `module.py` or `module/__init__.py` file exists in the graph ]=====
+        for candidate in (module_path + ".py", module_path + "/__init__.py"):
+            if file := self._file_by_resolve_paths(resolve_paths, candidate) or self.ctx.get_file(os.path.join(base_path, candidate)):
+                return self._resolve_from_file(file, symbol_name)
+        return None
+
+    @noapidoc
+    def _file_by_resolve_paths(self, resolve_paths: list[str], filepath: str) -> PyFile | None:
         for resolve_path in resolve_paths:
-            filepath_new: str = os.path.join(resolve_path, filepath)
             try:
-                file = self.ctx.get_file(filepath_new)
-            except AssertionError as e:
-                file = None
-            if file:
-                return file
-
+                if file := self.ctx.get_file(os.path.join(resolve_path, filepath)):
+                    return file
+            except AssertionError:
+                continue
         return None
 
+    @noapidoc
+    def _get_module_file(self, filepath: str | None) -> PyFile | None:
+        return self.ctx.get_file_by_relative_path(filepath) if filepath is not None else None
+
+    @noapidoc
+    @reader
+    def _resolve_from_file(self, file: PyFile, symbol_name: str) -> ImportResolution[PyFile]:
+        symbol = file.get_node_by_name(symbol_name)
+        if symbol is None:
+            if file.get_node_from_wildcard_chain(symbol_name):
+                return ImportResolution(from_file=file, symbol=None, imports_file=True)
+            else:
+                # This is most likely a broken import
+                return ImportResolution(from_file=file, symbol=None)
+        else:
+            return ImportResolution(from_file=file, symbol=symbol)
+
     @noapidoc
     @reader
     def _relative_to_absolute_import(self, relative_import: str) -> str:
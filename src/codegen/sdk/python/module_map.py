@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+
+
+class PyModuleMap:
+    """Python modules and packages of the repository by dotted module name, relative to the repository root.
+
+    Modules map to their `.py` file and regular packages to their `__init__.py`. Modules of namespace packages need no
+    special handling since they are addressed by their full dotted name. The map is kept up to date with the files of the
+    graph, so resolving a module is a dictionary lookup instead of probing candidate paths.
+    """
+
+    ctx: CodebaseContext
+    # Dotted module name => path of the module file
+    _modules: dict[str, str]
+    # Dotted package name => path of the `__init__.py` file of the package
+    _packages: dict[str, str]
+    # Import resolution paths (followed by `sys.path` if enabled) => their prefixes within the repository
+    _prefixes: dict[tuple[str, ...], list[str]]
+
+    def __init__(self, ctx: CodebaseContext) -> None:
+        self.ctx = ctx
+        self._modules = {}
+        self._packages = {}
+        self._prefixes = {}
+
+    @staticmethod
+    def _module_name(file_path: str) -> tuple[str | None, bool]:
+        """Returns the dotted name of the module in `file_path` (None if it can't be imported), and whether it's a package"""
+        if not file_path.endswith(".py"):
+            return None, False
+        parts = file_path[:-3].split(os.sep)
+        is_package = parts[-1] == "__init__"
+        if is_package:
+            parts.pop()
+        if not all(part and "." not in part for part in parts):
+            return None, False
+        return ".".join(parts), is_package
+
+    def add(self, file_path: str) -> None:
+        name, is_package = self._module_name(file_path)
+        if name is not None:
+            (self._packages if is_package else self._modules)[name] = file_path
+
+    def remove(self, file_path: str) -> None:
+        name, is_package = self._module_name(file_path)
+        if name is not None:
+            modules = self._packages if is_package else self._modules
+            if modules.get(name) == file_path:
+                del modules[name]
+
+    def get_module(self, name: str) -> str | None:
+        """Returns the path of the module file `<name>.py`"""
+        return self._modules.get(name)
+
+    def get_package(self, name: str) -> str | None:
+        """Returns the path of the package file `<name>/__init__.py`"""
+        return self._packages.get(name)
+
+    def get_resolve_prefixes(self) -> list[str]:
+        """Returns the dotted prefixes of the configured import resolution paths, followed by `sys.path` if enabled.
+
+        Paths outside of the repository are skipped. The prefixes are cached for as long as the paths don't change.
+        """
+        paths = (*self.ctx.config.import_resolution_paths, *(sys.path if self.ctx.config.py_resolve_syspath else ()))
+        if (ret := self._prefixes.get(paths)) is None:
+            ret = []
+            for path in paths:
+                try:
+                    if not self.ctx.is_subdir(path):
+                        continue
+                except (OSError, RuntimeError):
+                    continue
+                relative_path = str(self.ctx.to_relative(path))
+                parts = [] if relative_path == "." else relative_path.split(os.sep)
+                if all(part and "." not in part for part in parts):
+                    ret.append("".join(f"{part}." for part in parts))
+            self._prefixes[paths] = ret
+        return ret
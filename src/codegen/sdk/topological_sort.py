@@ -6,6 +6,21 @@ from codegen.shared.logging.get_logger import get_logger
 logger = get_logger(__name__)
 
 
+def condensation(graph: PyDiGraph) -> tuple[PyDiGraph, dict[int, int]]:
+    """Collapses every strongly connected component of the graph into a single node.
+
+    Returns the condensed graph, whose nodes hold the list of nodes of their component, and a mapping of each node to the
+    index of its component in the condensed graph.
+    """
+    sccs = nx.strongly_connected_components(graph)
+    scc_graph = nx.PyDiGraph()
+    scc_indices = scc_graph.add_nodes_from(sccs)
+    node_to_scc = {node: scc_idx for scc_idx, scc in zip(scc_indices, sccs) for node in scc}
+    scc_edges = {(node_to_scc[u], node_to_scc[v]) for u, v in graph.edge_list()}
+    scc_graph.add_edges_from_no_data([(scc_u, scc_v) for scc_u, scc_v in scc_edges if scc_u != scc_v])
+    return scc_graph, node_to_scc
+
+
 def pseudo_topological_sort(graph: PyDiGraph, flatten: bool = True):
     """This will come up with an ordering of nodes within the graph respecting topological"""
     try:
@@ -16,29 +31,16 @@ def pseudo_topological_sort(graph: PyDiGraph, flatten: bool = True):
         # If a cycle is detected, handle it separately
         logger.warning("The graph contains a cycle. Performing an approximate topological sort.")
 
-        # Find the strongly connected components in the graph
-        sccs = list(nx.strongly_connected_components(graph))
+        # Create a new graph with each strongly connected component as a single node
+        scc_graph, _ = condensation(graph)
 
         if not flatten:
-            return sccs
-
-        # Create a new graph with each strongly connected component as a single node
-        scc_graph = nx.PyDiGraph()
-        for i, scc in enumerate(sccs):
-            scc_graph.add_node(i)
-
-        for u, v in graph.edges():
-            scc_u = next((i for i, scc in enumerate(sccs) if u in scc), None)
-            scc_v = next((i for i, scc in enumerate(sccs) if v in scc), None)
-            if scc_u is None or scc_v is None:
-                continue
-            if scc_u != scc_v:
-                scc_graph.add_edge(scc_u, scc_v, None)
+            return [scc_graph[scc_idx] for scc_idx in scc_graph.node_indices()]
 
         # Perform a topological sort on the condensed graph
         sorted_sccs = list(nx.topological_sort(scc_graph))
 
         # Expand the strongly connected components back to individual nodes
-        sorted_nodes = [node for scc_idx in sorted_sccs for node in sccs[scc_idx]]
+        sorted_nodes = [node for scc_idx in sorted_sccs for node in scc_graph[scc_idx]]
 
         return sorted_nodes
@@ -1,4 +1,10 @@
+import hashlib
 import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from os import PathLike
 from pathlib import Path
 from typing import Union
@@ -6,9 +12,11 @@ from typing import Union
 import tree_sitter_javascript as ts_javascript
 import tree_sitter_python as ts_python
 import tree_sitter_typescript as ts_typescript
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Point, Tree
 from tree_sitter import Node as TSNode
 
+from codegen.sdk.codebase.diff_lite import ContentEdit
+from codegen.sdk.codebase.transactions import apply_edits
 from codegen.sdk.output.utils import stylize_error
 
 PY_LANGUAGE = Language(ts_python.language())
@@ -39,9 +47,10 @@ class _TreeSitterAbstraction:
         ".tsx": TSX_LANGUAGE,
         ".py": PY_LANGUAGE,
     }
-    extension_to_parser: dict[str, Parser] = {}
+    extension_to_parser: dict[str, Parser]
 
     def __init__(self) -> None:
+        self.extension_to_parser = {}
         self.initialize_parsers()
 
     def initialize_parsers(self) -> None:
@@ -51,35 +60,217 @@ class _TreeSitterAbstraction:
 
 
 _ts_parser_factory = _TreeSitterAbstraction()
+# Tree-sitter parsers are not thread safe, so every parse worker gets its own set
+_worker_parser_factory = threading.local()
 
 
-def get_parser_by_filepath_or_extension(filepath_or_extension: str | PathLike = ".py") -> Parser:
+# Memory taken by a tree-sitter tree per node, measured on Python sources
+_TREE_BYTES_PER_NODE = 100
+
+
+class _ParseCache:
+    """Content-addressed LRU cache of parsed tree-sitter trees, bounded by the estimated memory of the trees.
+
+    Trees are keyed by language and content hash, so files that are re-parsed with content seen before (e.g. after
+    switching back to a branch or re-syncing a file) skip tree-sitter parsing. Trees are never edited in place, so they
+    can safely be shared between files with identical content. A tree takes about 20 times the size of its source.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._trees: OrderedDict[tuple[str, bytes], tuple[Tree, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(extension: str, content: bytes) -> tuple[str, bytes]:
+        return extension, hashlib.sha1(content).digest()
+
+    def get(self, key: tuple[str, bytes]) -> Tree | None:
+        with self._lock:
+            if (entry := self._trees.get(key)) is None:
+                return None
+            self._trees.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: tuple[str, bytes], tree: Tree) -> None:
+        size = tree.root_node.descendant_count * _TREE_BYTES_PER_NODE
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if (entry := self._trees.pop(key, None)) is not None:
+                self._size -= entry[1]
+            self._trees[key] = (tree, size)
+            self._size += size
+            self._evict()
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._trees.popitem(last=False)
+            self._size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._trees.clear()
+            self._size = 0
+
+
+# Shared by every codebase, sized by the `parse_cache_mb` of the last one created
+_parse_cache = _ParseCache(max_bytes=256 * 1024 * 1024)
+
+
+def clear_parse_cache() -> None:
+    _parse_cache.clear()
+
+
+def set_parse_cache_size(max_bytes: int) -> None:
+    """Sets the estimated memory the cached trees may take, evicting the least recently used ones over the limit"""
+    _parse_cache.resize(max_bytes)
+
+
+def _normalize_extension(filepath_or_extension: str | PathLike) -> str:
     extension = to_extension(filepath_or_extension)
     # HACK: we do not currently use a plain text parser, so default to python for now
-    if extension not in _ts_parser_factory.extension_to_parser:
+    if extension not in _TreeSitterAbstraction.extension_to_lang:
         extension = ".py"
-    return _ts_parser_factory.extension_to_parser[extension]
+    return extension
+
+
+def get_parser_by_filepath_or_extension(filepath_or_extension: str | PathLike = ".py") -> Parser:
+    return _ts_parser_factory.extension_to_parser[_normalize_extension(filepath_or_extension)]
 
 
 def get_lang_by_filepath_or_extension(filepath_or_extension: str = ".py") -> Language:
-    extension = to_extension(filepath_or_extension)
-    # HACK: we do not currently use a plain text parser, so default to python for now
-    if extension not in _ts_parser_factory.extension_to_parser:
-        extension = ".py"
-    return _ts_parser_factory.extension_to_lang[extension]
+    return _ts_parser_factory.extension_to_lang[_normalize_extension(filepath_or_extension)]
 
 
-def parse_file(filepath: PathLike, content: str) -> TSNode:
-    parser = get_parser_by_filepath_or_extension(filepath)
-    ts_node = parser.parse(bytes(content, "utf-8")).root_node
-    return ts_node
+def _parse_cached(parser: Parser, extension: str, content: str) -> TSNode:
+    content_bytes = bytes(content, "utf-8")
+    key = _parse_cache.get_key(extension, content_bytes)
+    if (tree := _parse_cache.get(key)) is None:
+        tree = parser.parse(content_bytes)
+        _parse_cache.put(key, tree)
+    return tree.root_node
+
+
+def parse_file(filepath: PathLike, content: str, old_content: bytes | None = None, edits: Sequence[ContentEdit] | None = None) -> TSNode:
+    """Parses `content` with the parser for the file's language.
+
+    If `old_content` and the `edits` turning it into `content` are given, and the tree of `old_content` is still cached,
+    the file is reparsed incrementally from that tree so tree-sitter only re-parses the edited regions.
+    """
+    extension = _normalize_extension(filepath)
+    parser = _ts_parser_factory.extension_to_parser[extension]
+    if old_content is not None and edits is not None:
+        content_bytes = bytes(content, "utf-8")
+        key = _parse_cache.get_key(extension, content_bytes)
+        if (tree := _parse_cache.get(key)) is not None:
+            return tree.root_node
+        if (tree := _reparse_incremental(parser, extension, old_content, edits, content_bytes)) is not None:
+            _parse_cache.put(key, tree)
+            return tree.root_node
+    return _parse_cached(parser, extension, content)
+
+
+_NEWLINE = re.compile(rb"\n")
+
+
+class _NewlineTable:
+    """Offsets of the newlines of a content being edited, to compute the points of edits without scanning the content.
+
+    The table is a gap buffer positioned at the last edit: newlines before it are stored as offsets from the start of the
+    content, newlines after it as offsets from the end, so an edit only moves the newlines between it and the previous
+    edit, and edits sorted by position cost O(size of the content + size of the edits) in total.
+    """
+
+    # Offsets of the newlines before the gap, ascending
+    _before: list[int]
+    # Offsets from the end of the content of the newlines after the gap, ascending (the newline nearest the gap is last)
+    _after: list[int]
+    _length: int
+
+    def __init__(self, content: bytes) -> None:
+        self._before = []
+        self._length = len(content)
+        self._after = [self._length - match.start() for match in reversed(list(_NEWLINE.finditer(content)))]
+
+    def _move(self, byte: int) -> None:
+        while self._before and self._before[-1] >= byte:
+            self._after.append(self._length - self._before.pop())
+        while self._after and self._length - self._after[-1] < byte:
+            self._before.append(self._length - self._after.pop())
+
+    def _point(self, byte: int) -> Point:
+        """The point of `byte`, given that every newline before it is before the gap"""
+        return Point(len(self._before), byte - (self._before[-1] + 1 if self._before else 0))
+
+    def edit(self, start_byte: int, old_end_byte: int, new_bytes: bytes) -> tuple[Point, Point, Point]:
+        """Replaces [start_byte, old_end_byte) with `new_bytes`, returning the start, old end and new end points"""
+        self._move(start_byte)
+        start_point = self._point(start_byte)
+        # Newlines of the replaced bytes move before the gap to find the old end point, then are dropped
+        num_before = len(self._before)
+        self._move(old_end_byte)
+        old_end_point = self._point(old_end_byte)
+        del self._before[num_before:]
+        self._before.extend(start_byte + match.start() for match in _NEWLINE.finditer(new_bytes))
+        new_end_byte = start_byte + len(new_bytes)
+        new_end_point = self._point(new_end_byte)
+        # Offsets after the gap are from the end of the content, and don't change
+        self._length += len(new_bytes) - (old_end_byte - start_byte)
+        return start_point, old_end_point, new_end_point
+
+
+def _reparse_incremental(parser: Parser, extension: str, old_content: bytes, edits: Sequence[ContentEdit], content: bytes) -> Tree | None:
+    old_tree = _parse_cache.get(_parse_cache.get_key(extension, old_content))
+    if old_tree is None:
+        return None
+    # The content was also changed by something other than these edits, the old tree can't be reused
+    if apply_edits(old_content, edits) != content:
+        return None
+    newlines = _NewlineTable(old_content)
+    tree_edits = []
+    for start_byte, old_end_byte, new_bytes in edits:
+        tree_edits.append((start_byte, old_end_byte, start_byte + len(new_bytes), *newlines.edit(start_byte, old_end_byte, new_bytes)))
+    # Cached trees are shared between files and must not be edited. Reparsing the unchanged content on top of the cached
+    # tree reuses all of its nodes and gives us a private tree to edit (Tree.copy() crashes on deallocation).
+    tree = parser.parse(old_content, old_tree)
+    for tree_edit in tree_edits:
+        tree.edit(*tree_edit)
+    return parser.parse(content, tree)
+
+
+def _get_worker_parser(extension: str) -> Parser:
+    factory = getattr(_worker_parser_factory, "factory", None)
+    if factory is None:
+        factory = _worker_parser_factory.factory = _TreeSitterAbstraction()
+    return factory.extension_to_parser[extension]
+
+
+def _parse_in_worker(file: tuple[PathLike, str]) -> tuple[PathLike, str, TSNode]:
+    filepath, content = file
+    extension = _normalize_extension(filepath)
+    return filepath, content, _parse_cached(_get_worker_parser(extension), extension, content)
+
+
+def parse_files(files: Iterable[tuple[PathLike, str]], max_workers: int | None = None) -> Iterator[tuple[PathLike, str, TSNode]]:
+    """Parses (filepath, content) pairs on a pool of worker threads, each holding its own parsers.
+
+    Results are yielded in the same order as the input so that graph construction stays deterministic.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ts-parse") as executor:
+        yield from executor.map(_parse_in_worker, files)
 
 
 def print_errors(filepath: PathLike, content: str) -> None:
     if not os.path.exists(filepath):
         return
-    parser = get_parser_by_filepath_or_extension(filepath)
-    ts_node = parser.parse(bytes(content, "utf-8")).root_node
+    ts_node = parse_file(filepath, content)
     if ts_node.has_error:
 
         def traverse(node):
@@ -7,23 +7,30 @@ from codegen.sdk.enums import NodeType
 from codegen.sdk.typescript.ts_config import TSConfig
 
 if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
     from codegen.sdk.codebase.codebase_context import CodebaseContext
     from codegen.sdk.typescript.file import TSFile
 
 import os
-from functools import cache
 
 
 class TSConfigParser(ConfigParser):
     # Cache of path names to TSConfig objects
     config_files: dict[Path, TSConfig]
     ctx: "CodebaseContext"
+    # Cache of directories to the config of the files they contain
+    _dir_configs: dict[Path, TSConfig | None]
+    # Config files that were looked up but don't exist
+    _missing_configs: set[Path]
 
     def __init__(self, codebase_context: "CodebaseContext", default_config_name: str = "tsconfig.json"):
         super().__init__()
         self.config_files = dict()
         self.ctx = codebase_context
         self.default_config_name = default_config_name
+        self._dir_configs = {}
+        self._missing_configs = set()
 
     def get_config(self, config_path: os.PathLike) -> TSConfig | None:
         path = self.ctx.to_absolute(config_path)
@@ -32,32 +39,60 @@ class TSConfigParser(ConfigParser):
         if path.exists():
             self.config_files[path] = TSConfig(File.from_content(config_path, path.read_text(), self.ctx, sync=False), self)
             return self.config_files.get(path)
+        self._missing_configs.add(path)
         return None
 
-    def parse_configs(self):
-        # This only yields a 0.05s speedup, but its funny writing dynamic programming code
-        @cache
-        def get_config_for_dir(dir_path: Path) -> TSConfig | None:
-            # Check if the config file exists in the directory
-            ts_config_path = dir_path / self.default_config_name
-            # If it does, return the config
-            if ts_config_path.exists():
-                if ts_config := self.get_config(self.ctx.to_absolute(ts_config_path)):
-                    self.config_files[ts_config_path] = ts_config
-                    return ts_config
-            # Otherwise, check the parent directory
-            if dir_path.is_relative_to(self.ctx.repo_path):
-                return get_config_for_dir(dir_path.parent)
-            return None
+    def _get_config_for_dir(self, dir_path: Path) -> TSConfig | None:
+        if dir_path in self._dir_configs:
+            return self._dir_configs[dir_path]
+        # Check if the config file exists in the directory
+        ts_config_path = dir_path / self.default_config_name
+        # If it does, return the config
+        if ts_config_path.exists() and (ts_config := self.get_config(self.ctx.to_absolute(ts_config_path))):
+            self.config_files[ts_config_path] = ts_config
+        # Otherwise, check the parent directory
+        elif dir_path.is_relative_to(self.ctx.repo_path):
+            ts_config = self._get_config_for_dir(dir_path.parent)
+        else:
+            ts_config = None
+        self._dir_configs[dir_path] = ts_config
+        return ts_config
+
+    def parse_configs(self, files: "Iterable[TSFile] | None" = None):
+        if files is None:
+            # Parse every config again when assigning the configs of the whole graph
+            self.config_files.clear()
+            self._dir_configs.clear()
+            self._missing_configs.clear()
 
         # Get all the files in the codebase
-        for file in self.ctx.get_nodes(NodeType.FILE):
+        for file in self.ctx.get_nodes(NodeType.FILE) if files is None else files:
             file: TSFile  # This should be safe because we only call this on TSFiles
             # Get the config for the directory the file is in
-            config = get_config_for_dir(file.path.parent)
+            config = self._get_config_for_dir(file.path.parent)
             # Set the config for the file
             file.ts_config = config
 
         # Loop through all the configs and precompute their import aliases
         for config in self.config_files.values():
             config._precompute_import_aliases()
+
+    def is_config_file(self, path: Path) -> bool:
+        return path.name == self.default_config_name or path in self.config_files or path in self._missing_configs
+
+    def config_paths(self) -> "Collection[Path]":
+        return sorted({*self.config_files, *self._missing_configs})
+
+    def sync_configs(self, config_paths: "Collection[Path]", files: "Iterable[TSFile]") -> "list[TSFile]":
+        if not config_paths:
+            self.parse_configs(files)
+            return []
+        # Configs depend on each other through extends and references, parse all of them again
+        previous = {file: file.ts_config for file in self.ctx.get_nodes(NodeType.FILE)}
+        self.parse_configs()
+        new_files = set(files)
+        return [file for file, config in previous.items() if file not in new_files and _translation_key(config) != _translation_key(file.ts_config)]
+
+
+def _translation_key(config: TSConfig | None) -> tuple | None:
+    return None if config is None else config._import_translation_key()
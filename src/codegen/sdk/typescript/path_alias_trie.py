@@ -0,0 +1,52 @@
+from collections.abc import Iterable
+
+
+class PathAliasTrie:
+    """Path alias patterns (ex: `@shared`, `@codegen/test/`) in a trie of their `/` separated segments.
+
+    Finds the longest alias that is a prefix of an import path ending on a segment boundary in a single walk over the
+    segments of the import path, instead of testing every parent directory of the import path against the aliases.
+    """
+
+    # Segment => child node
+    _children: dict[str, "PathAliasTrie"]
+    # Alias ending at this node, if any
+    _alias: str | None
+    # Alias ending at this node followed by a trailing `/`, if any
+    _dir_alias: str | None
+
+    def __init__(self, aliases: Iterable[str] = ()) -> None:
+        self._children = {}
+        self._alias = None
+        self._dir_alias = None
+        for alias in aliases:
+            self.add(alias)
+
+    def add(self, alias: str) -> None:
+        # Empty and root aliases never match an import path
+        if alias in ("", "/"):
+            return
+        node = self
+        is_dir = alias.endswith("/")
+        for segment in (alias[:-1] if is_dir else alias).split("/"):
+            node = node._children.setdefault(segment, PathAliasTrie())
+        if is_dir:
+            node._dir_alias = alias
+        else:
+            node._alias = alias
+
+    def find_longest_match(self, import_path: str) -> str | None:
+        """Returns the longest alias matching `import_path`, or None if there is none.
+
+        An alias matches if it is the import path or one of its parent directories, with or without a trailing `/`.
+        """
+        ret = None
+        node = self
+        for segment in import_path.split("/"):
+            if (node := node._children.get(segment)) is None:
+                break
+            if node._alias is not None:
+                ret = node._alias
+            elif node._dir_alias is not None:
+                ret = node._dir_alias
+        return ret
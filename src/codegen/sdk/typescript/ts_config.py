@@ -1,5 +1,4 @@
 import os
-from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -7,6 +6,7 @@ import pyjson5
 
 from codegen.sdk.core.directory import Directory
 from codegen.sdk.core.file import File
+from codegen.sdk.typescript.path_alias_trie import PathAliasTrie
 from codegen.shared.decorators.docs import ts_apidoc
 from codegen.shared.logging.get_logger import get_logger
 
@@ -55,10 +55,18 @@ class TSConfig:
     # Optimization hack. If all the path alises start with `@` or `~`, then we can skip any path that doesn't start with `@` or `~`
     # when computing the import resolution.
     _import_optimization_enabled: bool = False
+    # Import aliases compiled for translate_import_path, and the import paths translated so far
+    _path_alias_trie: PathAliasTrie = PathAliasTrie()
+    _reference_alias_trie: PathAliasTrie = PathAliasTrie()
+    _relative_reference_import_aliases: dict[str, list[str]] = {}
+    _override_alias_trie: PathAliasTrie = PathAliasTrie()
+    _overrides: dict[str, str] = {}
+    _translated_import_paths: dict[str, str] = {}
 
     def __init__(self, config_file: File, config_parser: "TSConfigParser"):
         self.config_file = config_file
         self.config_parser = config_parser
+        self._translated_import_paths = {}
         # Try to parse the config file as JSON5. Fallback to empty dict if it fails.
         # We use json5 because it supports comments in the config file.
         try:
@@ -224,6 +232,12 @@ class TSConfig:
         # Precompute _import_optimization_enabled
         self._import_optimization_enabled = all(k.startswith("@") or k.startswith("~") for k in list(self.path_import_aliases.keys()) + list(self.reference_import_aliases.keys()))
 
+        # Compile the aliases for translate_import_path, dropping the paths translated with the previous ones
+        self._path_alias_trie = PathAliasTrie(self._path_import_aliases)
+        self._relative_reference_import_aliases = self.reference_import_aliases
+        self._reference_alias_trie = PathAliasTrie(self._relative_reference_import_aliases)
+        self._translated_import_paths = {}
+
         # Mark that we've precomputed the import aliases
         self._computed_path_import_aliases = True
 
@@ -261,48 +275,52 @@ class TSConfig:
         if self._import_optimization_enabled and not import_path.startswith("@") and not import_path.startswith("~"):
             return import_path
 
-        # Step 1: Try to resolve with import_resolution_overrides
-        if self.config_file.ctx.config.import_resolution_overrides:
-            if path_check := TSConfig._find_matching_path(frozenset(self.config_file.ctx.config.import_resolution_overrides.keys()), import_path):
-                to_base = self.config_file.ctx.config.import_resolution_overrides[path_check]
-
-                # Get the remaining path after the matching prefix
-                remaining_path = import_path[len(path_check) :].lstrip("/")
-
-                # Join the path together
-                import_path = os.path.join(to_base, remaining_path)
+        # The overrides are part of the codebase config, recompile them if they were changed
+        overrides = self.config_file.ctx.config.import_resolution_overrides
+        if overrides != self._overrides:
+            self._overrides = dict(overrides)
+            self._override_alias_trie = PathAliasTrie(self._overrides)
+            self._translated_import_paths = {}
 
-                return import_path
+        if (ret := self._translated_import_paths.get(import_path)) is None:
+            ret = self._translated_import_paths[import_path] = self._translate_import_path(import_path)
+        return ret
 
-        # Step 2: Keep traveling down the parent config paths until we find a match a reference_import_aliases
-        if path_check := TSConfig._find_matching_path(frozenset(self.reference_import_aliases.keys()), import_path):
-            # TODO: This assumes that there is only one to_base path for the given from_base path
-            to_base = self.reference_import_aliases[path_check][0]
+    def _translate_import_path(self, import_path: str) -> str:
+        # Step 1: Try to resolve with import_resolution_overrides
+        if path_check := self._override_alias_trie.find_longest_match(import_path):
+            to_base = self._overrides[path_check]
 
             # Get the remaining path after the matching prefix
             remaining_path = import_path[len(path_check) :].lstrip("/")
 
             # Join the path together
-            import_path = os.path.join(to_base, remaining_path)
-
-            return import_path
+            return os.path.join(to_base, remaining_path)
 
+        # Step 2: Keep traveling down the parent config paths until we find a match a reference_import_aliases
         # Step 3: Keep traveling down the parent config paths until we find a match a path_import_aliases
-        if path_check := TSConfig._find_matching_path(frozenset(self.path_import_aliases.keys()), import_path):
-            # TODO: This assumes that there is only one to_base path for the given from_base path
-            to_base = self.path_import_aliases[path_check][0]
+        for alias_trie, aliases in ((self._reference_alias_trie, self._relative_reference_import_aliases), (self._path_alias_trie, self._path_import_aliases)):
+            if path_check := alias_trie.find_longest_match(import_path):
+                # TODO: This assumes that there is only one to_base path for the given from_base path
+                to_base = aliases[path_check][0]
 
-            # Get the remaining path after the matching prefix
-            remaining_path = import_path[len(path_check) :].lstrip("/")
-
-            # Join the path together
-            import_path = os.path.join(to_base, remaining_path)
+                # Get the remaining path after the matching prefix
+                remaining_path = import_path[len(path_check) :].lstrip("/")
 
-            return import_path
+                # Join the path together
+                return os.path.join(to_base, remaining_path)
 
         # Step 4: Try to resolve with base path for non-relative imports
         return self.resolve_base_url(import_path)
 
+    def _import_translation_key(self) -> tuple:
+        """The values translate_import_path depends on, configs with equal keys translate import paths the same way"""
+        config = self
+        while config is not None and not config._self_base_url:
+            config = config.base_config
+        base_url = None if config is None else (config.config_file.path.parent, config._self_base_url)
+        return self._path_import_aliases, self._relative_reference_import_aliases, self._import_optimization_enabled, base_url
+
     def translate_absolute_path(self, absolute_path: str) -> str:
         """Translates an absolute path to an import path using the tsconfig paths.
 
@@ -347,22 +365,6 @@ class TSConfig:
         else:
             return import_path
 
-    @staticmethod
-    @cache
-    def _find_matching_path(path_import_aliases: set[str], path_check: str):
-        """Recursively find the longest matching path in path_import_aliases."""
-        # Base case
-        if not path_check or path_check == "/":
-            return None
-
-        # Recursive case
-        if path_check in path_import_aliases:
-            return path_check
-        elif f"{path_check}/" in path_import_aliases:
-            return f"{path_check}/"
-        else:
-            return TSConfig._find_matching_path(path_import_aliases, os.path.dirname(path_check))
-
     @property
     def base_config(self) -> "TSConfig | None":
         """Returns the base TSConfig that this config inherits from.
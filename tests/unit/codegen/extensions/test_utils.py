@@ -1,8 +1,10 @@
+import gc
+import weakref
 from threading import Event
 
 import pytest
 
-from codegen.sdk.extensions.utils import lru_cache, uncache_all
+from codegen.sdk.extensions.utils import cached_property, forget_file, lru_cache, uncache_all, uncache_files, uncache_recent
 
 
 def test_lru_cache_with_uncache_all():
@@ -41,3 +43,55 @@ def test_lru_cache_args_with_uncache_all():
     for idx in range(2):
         with pytest.raises(AssertionError):
             cached_function(idx)
+
+
+class Node:
+    def __init__(self, file_node_id):
+        self.file_node_id = file_node_id
+
+    @cached_property
+    def value(self):
+        return object()
+
+
+def test_cached_property_uncache_files():
+    first, second, detached = Node(1), Node(2), Node(None)
+    values = [node.value for node in (first, second, detached)]
+
+    uncache_files([1, None])
+
+    assert first.value is not values[0]
+    assert second.value is values[1]
+    assert detached.value is not values[2]
+
+
+def test_cached_property_uncache_recent():
+    first, second = Node(1), Node(2)
+    value = first.value
+    uncache_files([])
+    second_value = second.value
+
+    uncache_recent()
+
+    assert first.value is value
+    assert second.value is not second_value
+
+
+def test_cached_property_does_not_keep_instances_alive():
+    node = Node(1)
+    node.value
+    ref = weakref.ref(node)
+    del node
+    gc.collect()
+    assert ref() is None
+
+
+def test_cached_property_forget_file():
+    removed, other = Node(1), Node(2)
+    values = [node.value for node in (removed, other)]
+
+    forget_file(1)
+    forget_file(3)
+
+    assert removed.value is not values[0]
+    assert other.value is values[1]
@@ -2,9 +2,11 @@
 
 import itertools
 
+import pytest
+
 from codegen.sdk.codebase.codebase_context import CodebaseContext
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
-from codegen.sdk.enums import EdgeType
+from codegen.sdk.enums import EdgeType, NodeType, SymbolType
 
 
 def test_codebase_with_wrapper(tmpdir) -> None:
@@ -95,3 +97,59 @@ class MySubClass(MyClass):
         assert len(import_resolution_edges) == 4
         assert len(file_contains_node_edges) == 14
         assert len(symbol_usage_edges) == 6
+
+
+def test_node_type_index_matches_graph(tmpdir) -> None:
+    files = {
+        "a.py": "import os\n\nclass A:\n    def method(self):\n        pass\n\ndef foo():\n    return os.getcwd()\n",
+        "b.py": "from a import A, foo\n\nx = foo()\n\nclass B(A):\n    pass\n",
+    }
+
+    def assert_index_matches(ctx: CodebaseContext) -> None:
+        for node_type in NodeType:
+            assert ctx.get_nodes(node_type) == [ctx.get_node(node_id) for node_id in ctx._graph.filter_nodes(lambda node: node.node_type == node_type)]
+        for symbol_type in SymbolType:
+            assert ctx.get_nodes(symbol_type=symbol_type) == [node for node in ctx.get_nodes(NodeType.SYMBOL) if node.symbol_type == symbol_type]
+        assert ctx.get_nodes(exclude_type=NodeType.SYMBOL) == [node for node in ctx.nodes if node.node_type != NodeType.SYMBOL]
+
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        assert_index_matches(codebase.ctx)
+        assert [cls.name for cls in codebase.classes] == ["A", "B"]
+        assert [func.name for func in codebase.functions] == ["foo"]
+        assert [var.name for var in codebase.global_vars] == ["x"]
+
+        codebase.get_file("a.py").get_function("foo").remove()
+        codebase.create_file("c.py", "def bar():\n    pass\n")
+        codebase.commit()
+        assert_index_matches(codebase.ctx)
+        assert sorted(func.name for func in codebase.functions) == ["bar"]
+
+        codebase.get_file("b.py").remove()
+        codebase.commit()
+        assert_index_matches(codebase.ctx)
+        assert [cls.name for cls in codebase.classes] == ["A"]
+
+
+def test_symbol_name_index(tmpdir) -> None:
+    files = {
+        "a.py": "def foo():\n    pass\n\nclass A:\n    def foo(self):\n        pass\n",
+        "b.py": "def foo():\n    pass\n\nbar = 1\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        assert [symbol.file.filepath for symbol in codebase.get_symbols("foo")] == ["a.py", "b.py"]
+        assert codebase.has_symbol("bar")
+        assert not codebase.has_symbol("method")
+        assert codebase.get_class("A").name == "A"
+        assert codebase.get_class("bar", optional=True) is None
+        with pytest.raises(ValueError, match="ambiguous"):
+            codebase.get_function("foo")
+
+        codebase.get_file("b.py").get_function("foo").rename("baz")
+        codebase.commit()
+        assert codebase.get_function("foo").file.filepath == "a.py"
+        assert codebase.get_symbol("baz").file.filepath == "b.py"
+
+        codebase.get_file("a.py").remove()
+        codebase.commit()
+        assert codebase.get_symbols("foo") == []
+        assert codebase.get_symbol("A", optional=True) is None
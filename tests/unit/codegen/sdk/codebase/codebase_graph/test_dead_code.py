@@ -0,0 +1,115 @@
+from codegen.sdk.codebase.dead_code import find_dead_code, is_entry_point
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+# language=python
+FILES = {
+    "app/main.py": """
+from app.service import serve
+
+if __name__ == "__main__":
+    serve()
+""",
+    "app/service.py": """
+import os
+from app.util import helper
+
+class Handler:
+    def handle(self):
+        return helper()
+
+def serve():
+    return Handler().handle()
+
+def unused():
+    return os.getcwd()
+""",
+    "app/util.py": """
+def helper():
+    return 1
+
+def _private():
+    return 2
+""",
+    "app/orphan.py": """
+def lonely():
+    return 3
+""",
+    "lib/api.py": """
+__all__ = ["public"]
+
+def public():
+    return _impl()
+
+def _impl():
+    return 4
+
+def hidden():
+    return 5
+""",
+    "tests/test_util.py": """
+from app.util import _private
+
+def test_private():
+    assert _private() == 2
+""",
+}
+
+
+def test_find_dead_code(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES) as codebase:
+        report = find_dead_code(codebase)
+        assert [(symbol.filepath, symbol.name) for symbol in report.symbols] == [("app/orphan.py", "lonely"), ("app/service.py", "unused"), ("lib/api.py", "hidden")]
+        assert [imp.name for imp in report.imports] == ["os"]
+        assert [file.filepath for file in report.files] == ["app/orphan.py"]
+
+
+def test_find_dead_code_checkout_under_tests(tmpdir) -> None:
+    # Directories above the repository don't make its files tests
+    with get_codebase_session(tmpdir=tmpdir / "tests" / "repo", files=FILES) as codebase:
+        report = codebase.find_dead_code()
+        assert [(symbol.filepath, symbol.name) for symbol in report.symbols] == [("app/orphan.py", "lonely"), ("app/service.py", "unused"), ("lib/api.py", "hidden")]
+        assert [file.filepath for file in report.files] == ["app/orphan.py"]
+
+
+def test_find_dead_code_roots(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES) as codebase:
+        report = find_dead_code(codebase, [codebase.get_function("lonely")], tests=False, dunder_all=False)
+        assert [(symbol.filepath, symbol.name) for symbol in report.symbols] == [
+            ("app/service.py", "unused"),
+            ("app/util.py", "_private"),
+            ("lib/api.py", "__all__"),
+            ("lib/api.py", "public"),
+            ("lib/api.py", "_impl"),
+            ("lib/api.py", "hidden"),
+            ("tests/test_util.py", "test_private"),
+        ]
+        assert [file.filepath for file in report.files] == ["lib/api.py", "tests/test_util.py"]
+
+        report = find_dead_code(codebase, entry_points=False, exported=False, tests=False, dunder_all=False)
+        assert len(report.files) == len(FILES)
+
+
+def test_find_dead_code_typescript(tmpdir) -> None:
+    files = {
+        "src/index.ts": "export { used } from './lib';\n",
+        "src/lib.ts": "import { dep } from './dep';\n\nexport function used() {\n    return dep();\n}\n\nexport function notUsed() {\n    return 1;\n}\n",
+        "src/dep.ts": "export function dep() {\n    return 2;\n}\n",
+        "src/lib.test.ts": "import { notUsed } from './lib';\n\nnotUsed();\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files, programming_language=ProgrammingLanguage.TYPESCRIPT) as codebase:
+        assert find_dead_code(codebase).symbols == []
+        report = find_dead_code(codebase, tests=False)
+        assert [symbol.name for symbol in report.symbols] == ["notUsed"]
+        assert [file.filepath for file in report.files] == ["src/lib.test.ts"]
+
+
+def test_is_entry_point(tmpdir) -> None:
+    files = {
+        "script.py": 'def run():\n    pass\n\nif "__main__" == __name__:\n    run()\n',
+        "mentions.py": '# Not run as a script even though __name__ and "__main__" appear here\ndef run():\n    return __name__\n',
+        "nested.py": 'def run():\n    if __name__ == "__main__":\n        pass\n',
+        "pkg/__main__.py": "x = 1\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        assert [file.filepath for file in codebase.files if is_entry_point(file)] == ["pkg/__main__.py", "script.py"]
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+
+FILES = {
+    "a.py": "def foo(x):\n    return 1\n\n\nclass A:\n    def method(self):\n        return 2\n",
+    "b.py": "from a import foo, A\n\ndef bar():\n    return foo(1) + A().method()\n",
+    "c.py": "import a\n\ndef baz():\n    return a.foo(2)\n",
+}
+
+
+def _resolved_files(codebase):
+    resolved = set()
+    resolve_imports = codebase.ctx._resolve_imports
+
+    def spy(to_resolve):
+        resolved.update(node.filepath for node in to_resolve)
+        return resolve_imports(to_resolve)
+
+    return resolved, patch.object(codebase.ctx, "_resolve_imports", side_effect=spy)
+
+
+def _usages(codebase) -> dict[str, set[str]]:
+    a = codebase.get_file("a.py")
+    return {symbol.name: {usage.usage_symbol.name for usage in symbol.usages} for symbol in (a.get_function("foo"), a.get_class("A"), a.get_class("A").get_method("method"))}
+
+
+def test_body_edit_does_not_propagate(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES) as codebase:
+        expected = _usages(codebase)
+        dependencies = codebase.get_function("bar").dependencies
+        codebase.get_file("a.py").get_function("foo").code_block.statements[0].edit("y = x + 1\n    return y")
+        codebase.get_file("a.py").get_class("A").get_method("method").code_block.statements[0].edit("return 3")
+        resolved, spy = _resolved_files(codebase)
+        with spy:
+            codebase.commit()
+        assert resolved == {"a.py"}
+        assert _usages(codebase) == expected
+        assert codebase.get_function("bar").dependencies == dependencies
+
+
+def test_interface_change_propagates(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES) as codebase:
+        codebase.get_file("a.py").get_function("foo").set_return_type("int")
+        resolved, spy = _resolved_files(codebase)
+        with spy:
+            codebase.commit()
+        # Only the files using `foo` are resolved again, `A` is unchanged
+        assert resolved == {"a.py", "b.py", "c.py"}
+        assert _usages(codebase) == {"foo": {"foo", "bar", "baz"}, "A": {"A", "bar"}, "method": {"bar"}}
+
+
+def test_removed_symbol_propagates(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES) as codebase:
+        codebase.get_file("a.py").get_class("A").remove()
+        codebase.commit()
+        assert codebase.get_file("b.py").get_import("A").resolved_symbol is None
+        assert {usage.usage_symbol.name for usage in codebase.get_function("foo").usages} == {"foo", "bar", "baz"}
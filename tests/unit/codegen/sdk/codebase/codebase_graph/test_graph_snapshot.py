@@ -0,0 +1,176 @@
+import gzip
+import json
+import os
+import pickle
+import time
+
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.git.schemas.repo_config import RepoConfig
+from codegen.sdk.codebase.config import ProjectConfig, TestFlags
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.graph_snapshot import MAX_SNAPSHOTS, GraphSnapshot
+from codegen.sdk.core.codebase import Codebase
+from codegen.sdk.enums import EdgeType
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+FILES = {
+    "a.py": """
+from b import bar, Base
+
+def foo(x: Base):
+    y = bar()
+    return x.value + y.value
+""",
+    "b.py": """
+from c import Base
+import os
+
+def bar():
+    os.getcwd()
+    return Base()
+""",
+    "c.py": """
+class Base:
+    value: int = 1
+
+class Child(Base):
+    def method(self):
+        return self.value
+""",
+    "d.py": """
+import a
+from c import Child
+
+a.foo(Child())
+""",
+}
+
+
+def _node_key(node) -> tuple:
+    return type(node).__name__, getattr(node, "filepath", None), getattr(node, "name", None), node.range if hasattr(node, "ts_node") else None
+
+
+def _graph_signature(codebase) -> list:
+    edges = []
+    for u, v, edge in codebase.ctx.edges:
+        usage = None
+        if (u_ := edge.usage) is not None:
+            usage = (type(u_.match).__name__, u_.match.range, _node_key(u_.usage_symbol), u_.imported_by and _node_key(u_.imported_by), u_.usage_type, u_.kind)
+        edges.append((_node_key(codebase.ctx.get_node(u)), _node_key(codebase.ctx.get_node(v)), edge.type, usage))
+    return sorted(edges, key=repr)
+
+
+def test_graph_snapshot_unchanged(tmpdir) -> None:
+    config = TestFlags.model_copy(update=dict(graph_snapshot_dir=str(tmpdir / "snapshots")))
+    with get_codebase_session(tmpdir=tmpdir / "repo", files=FILES, config=config) as codebase:
+        expected = _graph_signature(codebase)
+        commit = codebase.ctx.projects[0].repo_operator.head_commit.hexsha
+        assert any(edge.type == EdgeType.SYMBOL_USAGE for _, _, edge in codebase.ctx.edges)
+    snapshots = list((tmpdir / "snapshots").listdir())
+    assert len(snapshots) == 1
+    assert snapshots[0].basename.startswith(commit)
+
+    with get_codebase_session(tmpdir=tmpdir / "repo", files=FILES, config=config) as codebase:
+        assert _graph_signature(codebase) == expected
+        base = codebase.get_class("Base")
+        assert {usage.match.source for usage in base.usages} >= {"Base"}
+
+
+def _build(repo_path, config) -> Codebase:
+    op = RepoOperator(repo_config=RepoConfig.from_repo_path(str(repo_path)))
+    return Codebase(projects=[ProjectConfig(repo_operator=op, programming_language=ProgrammingLanguage.PYTHON)], config=config)
+
+
+def test_graph_snapshot_changed_file(tmpdir) -> None:
+    config = TestFlags.model_copy(update=dict(graph_snapshot_dir=str(tmpdir / "snapshots")))
+    with get_codebase_session(tmpdir=tmpdir / "repo", files=FILES, config=config):
+        pass
+
+    changed = FILES | {"b.py": FILES["b.py"].replace("return Base()", "return Base().value")}
+    with get_codebase_session(tmpdir=tmpdir / "fresh", files=changed) as codebase:
+        expected = _graph_signature(codebase)
+    # Rewrite the file without committing, the snapshot of the same commit only applies to the unchanged files
+    (tmpdir / "repo" / "b.py").write(changed["b.py"])
+    assert _graph_signature(_build(tmpdir / "repo", config)) == expected
+
+
+def test_graph_snapshot_ancestor_commit(tmpdir) -> None:
+    config = TestFlags.model_copy(update=dict(graph_snapshot_dir=str(tmpdir / "snapshots")))
+    with get_codebase_session(tmpdir=tmpdir / "repo", files=FILES | {"e.py": "from f import g\n"}, config=config) as codebase:
+        base_commit = codebase.ctx.projects[0].repo_operator.head_commit.hexsha
+
+    # An added file changes what the imports of unchanged files resolve to
+    changed = FILES | {"b.py": FILES["b.py"].replace("return Base()", "return Base().value"), "e.py": "from f import g\n", "f.py": "def g():\n    pass\n"}
+    with get_codebase_session(tmpdir=tmpdir / "fresh", files=changed) as codebase:
+        expected = _graph_signature(codebase)
+    (tmpdir / "repo" / "b.py").write(changed["b.py"])
+    (tmpdir / "repo" / "f.py").write(changed["f.py"])
+    op = RepoOperator(repo_config=RepoConfig.from_repo_path(str(tmpdir / "repo")))
+    op.stage_and_commit_all_changes("change b, add f")
+    op.stage_and_commit_all_changes("empty")
+    head_commit = op.head_commit.hexsha
+    assert head_commit != base_commit
+
+    assert _graph_signature(_build(tmpdir / "repo", config)) == expected
+    assert sorted(path.basename.split("-")[0] for path in (tmpdir / "snapshots").listdir()) == sorted([base_commit, head_commit])
+
+
+def test_graph_snapshot_shared_external_module(tmpdir) -> None:
+    config = TestFlags.model_copy(update=dict(graph_snapshot_dir=str(tmpdir / "snapshots")))
+    files = {"a.py": "import os\nimport z\n", "b.py": "import os\n", "z.py": "x = 1\n"}
+    with get_codebase_session(tmpdir=tmpdir / "repo", files=files, config=config):
+        pass
+
+    changed = files | {"z.py": "x = 2\n"}
+    with get_codebase_session(tmpdir=tmpdir / "fresh", files=changed) as codebase:
+        expected = _graph_signature(codebase)
+    # a.py is resolved again since it imports z, b.py still points to the external module created by the import of a.py
+    (tmpdir / "repo" / "z.py").write(changed["z.py"])
+    assert _graph_signature(_build(tmpdir / "repo", config)) == expected
+
+
+def test_graph_snapshot_invalid(tmpdir) -> None:
+    snapshot = GraphSnapshot(commit="abc", key="key", files={"a.py": "hash"}, external_modules=[("a.py", 0)], edges=[(("a.py", 0), (None, 0), EdgeType.IMPORT_SYMBOL_RESOLUTION.value)])
+    path = snapshot.save(tmpdir)
+    assert GraphSnapshot.load(tmpdir, "abc", "key") == snapshot
+
+    data = snapshot.to_json()
+    for invalid in (
+        data | {"version": 1},
+        data | {"files": {"a.py": 1}},
+        data | {"edges": [[["a.py", 0], [None, 1], EdgeType.IMPORT_SYMBOL_RESOLUTION.value]]},
+        data | {"edges": [[["a.py", 0], ["b.py", 0], EdgeType.SYMBOL_USAGE.value]]},
+        data | {"external_modules": [[None, 0]]},
+    ):
+        with gzip.open(path, "wt") as f:
+            json.dump(invalid, f)
+        assert GraphSnapshot.load(tmpdir, "abc", "key") is None
+    # Snapshots are never unpickled
+    path.write_bytes(pickle.dumps(snapshot))
+    assert GraphSnapshot.load(tmpdir, "abc", "key") is None
+
+
+def test_graph_snapshot_prune(tmpdir) -> None:
+    commits = [f"{idx:040}" for idx in range(MAX_SNAPSHOTS + 2)]
+    for idx, commit in enumerate(commits):
+        mtime = time.time() - 1000 + idx
+        os.utime(GraphSnapshot(commit=commit, key="key").save(tmpdir), (mtime, mtime))
+    GraphSnapshot(commit="other", key="other").save(tmpdir)
+    legacy = tmpdir / f"{commits[0]}-key.pickle"
+    legacy.write("")
+    os.utime(legacy, (0, 0))
+    assert sorted(path.basename.split("-")[0] for path in tmpdir.listdir()) == sorted([*commits[2:], commits[0], "other"])
+
+    # Loading a snapshot marks it as recently used. Snapshots of other keys are only deleted once unused for too long,
+    # like legacy snapshots.
+    assert GraphSnapshot.load(tmpdir, commits[2], "key") is not None
+    GraphSnapshot(commit="new", key="key").save(tmpdir)
+    assert sorted(path.basename.split("-")[0] for path in tmpdir.listdir()) == sorted([commits[2], *commits[4:], "new", "other"])
+
+
+def test_graph_snapshot_mismatched_key(tmpdir) -> None:
+    snapshot = GraphSnapshot(commit="abc", key="key")
+    snapshot.save(tmpdir)
+    assert GraphSnapshot.load(tmpdir, "abc", "key") == snapshot
+    assert GraphSnapshot.load(tmpdir, "abc", "other") is None
+    assert GraphSnapshot.load(tmpdir, "def", "key") is None
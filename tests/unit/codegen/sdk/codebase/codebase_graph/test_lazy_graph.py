@@ -0,0 +1,113 @@
+from pathlib import Path
+
+from codegen.sdk.codebase.config import TestFlags
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.lazy_graph import LazyGraphState
+
+LazyFlags = TestFlags.model_copy(update=dict(exp_lazy_graph=True, track_graph=False, verify_graph=False))
+
+FILES = {
+    "app.py": """
+from models import User
+
+def main():
+    return User().greet()
+""",
+    "models.py": """
+from base import Base
+
+class User(Base):
+    def greet(self):
+        return "hello"
+""",
+    "base.py": """
+class Base:
+    pass
+""",
+    "admin.py": """
+import models as m
+
+def make_admin():
+    return m.User()
+""",
+    "unrelated.py": """
+def helper():
+    return 1
+""",
+}
+
+
+def _signature(symbol):
+    return (
+        sorted((usage.usage_symbol.filepath, usage.match.source, usage.usage_type) for usage in symbol.usages),
+        sorted((dep.filepath, dep.name) for dep in symbol.dependencies),
+    )
+
+
+def _parsed(codebase) -> set[str]:
+    return set(codebase.ctx.filepath_idx)
+
+
+def test_lazy_graph_parses_accessed_files(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES, config=LazyFlags, verify_input=False, verify_output=False) as codebase:
+        assert _parsed(codebase) == set()
+        assert codebase.get_directory("").file_names
+
+        app = codebase.get_file("app.py")
+        # The imported files are parsed to resolve the imports
+        assert {"app.py", "models.py"} <= _parsed(codebase)
+        assert {"admin.py", "unrelated.py"}.isdisjoint(_parsed(codebase))
+        assert [dep.name for dep in app.get_function("main").dependencies] == ["User"]
+
+        user = codebase.get_class("User")
+        assert {usage.usage_symbol.filepath for usage in user.usages} == {"admin.py", "app.py"}
+        assert [subclass.name for subclass in codebase.get_class("Base").subclasses] == ["User"]
+        assert "unrelated.py" not in _parsed(codebase)
+
+
+def test_lazy_graph_matches_eager(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir / "eager", files=FILES, verify_input=False) as eager:
+        expected = {(file.filepath, symbol.name): _signature(symbol) for file in eager.files for symbol in file.symbols}
+    with get_codebase_session(tmpdir=tmpdir / "lazy", files=FILES, config=LazyFlags, verify_input=False, verify_output=False) as lazy:
+        for filepath, name in expected:
+            assert _signature(lazy.get_file(filepath).get_symbol(name)) == expected[filepath, name]
+        assert len(lazy.files) == len(FILES)
+
+
+def test_lazy_graph_sync(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES, config=LazyFlags, verify_input=False, verify_output=False) as codebase:
+        codebase.get_file("app.py").get_function("main").rename("run")
+        codebase.create_file("cli.py", "from models import User\n\nUser()\n")
+        codebase.commit()
+        assert "unrelated.py" not in _parsed(codebase)
+
+        assert codebase.get_function("run") is not None
+        assert codebase.get_symbol("main", optional=True) is None
+        user = codebase.get_class("User")
+        assert {usage.usage_symbol.filepath for usage in user.usages} == {"admin.py", "app.py", "cli.py"}
+
+
+def test_lazy_graph_state_files_mentioning() -> None:
+    contents = {file_path: content.encode() for file_path, content in FILES.items()}
+    contents["my-module.ts"] = b"import { x } from './my-module';\n"
+    reads = []
+    state = LazyGraphState()
+    state.unparsed.update((file_path, Path(file_path)) for file_path in contents)
+
+    def read_bytes(file_path: str) -> bytes:
+        reads.append(file_path)
+        return contents[file_path]
+
+    assert state.files_mentioning({"models"}, read_bytes) == ["admin.py", "app.py"]
+    assert state.files_mentioning({"User", "Base"}, read_bytes) == ["admin.py", "app.py", "base.py", "models.py"]
+    assert state.files_mentioning({"my-module"}, read_bytes) == ["my-module.ts"]
+    # The files are read once for every lookup of the session
+    assert sorted(reads) == sorted(contents)
+
+    del state.unparsed["app.py"]
+    del state.unparsed["models.py"]
+    state.mark_parsed("models.py")
+    assert state.files_mentioning({"models"}, read_bytes) == ["admin.py"]
+    state.reset_session()
+    assert state.files_mentioning({"helper"}, read_bytes) == ["unrelated.py"]
+    assert len(reads) == 2 * len(contents) - 1
@@ -0,0 +1,91 @@
+import pytest
+
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.sdk.codebase.config import TestFlags
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.io.file_io import FileIO
+from codegen.sdk.enums import EdgeType
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+FILES = {
+    "a.py": """
+from b import bar
+
+def foo():
+    return bar()
+""",
+    "b.py": """
+from c import Base
+
+def bar():
+    return Base()
+""",
+    "c.py": """
+class Base:
+    pass
+
+class Child(Base):
+    pass
+""",
+    "d.py": """
+import a
+
+a.foo()
+""",
+}
+
+
+def _node_key(node) -> tuple:
+    return node.node_id, type(node).__name__, getattr(node, "filepath", None), getattr(node, "name", None)
+
+
+def _graph_signature(codebase):
+    nodes = [_node_key(node) for node in codebase.ctx.nodes]
+    edges = sorted((u, v, edge.type) for u, v, edge in codebase.ctx.edges)
+    return nodes, edges
+
+
+def test_parallel_parse_matches_serial(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir / "serial", files=FILES) as codebase:
+        serial = _graph_signature(codebase)
+
+    config = TestFlags.model_copy(update=dict(parse_workers=4))
+    with get_codebase_session(tmpdir=tmpdir / "parallel", files=FILES, config=config) as codebase:
+        assert _graph_signature(codebase) == serial
+        assert len(codebase.files) == 4
+        assert any(edge.type == EdgeType.SYMBOL_USAGE for _, _, edge in codebase.ctx.edges)
+
+
+def test_parallel_parse_typescript(tmpdir) -> None:
+    files = {
+        "a.ts": "import { bar } from './b';\nexport function foo() { return bar(); }\n",
+        "b.tsx": "export function bar() { return <div />; }\n",
+    }
+    config = TestFlags.model_copy(update=dict(parse_workers=2))
+    with get_codebase_session(tmpdir=tmpdir, files=files, programming_language=ProgrammingLanguage.TYPESCRIPT, config=config) as codebase:
+        bar = codebase.get_function("bar")
+        assert len(bar.usages) > 0
+        assert codebase.get_file("b.tsx").ts_node.has_error is False
+
+
+@pytest.mark.parametrize("parse_workers", [1, 4])
+def test_build_reads_files_once(tmpdir, parse_workers) -> None:
+    read_paths = []
+    read_bytes = FileIO.read_bytes
+    get_file = RepoOperator.get_file
+
+    def record_read_bytes(self, path):
+        read_paths.append(path)
+        return read_bytes(self, path)
+
+    def record_get_file(self, path):
+        read_paths.append(path)
+        return get_file(self, path)
+
+    config = TestFlags.model_copy(update=dict(parse_workers=parse_workers))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(FileIO, "read_bytes", record_read_bytes)
+        mp.setattr(RepoOperator, "get_file", record_get_file)
+        with get_codebase_session(tmpdir=tmpdir, files=FILES, config=config, verify_input=False) as codebase:
+            assert sorted(path.name for path in read_paths) == sorted(FILES)
+            assert len(codebase.files) == 4
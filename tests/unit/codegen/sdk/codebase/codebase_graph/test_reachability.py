@@ -0,0 +1,105 @@
+import rustworkx as rx
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.reachability import ReachabilityIndex
+from codegen.sdk.enums import Edge, EdgeType
+
+
+def _diamonds(num_diamonds: int) -> rx.PyDiGraph:
+    """A chain of diamonds 0 -> (1, 2) -> 3 -> (4, 5) -> 6 -> ..."""
+    graph = rx.PyDiGraph()
+    graph.add_nodes_from(range(3 * num_diamonds + 1))
+    for idx in range(num_diamonds):
+        top = 3 * idx
+        for u, v in ((top, top + 1), (top, top + 2), (top + 1, top + 3), (top + 2, top + 3)):
+            graph.add_edge(u, v, Edge(EdgeType.SYMBOL_USAGE, None))
+    return graph
+
+
+def test_reachable_visits_each_edge_once() -> None:
+    graph = _diamonds(30)
+    visited = []
+    out_edges = graph.out_edges
+    graph_proxy = type("GraphProxy", (), {"out_edges": lambda self, n: visited.append(n) or out_edges(n)})()
+    index = ReachabilityIndex()
+    assert sorted(index.get_reachable(graph_proxy, 0, 3, edge_types=[EdgeType.SYMBOL_USAGE])) == list(range(4, 91))
+    assert sorted(visited) == list(range(3, 91))
+
+    # The memoized closure of 3 is reused instead of walking past it again
+    visited.clear()
+    assert sorted(index.get_reachable(graph_proxy, 0, 0, edge_types=[EdgeType.SYMBOL_USAGE])) == list(range(1, 91))
+    assert sorted(visited) == [0, 1, 2]
+    visited.clear()
+    assert sorted(index.get_reachable(graph_proxy, 0, 0, edge_types=[EdgeType.SYMBOL_USAGE])) == list(range(1, 91))
+    assert sorted(index.get_reachable(graph_proxy, 0, 6, edge_types=[EdgeType.SYMBOL_USAGE], max_depth=2)) == [7, 8, 9]
+    assert sorted(visited) == [6, 7, 8]
+
+    assert index.get_reachable(graph_proxy, 0, 0, edge_types=[EdgeType.IMPORT_SYMBOL_RESOLUTION]) == []
+
+
+def test_reachable_reverse_and_generation() -> None:
+    graph = _diamonds(2)
+    index = ReachabilityIndex()
+    assert sorted(index.get_reachable(graph, 0, 6, edge_types=[EdgeType.SYMBOL_USAGE], reverse=True)) == [0, 1, 2, 3, 4, 5]
+    assert sorted(index.get_reachable(graph, 0, 6, edge_types=[EdgeType.SYMBOL_USAGE], reverse=True, max_depth=2)) == [3, 4, 5]
+
+    graph.remove_edge(3, 4)
+    graph.remove_edge(3, 5)
+    assert sorted(index.get_reachable(graph, 0, 6, edge_types=[EdgeType.SYMBOL_USAGE], reverse=True)) == [0, 1, 2, 3, 4, 5]
+    assert sorted(index.get_reachable(graph, 1, 6, edge_types=[EdgeType.SYMBOL_USAGE], reverse=True)) == [4, 5]
+
+
+def test_dependents_and_dependencies(tmpdir) -> None:
+    # language=python
+    content = """
+def base():
+    return 1
+
+def left():
+    return base()
+
+def right():
+    return base()
+
+def top():
+    return left() + right()
+
+def unrelated():
+    return 2
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        base = codebase.get_function("base")
+        top = codebase.get_function("top")
+        assert [symbol.name for symbol in base.dependents] == ["left", "right", "top"]
+        assert [symbol.name for symbol in base.dependents(max_depth=1)] == ["left", "right"]
+        assert top.dependents == []
+        assert [symbol.name for symbol in top.dependencies(max_depth=3)] == ["base", "left", "right"]
+        assert [symbol.name for symbol in top.dependencies(max_depth=1)] == ["left", "right"]
+
+        codebase.get_function("right").edit("def right():\n    return 3")
+        codebase.commit()
+        base = codebase.get_function("base")
+        assert [symbol.name for symbol in base.dependents] == ["left", "top"]
+
+
+def test_reachable_after_graph_update(tmpdir) -> None:
+    # language=python
+    content = """
+def base():
+    return 1
+
+def top():
+    return base()
+
+def other():
+    return 2
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        ctx = codebase.ctx
+        base, top, other = (codebase.get_function(name) for name in ("base", "top", "other"))
+        assert ctx.get_reachable(top.node_id) == [base.node_id]
+        # Graph changes made outside of a sync invalidate the memoized closures too
+        ctx.add_edge(base.node_id, other.node_id, EdgeType.SYMBOL_USAGE)
+        assert sorted(ctx.get_reachable(top.node_id)) == sorted([base.node_id, other.node_id])
+        ctx.remove_edge(base.node_id, other.node_id)
+        assert ctx.get_reachable(top.node_id) == [base.node_id]
@@ -0,0 +1,41 @@
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+
+
+def test_sync_only_uncaches_dependent_files(tmpdir) -> None:
+    files = {
+        "a.py": "def foo():\n    return 1\n",
+        "b.py": "from a import foo\n\ndef bar():\n    return foo()\n",
+        "c.py": "def baz():\n    return 2\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        bar = codebase.get_function("bar")
+        baz = codebase.get_function("baz")
+        assert [dep.name for dep in bar.dependencies] == ["foo"]
+        assert baz.usages == []
+        assert "dependencies" in bar.__dict__
+        assert "usages" in baz.__dict__
+
+        codebase.get_file("a.py").insert_after("\n\ndef other():\n    return foo()\n", newline=False)
+        codebase.commit()
+
+        assert "dependencies" not in bar.__dict__
+        assert "usages" in baz.__dict__
+        foo = codebase.get_function("foo")
+        assert {usage.usage_symbol.name for usage in foo.usages} == {"foo", "bar", "other"}
+
+
+def test_sync_uncaches_files_used_through_new_edges(tmpdir) -> None:
+    files = {
+        "a.py": "def foo():\n    return 1\n",
+        "c.py": "def baz():\n    return 2\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        baz = codebase.get_function("baz")
+        assert baz.usages == []
+
+        # a.py only uses c.py after the edit, so the walk over the edges before the sync can't find it
+        codebase.get_file("a.py").edit("from c import baz\n\ndef foo():\n    return baz()\n")
+        codebase.commit()
+
+        assert "usages" not in baz.__dict__
+        assert {usage.usage_symbol.name for usage in baz.usages} == {"baz", "foo"}
@@ -0,0 +1,38 @@
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.enums import EdgeType
+
+# language=python
+CONTENT = """
+from other import helper
+
+def a():
+    return b() + helper()
+
+def b():
+    return c()
+
+def c():
+    return 1
+"""
+
+
+def _edges(subgraph) -> set[tuple[str, str, EdgeType]]:
+    return {(subgraph[u].name, subgraph[v].name, edge.type) for u, v, edge in subgraph.weighted_edge_list()}
+
+
+def test_build_subgraph_induced(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": CONTENT, "other.py": "def helper():\n    return 2\n"}) as codebase:
+        ctx = codebase.ctx
+        a, b, c = (codebase.get_function(name) for name in ("a", "b", "c"))
+        subgraph = ctx.build_subgraph([b.node_id, a.node_id])
+        filtered = ctx.build_subgraph([c.node_id, b.node_id, a.node_id, b.node_id], edge_types=[EdgeType.SYMBOL_USAGE])
+        assert [node.name for node in subgraph.nodes()] == ["b", "a"]
+        assert _edges(subgraph) == {("a", "b", EdgeType.SYMBOL_USAGE)}
+        assert [node.name for node in filtered.nodes()] == ["c", "b", "a"]
+        assert _edges(filtered) == {("a", "b", EdgeType.SYMBOL_USAGE), ("b", "c", EdgeType.SYMBOL_USAGE)}
+        assert ctx.build_subgraph([a.node_id, b.node_id], edge_types=[EdgeType.IMPORT_SYMBOL_RESOLUTION]).num_edges() == 0
+
+
+def test_symbols_sorted_topologically(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": CONTENT, "other.py": "def helper():\n    return 2\n"}) as codebase:
+        assert [symbol.name for symbol in codebase.get_file("test.py").symbols_sorted_topologically] == ["a", "b", "c"]
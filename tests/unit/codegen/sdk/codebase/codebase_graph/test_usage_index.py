@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.enums import EdgeType
+
+# language=python
+DEFS = """
+def foo():
+    return 1
+"""
+
+# language=python
+USER = """
+from defs import foo
+
+def a():
+    return foo()
+
+def b():
+    return foo() + foo()
+"""
+
+
+def _sorted_usages(symbol):
+    """Usages of a symbol sorted from scratch, as they were before the usage index"""
+    usages = [edge.usage for _, _, edge in symbol.ctx.in_edges(symbol.node_id) if edge.type == EdgeType.SYMBOL_USAGE]
+    return sorted(dict.fromkeys(usages), key=lambda x: x.match.ts_node.start_byte if x.match else x.usage_symbol.ts_node.start_byte, reverse=True)
+
+
+def test_usages_cached(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"defs.py": DEFS, "user.py": USER}) as codebase:
+        foo = codebase.get_function("foo")
+        usages = foo.usages
+        assert usages == _sorted_usages(foo)
+        assert len(usages) == 4
+        with patch.object(codebase.ctx, "in_edges", side_effect=AssertionError):
+            assert foo.usages == usages
+
+
+def test_usages_updated_incrementally(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"defs.py": DEFS, "user.py": USER}) as codebase:
+        foo = codebase.get_function("foo")
+        assert len(foo.usages) == 4
+        codebase.get_file("user.py").add_symbol_from_source("def c():\n    return foo()\n")
+        codebase.commit()
+        foo = codebase.get_function("foo")
+        assert len(foo.usages) == 5
+        assert foo.usages == _sorted_usages(foo)
+
+        codebase.get_function("b").remove()
+        codebase.commit()
+        foo = codebase.get_function("foo")
+        assert len(foo.usages) == 3
+        assert foo.usages == _sorted_usages(foo)
+        assert {usage.usage_symbol.name for usage in foo.usages} == {"foo", "a", "c"}
@@ -230,3 +230,32 @@ def test_minified_file(tmpdir) -> None:
         # This should match the maximum line length threshold
         file2 = codebase.ctx.get_file("file2.js")
         assert file2 is None
+
+
+def test_find_by_byte_range(tmpdir) -> None:
+    # language=python
+    content = """
+def foo():
+    return 1
+
+
+def bar():
+    return foo()
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        file = codebase.get_file("test.py")
+        foo = file.get_function("foo")
+        bar = file.get_function("bar")
+        # Only the nodes with exactly the range by default
+        assert file.find_by_byte_range(foo.range) == file._range_index.get_all_for_range(foo.range)
+        assert foo in file.find_by_byte_range(foo.range)
+        assert all(node.range == foo.range for node in file.find_by_byte_range(foo.range))
+        assert codebase.find_by_span(bar.span) == file.find_by_byte_range(bar.range)
+
+        found = file.find_by_byte_range(foo.range, overlapping=True)
+        assert foo in found
+        assert bar not in found
+        assert any(node.range != foo.range for node in found)
+        assert all(node.start_byte < foo.end_byte and node.end_byte > foo.start_byte for node in found)
+        assert [node.start_byte for node in found] == sorted(node.start_byte for node in found)
+        assert codebase.find_by_span(bar.span, overlapping=True) == file.find_by_byte_range(bar.range, overlapping=True)
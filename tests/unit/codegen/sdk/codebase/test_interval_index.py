@@ -0,0 +1,71 @@
+import random
+
+from codegen.sdk.codebase.interval_index import IntervalIndex, IntervalTree
+
+
+def test_interval_index_queries() -> None:
+    index = IntervalIndex()
+    index.add(0, 10, 0, "a")
+    index.add(5, 5, 1, "b")
+    index.add(5, 8, 2, "c")
+    index.add(10, 12, 3, "d")
+
+    # Empty intervals strictly inside the range overlap it
+    assert index.overlapping(4, 6) == ["a", "b", "c"]
+    assert index.overlapping(5, 6) == ["a", "c"]
+    assert index.overlapping(10, 11) == ["d"]
+    assert index.containing(5, 7) == ["a", "c"]
+    assert index.containing(5, 5) == ["a", "b", "c"]
+    assert index.at(5) == ["b", "c"]
+    assert index.at(5, 8) == ["c"]
+
+    assert index.remove(0, 10, 0) == "a"
+    assert index.remove(0, 10, 0) is None
+    assert list(index) == ["b", "c", "d"]
+    assert len(index) == 3
+
+
+def test_interval_index_matches_linear_scan() -> None:
+    rng = random.Random(0)
+    index = IntervalIndex(load=4)
+    intervals = {}
+    for key in range(500):
+        start = rng.randint(0, 200)
+        intervals[key] = (start, start + rng.randint(0, 30))
+        index.add(*intervals[key], key, key)
+        if rng.random() < 0.3:
+            removed = rng.choice(list(intervals))
+            assert index.remove(*intervals.pop(removed), removed) == removed
+        if rng.random() < 0.2:
+            # Queries in between updates see the bucket ends updated in place
+            start = rng.randint(0, 240)
+            assert index.overlapping(start, start + 5) == sorted((k for k, (s, e) in intervals.items() if s < start + 5 and e > start), key=lambda k: (*intervals[k], k))
+
+    ordered = sorted(intervals, key=lambda key: (*intervals[key], key))
+    assert list(index) == ordered
+    for _ in range(200):
+        start = rng.randint(0, 240)
+        end = start + rng.randint(0, 20)
+        assert index.overlapping(start, end) == [k for k in ordered if intervals[k][0] < end and intervals[k][1] > start]
+        assert index.containing(start, end) == [k for k in ordered if intervals[k][0] <= start and intervals[k][1] >= end]
+        assert index.at(start) == [k for k in ordered if intervals[k][0] == start]
+
+
+def test_interval_tree_matches_linear_scan() -> None:
+    rng = random.Random(0)
+    intervals = []
+    for key in range(500):
+        start = rng.randint(0, 200)
+        intervals.append((start, start + rng.randint(0, 30), key))
+    tree = IntervalTree(intervals)
+
+    ordered = [key for _, _, key in sorted(intervals, key=lambda interval: interval[:2])]
+    assert list(tree) == ordered
+    assert len(tree) == 500
+    bounds = {key: (start, end) for start, end, key in intervals}
+    for _ in range(200):
+        start = rng.randint(0, 240)
+        end = start + rng.randint(0, 20)
+        assert tree.overlapping(start, end) == [k for k in ordered if bounds[k][0] < end and bounds[k][1] > start]
+        assert tree.containing(start, end) == [k for k in ordered if bounds[k][0] <= start and bounds[k][1] >= end]
+    assert IntervalTree().overlapping(0, 10) == []
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.path_index import PathIndex
+
+
+def test_path_index_conversions(tmp_path) -> None:
+    index = PathIndex(tmp_path)
+    assert index.to_absolute("a/b.py") == tmp_path / "a" / "b.py"
+    assert index.to_absolute(tmp_path / "a" / "../b.py") == tmp_path / "b.py"
+    assert str(index.to_relative("a/b.py")) == "a/b.py"
+    assert str(index.to_relative(tmp_path)) == "."
+    assert index.to_relative("/elsewhere/b.py").is_absolute()
+    assert index.is_subdir("a/b.py")
+    assert not index.is_subdir(tmp_path.parent)
+
+    # Paths are only resolved the first time they are seen
+    with patch("pathlib.Path.resolve", side_effect=AssertionError):
+        assert index.to_absolute("a/b.py") == tmp_path / "a" / "b.py"
+        assert index.is_subdir("a/b.py")
+
+
+def test_path_index_ignore_case(tmp_path) -> None:
+    index = PathIndex(tmp_path)
+    index.add("Dir/File.py")
+    index.add("dir/file.py")
+    assert index.get_ignore_case("DIR/FILE.PY") == tmp_path / "Dir" / "File.py"
+    index.remove("Dir/File.py")
+    assert index.get_ignore_case("DIR/FILE.PY") == tmp_path / "dir" / "file.py"
+    index.clear()
+    assert index.get_ignore_case("dir/file.py") is None
+
+
+def test_path_index_follows_directory_tree(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"Dir/File.py": "x = 1\n", "other.py": "y = 2\n"}) as codebase:
+        assert codebase.get_file("dir/file.py", ignore_case=True).filepath == "Dir/File.py"
+        assert codebase.get_directory("DIR", ignore_case=True).dirpath == "Dir"
+
+        codebase.get_file("Dir/File.py").update_filepath("New/Name.py")
+        codebase.commit()
+        assert codebase.get_file("dir/file.py", ignore_case=True, optional=True) is None
+        assert codebase.get_directory("dir", ignore_case=True, optional=True) is None
+        assert codebase.get_file("new/name.py", ignore_case=True).filepath == "New/Name.py"
+        assert codebase.get_directory("NEW", ignore_case=True).dirpath == "New"
+
+
+def test_path_index_cache_bounded(tmp_path) -> None:
+    index = PathIndex(tmp_path, max_cached_paths=2)
+    for name in ("a.py", "b.py", "a.py", "c.py"):
+        index.to_relative(name)
+    # b.py was the least recently used
+    assert list(index._absolute) == ["a.py", "c.py"]
+    assert list(index._relative) == [tmp_path / "a.py", tmp_path / "c.py"]
+
+    index.add("a.py")
+    index.remove("a.py")
+    assert list(index._absolute) == ["c.py"]
+    assert list(index._relative) == [tmp_path / "c.py"]
@@ -1,12 +1,14 @@
 from os import PathLike
 from pathlib import Path
+from unittest.mock import patch
 
+from codegen.sdk.codebase.diff_lite import ChangeType, ContentEdit, DiffLite
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
 from codegen.sdk.codebase.transaction_manager import (
     TransactionError,
     TransactionManager,
 )
-from codegen.sdk.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction
+from codegen.sdk.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction, apply_edits
 
 
 class MockFile:
@@ -102,6 +104,24 @@ def test_edit_ordering(tmpdir) -> None:
     assert transaction_manager.queued_transactions[FILENAME][4] is t1
 
 
+def test_dequeue_equal_transactions(tmpdir) -> None:
+    FILENAME = Path("filename")
+    transaction_manager = TransactionManager()
+
+    t1 = EditTransaction(start_byte=0, end_byte=5, file=MockFile(FILENAME), new_content="a")
+    t2 = EditTransaction(start_byte=0, end_byte=5, file=MockFile(FILENAME), new_content="a")
+    assert t1 == t2
+    transaction_manager.add_transaction(t1)
+    transaction_manager.add_transaction(t2, dedupe=False, solve_conflicts=False)
+
+    # Transactions are removed by identity, the queue and the range index stay in sync
+    queue = transaction_manager.queued_transactions[FILENAME]
+    transaction_manager._dequeue_transaction(t2, queue)
+    assert len(queue) == 1
+    assert queue[0] is t1
+    assert transaction_manager.get_transactions_at_range(FILENAME, 0, 5)[0] is t1
+
+
 def test_remove_ordering(tmpdir) -> None:
     FILENAME = Path("filename")
 
@@ -665,3 +685,93 @@ def content():
         assert queue[2].new_content == "Ok"
         assert isinstance(queue[3], RemoveTransaction)
         assert isinstance(queue[4], InsertTransaction)
+
+
+def test_apply_edits() -> None:
+    content = b"0123456789"
+    sequential = content
+    # Sorted like transactions, by descending start byte
+    edits = [ContentEdit(8, 8, b"b"), ContentEdit(8, 8, b"a"), ContentEdit(5, 7, b""), ContentEdit(0, 2, b"xyz")]
+    for edit in edits:
+        sequential = sequential[: edit.start_byte] + edit.new_bytes + sequential[edit.old_end_byte :]
+    assert apply_edits(content, edits) == sequential == b"xyz2347ab89"
+
+    overlapping = [ContentEdit(6, 8, b"abcd"), ContentEdit(4, 9, b"")]
+    assert apply_edits(content, overlapping) == b"0123d89"
+
+
+def test_commit_reads_and_writes_once(tmpdir) -> None:
+    FILENAME = "test.py"
+    # language=python
+    CONTENT = """
+def a():
+    return 1
+
+def b():
+    return 2
+
+def c():
+    return 3
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={FILENAME: CONTENT}) as codebase:
+        file = codebase.get_file(FILENAME)
+        for function in file.functions:
+            function.rename(function.name * 2)
+            function.code_block.statements[0].edit("return 0")
+        file.insert_before("import os", newline=True)
+        io = codebase.ctx.io
+        with patch.object(io, "read_bytes", wraps=io.read_bytes) as read_bytes, patch.object(io, "write_bytes", wraps=io.write_bytes) as write_bytes:
+            codebase.ctx.transaction_manager.commit({tmpdir / FILENAME})
+            assert read_bytes.call_count == 1
+            assert write_bytes.call_count == 1
+        codebase.ctx.apply_diffs([DiffLite(ChangeType.Modified, tmpdir / FILENAME)])
+    # language=python
+    assert (
+        file.content
+        == """import os
+
+def aa():
+    return 0
+
+def bb():
+    return 0
+
+def cc():
+    return 0
+"""
+    )
+
+
+def test_conflicts_with_many_transactions(tmpdir) -> None:
+    FILENAME = Path("filename")
+    transaction_manager = TransactionManager()
+    file = MockFile(FILENAME)
+
+    edits = [EditTransaction(start_byte=i, end_byte=i + 1, file=file, new_content="y") for i in range(0, 2000, 2)]
+    for t in edits:
+        transaction_manager.add_transaction(t)
+    assert not transaction_manager.add_transaction(EditTransaction(start_byte=10, end_byte=11, file=file, new_content="y"))
+    assert transaction_manager.get_transactions_at_range(FILENAME, 10, 11) == [edits[5]]
+
+    # A remove spanning several edits replaces them
+    remove = RemoveTransaction(start_byte=9, end_byte=15, file=file)
+    transaction_manager.add_transaction(remove)
+    assert len(transaction_manager.queued_transactions[FILENAME]) == len(edits) - 3 + 1
+    assert transaction_manager.get_transactions_at_range(FILENAME, 10, 11) == []
+    assert transaction_manager.get_transactions_at_range(FILENAME, 9, 15) == [remove]
+
+    # Edits inside the remove are dropped
+    assert transaction_manager.add_transaction(EditTransaction(start_byte=11, end_byte=12, file=file, new_content="y"))
+    assert len(transaction_manager.queued_transactions[FILENAME]) == len(edits) - 2
+
+
+def test_commit_runs_callbacks_after_write(tmpdir) -> None:
+    FILENAME = "test.py"
+    with get_codebase_session(tmpdir=tmpdir, files={FILENAME: "a = 1\nb = 2\n"}) as codebase:
+        file = codebase.get_file(FILENAME)
+        seen = []
+        file.insert_at(0, "# header\n", exec_func=lambda: seen.append(file.content))
+        file.get_global_var("b").edit("b = 3", priority=0)
+        codebase.ctx.transaction_manager.commit({tmpdir / FILENAME})
+        # The callback sees its own edit written, along with the edits applied before it
+        assert seen == ["# header\na = 1\nb = 3\n"]
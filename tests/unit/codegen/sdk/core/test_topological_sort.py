@@ -0,0 +1,37 @@
+import random
+
+import rustworkx as rx
+
+from codegen.sdk.topological_sort import condensation, pseudo_topological_sort
+
+
+def _graph(num_nodes: int, edges: list[tuple[int, int]]) -> rx.PyDiGraph:
+    graph = rx.PyDiGraph()
+    graph.add_nodes_from(range(num_nodes))
+    graph.add_edges_from_no_data(edges)
+    return graph
+
+
+def test_pseudo_topological_sort_with_cycle() -> None:
+    # 0 -> (1 <-> 2) -> 3, 4 is isolated
+    graph = _graph(5, [(0, 1), (1, 2), (2, 1), (2, 3)])
+    order = pseudo_topological_sort(graph)
+    assert sorted(order) == [0, 1, 2, 3, 4]
+    assert order.index(0) < order.index(1) < order.index(3)
+    assert order.index(0) < order.index(2) < order.index(3)
+    assert sorted(map(sorted, pseudo_topological_sort(graph, flatten=False))) == [[0], [1, 2], [3], [4]]
+
+
+def test_pseudo_topological_sort_respects_dependencies() -> None:
+    rng = random.Random(0)
+    edges = [(rng.randrange(200), rng.randrange(200)) for _ in range(400)]
+    graph = _graph(200, edges)
+    scc_graph, node_to_scc = condensation(graph)
+    assert sorted(node for scc_idx in scc_graph.node_indices() for node in scc_graph[scc_idx]) == list(range(200))
+
+    order = pseudo_topological_sort(graph)
+    assert sorted(order) == list(range(200))
+    position = {node: idx for idx, node in enumerate(order)}
+    for u, v in edges:
+        if node_to_scc[u] != node_to_scc[v]:
+            assert position[u] < position[v]
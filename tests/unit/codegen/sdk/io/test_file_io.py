@@ -160,3 +160,23 @@ def test_file_exists_bounded(file_io, tmp_path):
         file_io.file_exists(bad_file_2)
 
     assert "is not within allowed paths" in str(exc_info.value)
+
+
+def test_read_bounded_symlink_swapped(file_io, tmp_path):
+    allowed_dir = tmp_path / "allowed"
+    allowed_dir.mkdir(exist_ok=True)
+    file_io.allowed_paths = [allowed_dir]
+
+    allowed_file = allowed_dir / "test.txt"
+    allowed_file.write_bytes(b"test content")
+    assert file_io.read_bytes(allowed_file) == b"test content"
+
+    outside_file = tmp_path / "outside.txt"
+    outside_file.write_bytes(b"outside content")
+    allowed_file.unlink()
+    allowed_file.symlink_to(outside_file)
+
+    with pytest.raises(BadWriteError) as exc_info:
+        file_io.read_bytes(allowed_file)
+
+    assert "is not within allowed paths" in str(exc_info.value)
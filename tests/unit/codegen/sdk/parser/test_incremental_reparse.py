@@ -0,0 +1,79 @@
+import random
+from unittest.mock import patch
+
+from codegen.sdk.codebase.diff_lite import ChangeType, ContentEdit
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.tree_sitter_parser import _NewlineTable, _reparse_incremental, clear_parse_cache, parse_file
+
+OLD = b"def foo():\n    return 1\n\n\ndef bar():\n    return foo()\n"
+
+
+def _full_parse(content: bytes) -> str:
+    clear_parse_cache()
+    ret = str(parse_file("test.py", content.decode()))
+    clear_parse_cache()
+    return ret
+
+
+def test_reparse_with_edits_matches_full_parse() -> None:
+    new = b"def foo():\n    x = 2\n    return x\n\n\ndef baz():\n    return foo()\n"
+    expected = _full_parse(new)
+    parse_file("test.py", OLD.decode())
+    # Edits are applied in descending byte order, like the transaction manager does
+    edits = [ContentEdit(34, 37, b"baz"), ContentEdit(15, 23, b"x = 2\n    return x")]
+    with patch("codegen.sdk.tree_sitter_parser._reparse_incremental", wraps=_reparse_incremental) as reparse:
+        ts_node = parse_file("test.py", new.decode(), OLD, edits)
+        assert reparse.call_count == 1
+    assert str(ts_node) == expected
+    assert ts_node.text == new
+    assert ts_node.children[1].start_point == (5, 0)
+
+
+def test_reparse_with_mismatched_edits_falls_back() -> None:
+    new = b"def foo():\n    return 2\n\n\ndef bar():\n    return foo()\n"
+    expected = _full_parse(new)
+    parse_file("test.py", OLD.decode())
+    assert _reparse_incremental(None, ".py", OLD, [ContentEdit(0, 3, b"async def")], new) is None
+    ts_node = parse_file("test.py", new.decode(), OLD, [ContentEdit(0, 3, b"async def")])
+    assert str(ts_node) == expected
+    assert ts_node.text == new
+
+
+def test_commit_records_edits(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": OLD.decode()}) as codebase:
+        file = codebase.get_file("test.py")
+        file.get_function("bar").rename("baz")
+        file.get_function("foo").code_block.statements[0].edit("x = 2\n    return x")
+        applied = []
+        apply_diffs = codebase.ctx.apply_diffs
+        with (
+            patch.object(codebase.ctx, "apply_diffs", side_effect=lambda diffs: applied.extend(diffs) or apply_diffs(diffs)),
+            patch("codegen.sdk.tree_sitter_parser._reparse_incremental", wraps=_reparse_incremental) as reparse,
+        ):
+            codebase.commit()
+            assert reparse.call_count == 1
+        (diff,) = applied
+        assert diff.change_type == ChangeType.Modified
+        assert diff.old_content == OLD
+        assert len(diff.edits) == 2
+
+        file = codebase.get_file("test.py")
+        assert str(file.ts_node) == _full_parse(file.content_bytes)
+        assert file.get_function("baz").usages == []
+        assert [usage.match.source for usage in file.get_function("foo").usages] == ["foo()"]
+
+
+def test_newline_table_matches_content() -> None:
+    def to_point(content: bytes, byte: int) -> tuple[int, int]:
+        return content.count(b"\n", 0, byte), byte - content.rfind(b"\n", 0, byte) - 1
+
+    rng = random.Random(0)
+    content = b"".join(rng.choice([b"a", b"bc", b"\n"]) for _ in range(300))
+    newlines = _NewlineTable(content)
+    for _ in range(200):
+        start = rng.randint(0, len(content))
+        end = min(len(content), start + rng.randint(0, 10))
+        new_bytes = b"".join(rng.choice([b"x", b"\n"]) for _ in range(rng.randint(0, 5)))
+        updated = content[:start] + new_bytes + content[end:]
+        assert newlines.edit(start, end, new_bytes) == (to_point(content, start), to_point(content, end), to_point(updated, start + len(new_bytes)))
+        content = updated
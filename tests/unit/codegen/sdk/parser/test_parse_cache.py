@@ -0,0 +1,55 @@
+from codegen.sdk.tree_sitter_parser import _TREE_BYTES_PER_NODE, _ParseCache, clear_parse_cache, get_parser_by_filepath_or_extension, parse_file, parse_files
+
+
+def test_parse_file_reuses_tree_for_same_content() -> None:
+    clear_parse_cache()
+    first = parse_file("a.py", "def foo():\n    pass\n")
+    second = parse_file("b.py", "def foo():\n    pass\n")
+    assert first == second
+    assert first.text == b"def foo():\n    pass\n"
+
+    changed = parse_file("a.py", "def bar():\n    pass\n")
+    assert changed != first
+    assert changed.text == b"def bar():\n    pass\n"
+
+
+def test_parse_file_cache_is_keyed_by_language() -> None:
+    clear_parse_cache()
+    content = "let x = <div />;\n"
+    py_node = parse_file("a.py", content)
+    tsx_node = parse_file("a.tsx", content)
+    assert py_node.has_error
+    assert not tsx_node.has_error
+    # .ts and .tsx share the same parser
+    assert parse_file("a.ts", content) != py_node
+
+
+def test_parse_files_uses_cache() -> None:
+    clear_parse_cache()
+    cached = parse_file("a.py", "x = 1\n")
+    results = list(parse_files([("a.py", "x = 1\n"), ("b.py", "y = 2\n")], max_workers=2))
+    assert results[0][2] == cached
+    assert results[1][2].text == b"y = 2\n"
+    assert parse_file("c.py", "y = 2\n") == results[1][2]
+
+
+def test_parse_cache_eviction() -> None:
+    parser = get_parser_by_filepath_or_extension(".py")
+    trees = {content: parser.parse(content) for content in (b"a = 1", b"b = 2", b"c = 3")}
+    # Each tree is estimated from its number of nodes
+    tree_size = trees[b"a = 1"].root_node.descendant_count * _TREE_BYTES_PER_NODE
+    cache = _ParseCache(max_bytes=2 * tree_size)
+    for content, tree in trees.items():
+        cache.put(cache.get_key(".py", content), tree)
+    assert cache.get(cache.get_key(".py", b"a = 1")) is None
+    assert cache.get(cache.get_key(".py", b"b = 2")) is trees[b"b = 2"]
+    assert cache.get(cache.get_key(".py", b"c = 3")) is trees[b"c = 3"]
+    # Trees larger than the whole cache are never stored
+    large = parser.parse(b"x = 1\n" * 10)
+    cache.put(cache.get_key(".py", b"x = 1\n" * 10), large)
+    assert cache.get(cache.get_key(".py", b"x = 1\n" * 10)) is None
+
+    # Shrinking the cache evicts the least recently used trees
+    cache.resize(tree_size)
+    assert cache.get(cache.get_key(".py", b"b = 2")) is None
+    assert cache.get(cache.get_key(".py", b"c = 3")) is trees[b"c = 3"]
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
 
 
@@ -179,3 +181,31 @@ def test_subdirectories_listing_odd_filetypes(tmpdir) -> None:
         for subdir in subdirectories:
             assert subdir.dirpath in expected_tree.keys()
             assert set(subdir.item_names) == expected_tree[subdir.dirpath]
+
+
+def test_directory_tree_updated_on_sync(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"dir_a/file1.py": "a = 1", "dir_a/dir_b/file2.py": "b = 2", "README.md": ""}) as codebase:
+        directory = codebase.get_directory("dir_a")
+        with patch.object(codebase.ctx, "build_directory_tree", wraps=codebase.ctx.build_directory_tree) as build_directory_tree:
+            codebase.create_file("dir_c/file3.py", "c = 3")
+            codebase.create_file("dir_c/notes.txt", "")
+            codebase.get_file("dir_a/dir_b/file2.py").remove()
+            codebase.get_file("dir_a/file1.py").rename("file4.py")
+            codebase.get_file("dir_c/file3.py").edit("c = 4")
+            codebase.commit()
+            assert build_directory_tree.call_count == 0
+
+        def tree():
+            return {d.dirpath: (sorted(d._files), sorted(d._subdirectories)) for d in codebase.directories}
+
+        # Unchanged directories are updated in place
+        assert codebase.get_directory("dir_a") is directory
+        assert codebase.get_directory("dir_a/dir_b", optional=True) is None
+        assert tree() == {
+            "": (["README.md"], ["dir_a", "dir_c"]),
+            "dir_a": (["file4.py"], []),
+            "dir_c": (["file3.py", "notes.txt"], []),
+        }
+        incremental = tree()
+        codebase.ctx.build_directory_tree()
+        assert tree() == incremental
@@ -0,0 +1,41 @@
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+
+# language=python
+CONTENT = """
+def foo():
+    return 1
+
+x = foo()
+
+def foo():
+    return 2
+
+y = foo()
+"""
+
+
+def _resolved_lines(file, name: str) -> list[int]:
+    return [next(file.resolve_name(name, usage.start_byte)).start_point[0] for usage in file.find(f"{name}()", exact=True)]
+
+
+def test_resolve_name_closest_preceding_definition(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": CONTENT}) as codebase:
+        file = codebase.get_file("test.py")
+        assert _resolved_lines(file, "foo") == [1, 6]
+        assert [dep.start_point[0] for dep in file.get_global_var("x").dependencies] == [1]
+        assert [dep.start_point[0] for dep in file.get_global_var("y").dependencies] == [6]
+        # Without a position the last definition is used
+        assert next(file.resolve_name("foo")).start_point[0] == 6
+        assert next(file.resolve_name("missing", 0), None) is None
+
+
+def test_resolve_name_after_reparse(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": CONTENT}) as codebase:
+        file = codebase.get_file("test.py")
+        file.insert_before("def foo():\n    return 0\n\nw = foo()\n", fix_indentation=False)
+        codebase.commit()
+        file = codebase.get_file("test.py")
+        assert len(file.symbol_definitions["foo"][1]) == 3
+        assert [dep.code_block.source for dep in file.get_global_var("w").dependencies] == ["return 0"]
+        assert [dep.code_block.source for dep in file.get_global_var("x").dependencies] == ["return 1"]
+        assert [dep.code_block.source for dep in file.get_global_var("y").dependencies] == ["return 2"]
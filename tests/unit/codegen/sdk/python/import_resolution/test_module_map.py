@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+
+
+def test_module_map_tracks_files(tmpdir) -> None:
+    files = {
+        "pkg/__init__.py": "from .mod import foo\n",
+        "pkg/mod.py": "def foo():\n    pass\n",
+        "ns/sub/util.py": "def bar():\n    pass\n",
+        "app.py": "import pkg.mod\nfrom ns.sub.util import bar\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        module_map = codebase.ctx.module_map
+        assert module_map.get_module("pkg.mod") == "pkg/mod.py"
+        assert module_map.get_package("pkg") == "pkg/__init__.py"
+        assert module_map.get_module("pkg") is None
+        # Modules of namespace packages are found by their dotted name
+        assert module_map.get_module("ns.sub.util") == "ns/sub/util.py"
+
+        codebase.get_file("pkg/mod.py").update_filepath("pkg/renamed.py")
+        codebase.create_file("pkg/new.py", "def baz():\n    pass\n")
+        codebase.commit()
+        assert module_map.get_module("pkg.mod") is None
+        assert module_map.get_module("pkg.renamed") == "pkg/renamed.py"
+        assert module_map.get_module("pkg.new") == "pkg/new.py"
+
+        codebase.get_file("pkg/new.py").remove()
+        codebase.commit()
+        assert module_map.get_module("pkg.new") is None
+
+
+def test_resolution_does_not_probe_paths(tmpdir) -> None:
+    files = {
+        "src/pkg/__init__.py": "",
+        "src/pkg/mod.py": "def foo():\n    pass\n",
+        "app.py": "from pkg.mod import foo\nimport pkg\nfrom missing import x\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        imports = codebase.get_file("app.py").imports
+        with patch("pathlib.Path.resolve", side_effect=AssertionError):
+            resolutions = [imp.resolve_import() for imp in imports]
+        assert resolutions[0].from_file.filepath == "src/pkg/mod.py"
+        assert resolutions[0].symbol.name == "foo"
+        assert resolutions[1].from_file.filepath == "src/pkg/__init__.py"
+        assert resolutions[2] is None
+
+
+def test_resolution_with_dotted_base_path(tmpdir) -> None:
+    files = {
+        "my.app/pkg/__init__.py": "",
+        "my.app/pkg/mod.py": "def foo():\n    pass\n",
+        "app.py": "from pkg.mod import foo\nimport pkg\nfrom pkg import mod\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        # A base path with dots in its directory names has no module names, the files are looked up by path instead
+        resolutions = [imp.resolve_import(base_path="my.app") for imp in codebase.get_file("app.py").imports]
+        assert resolutions[0].from_file.filepath == "my.app/pkg/mod.py"
+        assert resolutions[0].symbol.name == "foo"
+        assert resolutions[1].from_file.filepath == "my.app/pkg/__init__.py"
+        assert resolutions[1].imports_file
+        assert resolutions[2].from_file.filepath == "my.app/pkg/mod.py"
+        assert resolutions[2].imports_file
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.typescript.ts_config import TSConfig
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+
+def _config(target: str) -> str:
+    return f'{{"compilerOptions": {{"baseUrl": ".", "paths": {{"@lib/*": ["./{target}/*"]}}}}}}'
+
+
+FILES = {
+    "tsconfig.json": _config("v1"),
+    "app/a.ts": "import { f } from '@lib/util';\n\nexport function a() {\n    return f();\n}\n",
+    "app/c.ts": "function g() {\n    return 1;\n}\n",
+    "v1/util.ts": "export function f() {}\n",
+    "v2/util.ts": "export function f() {}\n",
+}
+
+
+def _usage_files(codebase, filepath: str) -> set[str]:
+    return {usage.usage_symbol.filepath for usage in codebase.get_file(filepath).get_function("f").usages} - {filepath}
+
+
+def test_source_changes_keep_configs(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, programming_language=ProgrammingLanguage.TYPESCRIPT, files=FILES) as codebase:
+        config = codebase.get_file("app/a.ts").ts_config
+        with patch.object(TSConfig, "__init__", side_effect=AssertionError):
+            codebase.get_file("app/c.ts").get_function("g").code_block.statements[0].edit("return 2;")
+            codebase.create_file("app/b.ts", "import { f } from '@lib/util';\n")
+            codebase.commit()
+        assert codebase.get_file("app/a.ts").ts_config is config
+        assert codebase.get_file("app/b.ts").ts_config is config
+        assert codebase.get_file("app/b.ts").imports[0].resolved_symbol.filepath == "v1/util.ts"
+
+
+def test_modified_config_resolves_imports_again(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, programming_language=ProgrammingLanguage.TYPESCRIPT, files=FILES) as codebase:
+        assert _usage_files(codebase, "v1/util.ts") == {"app/a.ts"}
+        codebase.get_file("tsconfig.json").edit(_config("v2"))
+        codebase.commit()
+        assert codebase.get_file("app/a.ts").imports[0].resolved_symbol.filepath == "v2/util.ts"
+        assert _usage_files(codebase, "v1/util.ts") == set()
+        assert _usage_files(codebase, "v2/util.ts") == {"app/a.ts"}
+
+
+def test_added_config_applies_to_its_directory(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, programming_language=ProgrammingLanguage.TYPESCRIPT, files=FILES) as codebase:
+        root_config = codebase.get_file("v1/util.ts").ts_config
+        codebase.create_file("app/tsconfig.json", '{"compilerOptions": {"baseUrl": ".", "paths": {"@lib/*": ["../v2/*"]}}}')
+        codebase.ctx.apply_diffs([DiffLite(ChangeType.Added, tmpdir / "app/tsconfig.json")])
+        assert codebase.get_file("app/a.ts").ts_config.config_file.filepath == "app/tsconfig.json"
+        assert codebase.get_file("v1/util.ts").ts_config.config_file.filepath == root_config.config_file.filepath
+        assert codebase.get_file("app/a.ts").imports[0].resolved_symbol.filepath == "v2/util.ts"
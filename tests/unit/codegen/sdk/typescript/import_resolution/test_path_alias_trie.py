@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.typescript.path_alias_trie import PathAliasTrie
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+if TYPE_CHECKING:
+    from codegen.sdk.typescript.ts_config import TSConfig
+
+
+def test_path_alias_trie_longest_match() -> None:
+    trie = PathAliasTrie(["@app", "@app/utils", "@lib/", "~", "/", ""])
+    assert trie.find_longest_match("@app/utils/format") == "@app/utils"
+    assert trie.find_longest_match("@app/components/button") == "@app"
+    assert trie.find_longest_match("@app") == "@app"
+    assert trie.find_longest_match("@lib/core") == "@lib/"
+    assert trie.find_longest_match("~/styles") == "~"
+    # Aliases only match whole path segments
+    assert trie.find_longest_match("@apple/x") is None
+    assert trie.find_longest_match("./relative") is None
+    assert trie.find_longest_match("/absolute") is None
+
+
+def test_translate_import_path_is_memoized(tmpdir) -> None:
+    # language=json
+    config_content = """
+{
+  "compilerOptions": {
+    "baseUrl": ".",
+    "paths": {
+      "@app/*": ["./src/*"],
+      "@app/utils/*": ["./lib/utils/*"]
+    }
+  }
+}
+    """
+    files = {
+        "tsconfig.json": config_content,
+        "src/a.ts": "import { b } from '@app/b';\nimport { fmt } from '@app/utils/format';\n",
+        "src/b.ts": "export const b = 1;\n",
+        "lib/utils/format.ts": "export function fmt() {}\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, programming_language=ProgrammingLanguage.TYPESCRIPT, files=files) as codebase:
+        config: TSConfig = codebase.ctx.config_parser.get_config("tsconfig.json")
+        assert config.translate_import_path("@app/b") == "src/b"
+        assert config.translate_import_path("@app/utils/format") == "lib/utils/format"
+        assert [imp.resolved_symbol.filepath for imp in codebase.get_file("src/a.ts").imports] == ["src/b.ts", "lib/utils/format.ts"]
+
+        # Translated paths are looked up without matching the aliases again
+        with patch.object(PathAliasTrie, "find_longest_match", side_effect=AssertionError):
+            assert config.translate_import_path("@app/utils/format") == "lib/utils/format"
+
+        # Changing the overrides drops the translated paths
+        codebase.ctx.config.import_resolution_overrides = {"@app/utils": "vendor/utils"}
+        assert config.translate_import_path("@app/utils/format") == "vendor/utils/format"